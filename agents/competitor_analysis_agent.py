@@ -4,11 +4,14 @@ import traceback
 
 from state import State
 from config.chroma import get_vector_store
-from langchain_openai import ChatOpenAI
+from repositories.chroma_repo import retrieve
+from repositories.company_index import get_company_index, normalize_name as _norm
+from tools.llm_cache import LLMCacheMiss
+from tools.llm_provider import get_chat_model
 from langchain_core.prompts import ChatPromptTemplate
 
 # LLM 초기화
-_llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.3)
+_llm = get_chat_model("gpt-4o-mini", 0.3)
 
 # 경쟁사 분석 프롬프트
 _COMPETITOR_PROMPT = ChatPromptTemplate.from_messages(
@@ -51,15 +54,6 @@ _COMPETITOR_PROMPT = ChatPromptTemplate.from_messages(
     ]
 )
 
-import unicodedata
-
-def _norm(s: str) -> str:
-    """공백/대소문자/전각-반각 차이 제거한 비교용 정규화"""
-    if not s:
-        return ""
-    s = unicodedata.normalize("NFKC", s)
-    return "".join(s.split()).lower()
-
 def competitor_analysis_agent(state: State) -> State:
     """
     현재 회사 정보를 기반으로 벡터DB에서 유사 기업을 검색하여
@@ -73,23 +67,20 @@ def competitor_analysis_agent(state: State) -> State:
             state["competitor_analysis"] = "⚠️ current_company 없음"
             return state
 
-        # 1) 현재 회사 문서 검색
-        raw = vectordb.similarity_search(current_company, k=8)
-        docs = [
-            d for d in raw
-            if d.metadata.get("kind") == "company"
-            and _norm(d.metadata.get("name", "")) == _norm(current_company)
-        ][:1]
+        # 1) 현재 회사 문서: 회사 인덱스 dict 조회
+        rec = get_company_index(vectordb).get(current_company)
 
-        current_analysis = docs[0].page_content if docs else "⚠️ 현재 기업 정보 없음"
+        current_analysis = (rec.text if rec else "") or "⚠️ 현재 기업 정보 없음"
 
 
-        # 2) 경쟁사 후보 검색 (자기 자신 제외)
-        raw_comp = vectordb.similarity_search(current_company, k=16)
+        # 2) 경쟁사 후보 검색 (자기 자신 제외, 정확히 3개)
+        competitors = retrieve(
+            vectordb, current_company, k=4, kind="company", exclude_name=current_company
+        )
+        # 이름 표기만 다른 자기 자신 방어
         competitors = [
-            d for d in raw_comp
-            if d.metadata.get("kind") == "company"
-            and _norm(d.metadata.get("name", "")) != _norm(current_company)
+            d for d in competitors
+            if _norm(d.metadata.get("name", "")) != _norm(current_company)
         ][:3]
 
 
@@ -109,6 +100,8 @@ def competitor_analysis_agent(state: State) -> State:
         # 4) state 업데이트
         state["competitor_analysis"] = output.strip()
 
+    except LLMCacheMiss:
+        raise  # replay 모드: 캐시 미스는 실패로 드러나야 함
     except Exception as e:
         traceback.print_exc()
         state["competitor_analysis"] = f"⚠️ 경쟁사 분석 실패: {e}"
@@ -1,7 +1,7 @@
 import os
 import json
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
+from tools.llm_provider import get_chat_model
 from langchain.prompts import ChatPromptTemplate
 from state import State
 from typing import Dict, Any
@@ -110,7 +110,7 @@ evaluation_prompt = ChatPromptTemplate.from_template("""
 """)
 class EvaluationAgent:
     def __init__(self, model="gpt-4o-mini", temperature=0):
-        self.llm = ChatOpenAI(model=model, temperature=temperature)
+        self.llm = get_chat_model(model, temperature)
         self.chain = evaluation_prompt | self.llm
 
     def evaluate(self, company_info: str) -> dict:
@@ -166,7 +166,7 @@ class EvaluationAgent:
     
 class EvaluationAgent:
     def __init__(self, model="gpt-4o-mini", temperature=0):
-        self.llm = ChatOpenAI(model=model, temperature=temperature)
+        self.llm = get_chat_model(model, temperature)
         self.chain = evaluation_prompt | self.llm
 
     def evaluate(self, company_info: str) -> Dict[str, Any]:
@@ -176,6 +176,17 @@ class EvaluationAgent:
         except json.JSONDecodeError:
             return {"raw_output": result.content}
 
+_AGENT = None
+
+
+def _get_agent() -> "EvaluationAgent":
+    """노드 호출마다 새로 만들지 않고 1개 재사용 (LLM 은 tools/llm_provider 공용 풀)"""
+    global _AGENT
+    if _AGENT is None:
+        _AGENT = EvaluationAgent()
+    return _AGENT
+
+
 # ✅ LangGraph 노드
 def evaluation_agent_node(state: State) -> State:
     company = state.get("current_company") or ""
@@ -187,7 +198,7 @@ def evaluation_agent_node(state: State) -> State:
 시장성: {state.get('market_analysis') or ''}
 경쟁사분석: {state.get('competitor_analysis') or ''}"""
 
-    agent = EvaluationAgent()
+    agent = _get_agent()
     evaluation = agent.evaluate(stitched_info)
 
     # 최종판정 → investment_decision(bool)
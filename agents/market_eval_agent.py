@@ -2,9 +2,11 @@
 from __future__ import annotations
 from typing import List, TypedDict, Optional, Iterable, Dict, Any
 from dataclasses import dataclass
+import os
 
 # LangChain / OpenAI
-from langchain_openai import ChatOpenAI
+from tools.llm_provider import get_chat_model
+from tools.token_budget import budget_sections, compact_text, count_tokens, record_compaction, record_prompt
 from langchain.prompts import PromptTemplate
 from langchain_core.pydantic_v1 import BaseModel, Field
 
@@ -19,6 +21,8 @@ except Exception:
     _HAS_RAG_TOOL = False
     # fallback: config.chroma 사용
     from config.chroma import get_vector_store  # get_vector_store() -> Chroma
+    from repositories.chroma_repo import retrieve
+    from repositories.company_index import get_company_index
 
     try:
         from chromadb.utils import embedding_functions  # type: ignore
@@ -67,21 +71,30 @@ class RagQuery:
 # ==============================
 # RAG: 도큐먼트 → 텍스트 병합
 # ==============================
-def _concat_docs_text(docs: Iterable[Any], max_chars: int = 3000) -> str:
-    """RAG 문서들의 page_content를 이어 붙여 프롬프트에 넣을 문자열로 만든다."""
-    parts: List[str] = []
-    total = 0
-    for d in docs:
+# 컨텍스트(산업/기업) 1개당 입력 토큰 상한
+_CTX_TOKENS = int(os.getenv("MARKET_CTX_TOKENS", "1200"))
+
+
+def _concat_docs_text(docs: Iterable[Any], max_tokens: int = _CTX_TOKENS) -> str:
+    """
+    RAG 문서들의 page_content를 이어 붙여 프롬프트에 넣을 문자열로 만든다.
+    - 문서 간 중복 라인 제거
+    - max_tokens 를 검색 순위 가중치(1위가 가장 큼)로 나눠 문서별로 자름
+    """
+    seen: set = set()
+    items = []
+    before = 0
+    for i, d in enumerate(docs):
         content = getattr(d, "page_content", "") or ""
         if not content:
             continue
-        remaining = max_chars - total
-        if remaining <= 0:
-            break
-        snippet = content[:remaining]
-        parts.append(snippet)
-        total += len(snippet)
-    return "\n\n---\n\n".join(parts)
+        before += count_tokens(content)
+        items.append((str(i), compact_text(content, seen=seen), 1.0 / (i + 1)))
+    parts = budget_sections(items, max_tokens)
+    text = "\n\n---\n\n".join(parts.values())
+    if items:
+        record_compaction("market_ctx", before, count_tokens(text))
+    return text
 
 
 # ==============================
@@ -100,14 +113,11 @@ def _build_rag_contexts(*, company: str, k_industry: int = 5, k_company: int = 5
     else:
         vectordb = get_vector_store()
 
-        raw_ind = vectordb.similarity_search(query_industry, k=k_industry * 4)
-        ind_docs = [d for d in raw_ind if d.metadata.get("kind") == "industry"][:k_industry]
-
-        raw_com = vectordb.similarity_search(query_company, k=k_company * 4)
-        com_docs = [
-            d for d in raw_com
-            if d.metadata.get("kind") == "company" and d.metadata.get("name") == company
-        ][:k_company]
+        # kind/name 필터를 Chroma 쿼리에 pushdown → 정확히 k개
+        ind_docs = retrieve(vectordb, query_industry, k=k_industry, kind="industry")
+        # 회사 프로필은 인덱스 dict 조회 (회사당 문서 1개)
+        rec = get_company_index(vectordb).get(company)
+        com_docs = [rec.to_document()] if rec else []
 
     return {
         "context_industry": _concat_docs_text(ind_docs),
@@ -131,7 +141,7 @@ def market_eval_agent(state: GraphState, *, model_name: str = "gpt-4o-mini") ->
     context_company = rag_ctx["context_company"]
 
     # 2) LLM 및 구조화 출력 준비
-    model = ChatOpenAI(temperature=0, model=model_name, streaming=True)
+    model = get_chat_model(model_name, 0, streaming=True)  # 공용 인스턴스 (호출마다 새 클라이언트 X)
     llm_with_tool = model.with_structured_output(Grade, method="function_calling")
 
     # 3) 프롬프트
@@ -160,6 +170,7 @@ def market_eval_agent(state: GraphState, *, model_name: str = "gpt-4o-mini") ->
         context_industry=context_industry,
     )
 
+    record_prompt("market_eval", count_tokens(formatted_prompt))
     out: Grade = llm_with_tool.invoke(formatted_prompt)
 
     header = (
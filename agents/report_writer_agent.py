@@ -6,7 +6,8 @@ import numpy as np
 from typing import Dict, Any
 from dotenv import load_dotenv
 
-from langchain_openai import ChatOpenAI
+from tools.llm_cache import LLMCacheMiss
+from tools.llm_provider import get_chat_model
 from langchain.prompts import ChatPromptTemplate
 
 from reportlab.lib.pagesizes import A4
@@ -245,7 +246,7 @@ def write_individual_report(state: State) -> State:
     company = state.get("current_company") or "startup"
 
     # LLM 호출 준비
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+    llm = get_chat_model("gpt-4o-mini", 0)
     chain = report_prompt | llm
 
     summary = evaluation.get("요약", "정보 없음")
@@ -263,6 +264,8 @@ def write_individual_report(state: State) -> State:
             "criteria_bullets": criteria_bullets,
         })
         intro_text = (getattr(result, "content", "") or "").strip() or "정보 없음"
+    except LLMCacheMiss:
+        raise  # replay 모드: 캐시 미스는 실패로 드러나야 함
     except Exception as e:
         print(f"⚠️ LLM 보고서 본문 생성 실패: {e}")
         intro_text = "정보 없음"
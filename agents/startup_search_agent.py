@@ -7,6 +7,7 @@ import os
 import random
 import time
 import traceback
+from collections import deque
 from state import State
 
 # ── 0) 프린트 로거 ────────────────────────────────────────────────────────────
@@ -15,24 +16,42 @@ def _log(*args):
     print(f"[DEBUG] {msg}")
 
 # ── 1) 크롤링 툴 ────────────────────────────────────────────────────────────────
-from tools.nextunicorn import (
-    nextunicorn_list,                    # ✅ 리스트만
-    nextunicorn_company_details_batch,   # ✅ 필요 URL만 상세
+# 프로세스 공용 CrawlSession: 브라우저 기동/로그인 1회, 리스트·상세가 같은 세션 사용
+from tools.text_normalize import tidy
+from tools.nextunicorn import run_crawl, crawl_session_stats, load_watermark, load_retry, save_watermark
+from tools.nextunicorn import canonical_company_url
+from tools.nextunicorn import structure_detail, _clean_text
+from tools.token_budget import (
+    budget_sections,
+    compact_text,
+    count_message_tokens,
+    count_tokens,
+    record_compaction,
+    record_prompt,
+    token_stats,
+    truncate_tokens,
 )
 
+# 증분 모드: watermark(이전 실행에서 처리한 카드)까지만 리스트를 넘기고 새 카드만 처리
+#   0 이면 기존 '최신 우선' 정책 (기존 회사가 하나라도 보이면 즉시 종료)
+_INCREMENTAL = os.getenv("NEXTUNICORN_INCREMENTAL", "1") == "1"
+# watermark 가 있을 때 한 번에 훑는 최대 카드 수 (limit 과 무관하게 새 카드 전체를 따라잡기 위함)
+_DELTA_MAX = int(os.getenv("NEXTUNICORN_DELTA_MAX", "200"))
+
 # ── 2) 벡터 스토어 / 저장 레이어 ─────────────────────────────────────────────
 from config.chroma import get_vector_store
 from repositories.chroma_repo import (
-    find_company_exact_or_similar,
-    upsert_company_profile,  # repo 내부에서 tags(list)->" | " 문자열로 변환되어야 함
+    find_companies_exact_or_similar,
+    upsert_company_profiles,  # repo 내부에서 tags(list)->" | " 문자열로 변환되어야 함
 )
 
 # ── 3) LLM (섹션 정리 + 태그 동시 생성) ───────────────────────────────────────
-from langchain_openai import ChatOpenAI
+from tools.llm_cache import LLMCacheMiss
+from tools.llm_provider import get_chat_model
 from langchain_core.prompts import ChatPromptTemplate
 
-# 환경변수 OPENAI_API_KEY 필요
-_llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.2)
+# 환경변수 OPENAI_API_KEY 필요 (공용 클라이언트 풀, tools/llm_provider.py)
+_llm = get_chat_model("gpt-4o-mini", 0.2)
 
 _COMBINED_PROMPT = ChatPromptTemplate.from_messages([
     (
@@ -87,102 +106,291 @@ def _normalize_all_tab(url: Optional[str]) -> str:
     return f"{url}{sep}tab=all"
 
 def _local_tidy(s: str) -> str:
-    """LLM 실패 대비 로컬 정리기(최소 방어)."""
-    if not s:
-        return ""
-    s = re.sub(r"https?://\S+", " ", s)  # URL 제거
-    s = re.sub(r"#\S+", " ", s)          # 해시태그 제거
-    s = re.sub(r"\s{2,}", " ", s)        # 다중 공백 1개로
-    s = re.sub(r"\n{3,}", "\n", s)       # 3개 이상 개행 1개로
-    return s.strip()[:1000]
+    """LLM 실패 대비 로컬 정리기(최소 방어): URL/해시태그 제거 + 공백 압축, 1000자 (정규식 1회)"""
+    return tidy(s, 1000)
 
 # ── 6) LLM: 정리+태깅 통합 호출 ──────────────────────────────────────────────
 _JSON_FENCE = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.S)
+_CLEANED_KEYS = ["summary", "services", "team", "funding", "news", "info", "company"]
+
+# 비동기 정리/태깅 동시성 상한 (파이프라인 LLM 워커 수 기본값)
+_LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "4"))
+# 최근 호출별 지연(초) 기록 → llm_latency_stats() (장시간 프로세스에서도 크기 고정)
+_LLM_LATENCIES: deque = deque(maxlen=int(os.getenv("LLM_LATENCY_WINDOW", "1000")))
+# 정리/태깅 호출 1건의 raw_text 입력 토큰 상한 (섹션 우선순위로 분배)
+_LLM_INPUT_TOKENS = int(os.getenv("LLM_INPUT_TOKENS", "3000"))
+# 섹션 우선순위(가중치)와 raw_text 에 붙일 라벨
+_SECTION_BUDGET = [
+    ("company", "회사", 1.0),
+    ("summary", "소개", 5.0),
+    ("funding", "투자 정보", 4.0),
+    ("services", "서비스/제품 정보", 4.0),
+    ("team", "팀 정보", 3.0),
+    ("news", "기업 소식", 2.0),
+    ("info", "회사 정보", 2.0),
+]
+
+
+def _empty_cleaned() -> Dict[str, str]:
+    """폴백: 전부 빈칸"""
+    return {k: "" for k in _CLEANED_KEYS}
+
+
+def _parse_combined(out: str) -> Tuple[Dict[str, str], List[str]]:
+    """LLM 출력(JSON) → (cleaned 7키, tags ≤3)"""
+    import json as _json
 
-def _clean_and_tag_via_llm(
+    # 코드펜스에 감싸오는 경우 대비
+    m = _JSON_FENCE.search(out)
+    if m:
+        out = m.group(1)
+
+    data = _json.loads(out) if out else {}
+    cleaned_in = (data.get("cleaned") or {}) if isinstance(data, dict) else {}
+
+    # cleaned 강제 보정 + 로컬 정리
+    cleaned: Dict[str, str] = {}
+    for k in _CLEANED_KEYS:
+        v = str((cleaned_in.get(k) or "")).strip()
+        v = _local_tidy(v)
+        if len(v) > 800:
+            v = v[:800]
+        cleaned[k] = v
+
+    # tags: 상위 레벨 배열 우선, 혹시 cleaned.tags 문자열로 줄 수도 있어 방어
+    tags_raw = data.get("tags") if isinstance(data, dict) else None
+    tags: List[str] = []
+    if isinstance(tags_raw, list):
+        for t in tags_raw[:3]:
+            if isinstance(t, str) and t.strip():
+                tags.append(t.strip())
+    else:
+        maybe_str = cleaned_in.get("tags")
+        if isinstance(maybe_str, str) and maybe_str.strip():
+            for t in maybe_str.split("|"):
+                tt = t.strip()
+                if tt:
+                    tags.append(tt)
+            tags = tags[:3]
+    return cleaned, tags
+
+
+def _budget_raw_text(detail: Dict[str, Any], name: str, url: str) -> str:
+    """
+    상세 본문 → LLM 입력 raw_text (_LLM_INPUT_TOKENS 이내)
+    - 섹션을 찾은 페이지: 섹션별 정리(노이즈/중복 제거) 후 우선순위 가중치로 예산 분배, 라벨 붙여 연결
+    - 그 외: 노이즈/중복 라인 제거 후 앞에서부터 예산만큼
+    """
+    full = detail.get("full_text") or ""
+    if not full:
+        return "\n".join(filter(None, [name, url]))
+    before = count_tokens(full)
+    if detail.get("sections"):
+        st = structure_detail(detail)
+        parts = budget_sections([(k, st.get(k, ""), w) for k, _, w in _SECTION_BUDGET], _LLM_INPUT_TOKENS)
+        label = {k: l for k, l, _ in _SECTION_BUDGET}
+        text = "\n\n".join(f"[{label[k]}]\n{v}" for k, v in parts.items())
+    else:
+        text = truncate_tokens(compact_text(full, cleaner=_clean_text), _LLM_INPUT_TOKENS)
+    record_compaction("clean_tag", before, count_tokens(text))
+    return text
+
+
+def _combined_messages(name: str, raw_text: str, hint: str) -> List[Any]:
+    """정리/태깅 프롬프트 렌더링 (raw_text 는 _LLM_INPUT_TOKENS 로 한 번 더 제한) + 입력 토큰 기록"""
+    capped = truncate_tokens(raw_text, _LLM_INPUT_TOKENS)
+    if len(capped) < len(raw_text):
+        record_compaction("clean_tag:cap", count_tokens(raw_text), count_tokens(capped))
+    msgs = _COMBINED_PROMPT.format_messages(name=name, hint=hint or "", raw_text=capped)
+    n = count_message_tokens(msgs)
+    record_prompt("clean_tag", n)
+    _log("[LLM] prompt tokens:", n, "name:", name)
+    return msgs
+
+
+async def _aclean_and_tag_via_llm(
     name: str,
     raw_text: str,
     hint: str = "",
-    *,
-    emit: bool = True,  # 기본 True로 두고 항상 디버깅 출력
 ) -> Tuple[Dict[str, str], List[str]]:
-    import json as _json
-
-    _log("[LLM] combined: invoke start; raw_text_len:", len(raw_text), "name:", name)
+    """정리+태깅 통합 호출 1건 (ainvoke, 이벤트 루프를 막지 않음). 실패 시 빈 섹션 폴백, LLMCacheMiss 는 전파"""
+    _log("[LLM] combined(async): start; raw_text_len:", len(raw_text), "name:", name)
     try:
-        msgs = _COMBINED_PROMPT.format_messages(
-            name=name,
-            hint=hint or "",
-            raw_text=raw_text,
-        )
-        out = _llm.invoke(msgs).content or ""
-        _log("[LLM] combined: raw output head:", (out[:200].replace("\n", " ") + " ..."))
-
-        # 코드펜스에 감싸오는 경우 대비
-        m = _JSON_FENCE.search(out)
-        if m:
-            out = m.group(1)
-
-        data = _json.loads(out) if out else {}
-        cleaned_in = (data.get("cleaned") or {}) if isinstance(data, dict) else {}
-
-        # cleaned 강제 보정 + 로컬 정리
-        cleaned: Dict[str, str] = {}
-        for k in ["summary", "services", "team", "funding", "news", "info", "company"]:
-            v = str((cleaned_in.get(k) or "")).strip()
-            v = _local_tidy(v)
-            if len(v) > 800:
-                v = v[:800]
-            cleaned[k] = v
-
-        # tags: 상위 레벨 배열 우선, 혹시 cleaned.tags 문자열로 줄 수도 있어 방어
-        tags_raw = data.get("tags")
-        tags: List[str] = []
-        if isinstance(tags_raw, list):
-            for t in tags_raw[:3]:
-                if isinstance(t, str) and t.strip():
-                    tags.append(t.strip())
-        else:
-            maybe_str = cleaned_in.get("tags")
-            if isinstance(maybe_str, str) and maybe_str.strip():
-                for t in maybe_str.split("|"):
-                    tt = t.strip()
-                    if tt:
-                        tags.append(tt)
-                tags = tags[:3]
-
-        _log("[LLM] combined: done; lens:",
-             {k: len(cleaned.get(k, "")) for k in cleaned},
-             "tags:", tags)
+        msgs = _combined_messages(name, raw_text, hint)
+        t = time.perf_counter()
+        out = (await _llm.ainvoke(msgs)).content or ""
+        dt = time.perf_counter() - t
+        _LLM_LATENCIES.append(dt)
+        cleaned, tags = _parse_combined(out)
+        _log("[LLM] combined(async): done;", f"{dt:.2f}s", "name:", name, "tags:", tags)
         return cleaned, tags
-
+    except LLMCacheMiss:
+        raise  # replay 모드: 폴백으로 삼키면 빈 프로필이 저장되고 회귀 테스트가 통과해 버림
     except Exception as e:
-        _log("[LLM][ERROR]", e)
+        _log("[LLM][ERROR]", name, e)
         traceback.print_exc()
-        # 폴백: 전부 빈칸
-        return (
-            {
-                k: ""
-                for k in [
-                    "summary",
-                    "services",
-                    "team",
-                    "funding",
-                    "news",
-                    "info",
-                    "company",
-                ]
-            },
-            [],
-        )
+        return _empty_cleaned(), []
+
+
+def llm_latency_stats() -> Dict[str, Any]:
+    """최근 정리/태깅 호출 지연(초) 요약: n / mean / p50 / p95 / max"""
+    xs = sorted(_LLM_LATENCIES)
+    if not xs:
+        return {"n": 0}
+    pick = lambda q: xs[min(len(xs) - 1, int(q * len(xs)))]
+    return {
+        "n": len(xs),
+        "mean": round(sum(xs) / len(xs), 3),
+        "p50": round(pick(0.5), 3),
+        "p95": round(pick(0.95), 3),
+        "max": round(xs[-1], 3),
+    }
+
+# ── 6-1) 스트리밍 파이프라인: 상세 수집 → LLM 정리/태깅 → 마이크로배치 업서트 ──────
+# 단계 사이 큐는 크기 제한(배압): LLM 이 밀리면 크롤이, 업서트가 밀리면 LLM 이 대기
+_PIPE_LLM_WORKERS = int(os.getenv("PIPELINE_LLM_WORKERS", str(_LLM_CONCURRENCY)))
+_PIPE_UPSERT_BATCH = int(os.getenv("PIPELINE_UPSERT_BATCH", "8"))
+_PIPE_QUEUE = int(os.getenv("PIPELINE_QUEUE", "8"))
+_PIPE_FLUSH_S = float(os.getenv("PIPELINE_FLUSH_S", "2.0"))  # 배치가 덜 찼어도 이 시간 동안 입력이 없으면 flush
+
+
+async def _gather_or_cancel(*aws) -> List[Any]:
+    """
+    asyncio.gather 와 같되 하나가 실패(또는 바깥이 취소)하면 나머지를 취소하고 정리될 때까지 기다림
+    - 단계들이 크기 제한 큐로 이어져 있어 한 단계가 죽으면 나머지가 put/get 에서 영원히 대기하므로
+    - 첫 예외를 그대로 전파 (TaskGroup 의 ExceptionGroup 대신 → 호출부의 except LLMCacheMiss 등이 그대로 동작)
+    """
+    import asyncio
+
+    tasks = [asyncio.ensure_future(a) for a in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    finally:
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _stream_pipeline(
+    session,
+    pending: List[Dict[str, Any]],
+    vectordb,
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[str]]:
+    """
+    pending 카드들을 스트리밍으로 처리.
+    - 상세는 완료 순서대로 들어오고, LLM 워커 N개가 도착한 것부터 정리/태깅 (ainvoke, 스레드 없음)
+    - 업서트는 _PIPE_UPSERT_BATCH 개씩 (또는 _PIPE_FLUSH_S 동안 입력 없으면) 한 번에
+    - 본문은 단계를 지나면 버리고 details 에는 요약(url/chars/cached/error)만 남김 → 메모리 일정
+    - 한 단계가 실패하면 나머지 단계를 취소하고 상세 수집기를 닫은 뒤 예외 전파 (세션 락 즉시 반환)
+    반환: (details 요약, created[{name,id,tags}], 업서트 성공 카드 URL)
+    """
+    import asyncio
+
+    urls = [_normalize_all_tab(p["url"]) for p in pending]
+    q_llm: asyncio.Queue = asyncio.Queue(maxsize=_PIPE_QUEUE)
+    q_up: asyncio.Queue = asyncio.Queue(maxsize=_PIPE_QUEUE)
+    details: List[Optional[Dict[str, Any]]] = [None] * len(pending)
+    created: List[Tuple[int, Dict[str, Any]]] = []
+    upserted_urls: List[str] = []
+    busy = {"crawl": 0.0, "llm": 0.0, "upsert": 0.0}
+
+    async def crawl() -> None:
+        t = time.time()
+        it = session.iter_details(urls, buffer=_PIPE_QUEUE)
+        try:
+            async for i, d in it:
+                name, url = pending[i]["title"], pending[i]["url"]
+                raw_text = _budget_raw_text(d, name, url)
+                details[i] = {
+                    "url": d.get("url", url),
+                    "chars": len(d.get("full_text") or ""),
+                    **({"cached": True} if d.get("cached") else {}),
+                    **({"error": d["error"]} if d.get("error") else {}),
+                }
+                await q_llm.put((i, name, url, raw_text))
+        finally:
+            # 실패/취소로 중간에 빠져나와도 수집기를 닫아 세션 락과 페이지를 바로 반환
+            await it.aclose()
+            busy["crawl"] = time.time() - t
+        for _ in range(_PIPE_LLM_WORKERS):
+            await q_llm.put(None)
+
+    async def llm_worker() -> None:
+        while True:
+            job = await q_llm.get()
+            if job is None:
+                return
+            i, name, url, raw_text = job
+            _log(f"[PIPE {i}] LLM clean/tag: START name={name} raw_len={len(raw_text)}")
+            t = time.time()
+            cleaned, tags = await _aclean_and_tag_via_llm(name, raw_text, "")
+            busy["llm"] += time.time() - t
+            if not any(cleaned.values()):
+                # LLM 실패 폴백(빈 섹션)은 저장/워터마크하지 않음 → 다음 실행에서 다시 수집
+                details[i]["error"] = "llm: empty sections"
+                _log(f"[PIPE {i}] LLM clean/tag: EMPTY → skip upsert name={name}")
+                continue
+            _log(f"[PIPE {i}] LLM clean/tag: DONE tags={tags}")
+            await q_up.put((i, {"company_name": name, "structured": cleaned, "url": url, "tags": tags}))
+
+    async def flush(batch: List[Tuple[int, Dict[str, Any]]]) -> None:
+        if not batch:
+            return
+        t = time.time()
+        items = [it for _, it in batch]
+        results = await asyncio.to_thread(upsert_company_profiles, vectordb, items, overwrite=False)
+        busy["upsert"] += time.time() - t
+        _log("[PIPE] upsert batch n=", len(items), [(r["name"], r["status"]) for r in results])
+        for (i, it), r in zip(batch, results):
+            if r["status"] != "error":
+                created.append((i, {"name": r["name"], "id": r["id"], "tags": it.get("tags") or []}))
+                upserted_urls.append(it["url"])
+
+    async def upserter() -> None:
+        batch: List[Tuple[int, Dict[str, Any]]] = []
+        while True:
+            try:
+                job = await asyncio.wait_for(q_up.get(), timeout=_PIPE_FLUSH_S)
+            except asyncio.TimeoutError:
+                await flush(batch)
+                batch = []
+                continue
+            if job is None:
+                await flush(batch)
+                return
+            batch.append(job)
+            if len(batch) >= _PIPE_UPSERT_BATCH:
+                await flush(batch)
+                batch = []
+
+    async def llm_stage() -> None:
+        await _gather_or_cancel(*(llm_worker() for _ in range(_PIPE_LLM_WORKERS)))
+        await q_up.put(None)
+
+    t0 = time.time()
+    await _gather_or_cancel(crawl(), llm_stage(), upserter())
+    _log("[PIPE] wall=", f"{time.time() - t0:.3f}s",
+         "stage busy(s)=", {k: round(v, 3) for k, v in busy.items()},
+         "llm latency=", llm_latency_stats(), "tokens=", token_stats())
+
+    created.sort(key=lambda x: x[0])
+    return (
+        [d or {"url": urls[i], "error": "not fetched"} for i, d in enumerate(details)],
+        [c for _, c in created],
+        upserted_urls,
+    )
+
 
 # ── 7) 메인 에이전트 ──────────────────────────────────────────────────────────
 def startup_search_agent(state: State) -> State:
     """
     1) NextUnicorn 리스트만 먼저 수집
+       - 증분 모드(기본): watermark 에 있는 카드를 만나면 '더 보기' 중단 → 새 카드만
     2) VDB(Chroma)에서 회사명 존재 여부 확인
-       - 하나라도 이미 있으면: 즉시 종료(최신 우선 정책)
-       - 없으면: 해당 항목만 상세 본문 수집 → LLM 정리/태깅 → 업서트
+       - 증분 모드: 이미 있는 회사만 건너뛰고 나머지는 계속 처리
+       - 비증분 모드: 하나라도 이미 있으면 즉시 종료(최신 우선 정책)
+       - 없는 항목만 상세 본문 수집 → LLM 정리/태깅 → 업서트 → watermark 갱신
+         (세 단계는 크기 제한 큐로 이어진 스트리밍 파이프라인, _stream_pipeline)
     3) selected_companies 를 최대 10개로 채워 다음 노드가 사용할 수 있게 함
        - 이번에 업서트된 회사명이 있으면 그것들로
        - 없으면 기존 VDB에서 랜덤 10개 샘플링
@@ -197,9 +405,14 @@ def startup_search_agent(state: State) -> State:
     )
     headless: bool = state.get("headless", True)
     emit_raw: bool = state.get("emit_raw", False)
+    incremental: bool = state.get("incremental", _INCREMENTAL)
+    frontier = set(load_watermark()) if incremental else set()
+    # 이전 실행에서 실패한 카드: frontier 뒤에 있어 리스트 수집으로는 다시 안 보이므로 직접 합침
+    retry_cards = load_retry() if incremental else []
 
     _log("[BOOT] input_text=", state.get("input_text"))
-    _log("[BOOT] limit=", limit, "headless=", headless)
+    _log("[BOOT] limit=", limit, "headless=", headless,
+         "incremental=", incremental, "watermark=", len(frontier), "retry=", len(retry_cards))
     _log("[ENV ] VDB_PATH=", os.environ.get("VDB_PATH"))
     _log("[ENV ] CWD=", os.getcwd())
 
@@ -207,14 +420,20 @@ def startup_search_agent(state: State) -> State:
     details: List[Dict[str, Any]] = []
     errors: List[str] = list(state.get("errors", []))
     created_names: List[str] = []
+    seen_urls: List[str] = []  # watermark 에 기록할 (처리 완료/기존) 카드 URL
 
     # 1) 리스트 수집
     try:
         _log("[CRAWL] nextunicorn_list: START")
         t_list0 = time.time()
-        items = __import__("asyncio").run(
-            nextunicorn_list(limit=limit, headless=headless)
-        )
+        if frontier:
+            # 새 카드 수만큼만 '더 보기' (frontier 도달 시 중단, _DELTA_MAX 는 안전 상한)
+            items = run_crawl(
+                lambda s: s.list(limit=max(limit, _DELTA_MAX), frontier=frontier),
+                headless=headless,
+            )
+        else:
+            items = run_crawl(lambda s: s.list(limit=limit), headless=headless)
         t_list1 = time.time()
         _log("[CRAWL] nextunicorn_list: DONE items=", len(items),
              "elapsed=", f"{t_list1 - t_list0:.3f}s")
@@ -223,6 +442,10 @@ def startup_search_agent(state: State) -> State:
         _log("[CRAWL][ERROR]", e)
         traceback.print_exc()
 
+    if retry_cards:
+        listed = {canonical_company_url(it.get("url") or "") for it in items}
+        items.extend(c for c in retry_cards if canonical_company_url(c["url"]) not in listed)
+
     if emit_raw:
         print("[CRAWL] items dump:")
         print(json.dumps({"items": items, "errors": errors}, ensure_ascii=False, indent=2))
@@ -240,8 +463,18 @@ def startup_search_agent(state: State) -> State:
         except Exception:
             pass
 
+        # 전체 카드 이름을 한 번에 확인 ($in get 1회 + 미스 배치 임베딩 + multi-query 1회)
+        names = [(it.get("title") or "").strip() for it in items]
+        t_chk0 = time.time()
+        found_list = find_companies_exact_or_similar(
+            vectordb, [n for n in names if n], k=3, score_threshold=0.18
+        )
+        found_by_name = dict(zip([n for n in names if n], found_list))
+        _log("[CHROMA] find_companies_exact_or_similar: DONE n=", len(found_list),
+             "elapsed=", f"{time.time() - t_chk0:.3f}s")
+
         for idx, it in enumerate(items):
-            name = (it.get("title") or "").strip()
+            name = names[idx]
             url = it.get("url") or ""
             _log(f"[CHROMA][LOOP {idx}] name={name} url={url}")
 
@@ -249,11 +482,13 @@ def startup_search_agent(state: State) -> State:
                 _log(f"[CHROMA][LOOP {idx}] SKIP empty name")
                 continue
 
-            _log(f"[CHROMA][LOOP {idx}] find_company_exact_or_similar: START")
-            found_id, _ = find_company_exact_or_similar(
-                vectordb, company_name=name, k=3, score_threshold=0.18
-            )
-            _log(f"[CHROMA][LOOP {idx}] find_company_exact_or_similar: found_id={found_id}")
+            found_id, _ = found_by_name.get(name, (None, 1.0))
+            _log(f"[CHROMA][LOOP {idx}] found_id={found_id}")
+
+            if found_id and incremental:
+                _log(f"[CHROMA][LOOP {idx}] EXISTS → SKIP (증분 모드)")
+                seen_urls.append(url)
+                continue
 
             if found_id:
                 _log(f"[CHROMA][LOOP {idx}] EXISTS → EARLY EXIT (최신 우선 정책)")
@@ -293,48 +528,17 @@ def startup_search_agent(state: State) -> State:
         if not pending:
             _log("[DETAIL] pending=0 → nothing to do")
         else:
-            urls = [_normalize_all_tab(p["url"]) for p in pending if p.get("url")]
-            _log("[DETAIL] batch fetch: START urls=", len(urls))
-            t_det0 = time.time()
-            details = __import__("asyncio").run(
-                nextunicorn_company_details_batch(urls, headless=headless)
+            _log("[PIPE] stream crawl→LLM→upsert: START pending=", len(pending),
+                 "llm_workers=", _PIPE_LLM_WORKERS, "upsert_batch=", _PIPE_UPSERT_BATCH)
+            t_pipe0 = time.time()
+            details, created, upserted_urls = run_crawl(
+                lambda s: _stream_pipeline(s, pending, vectordb),
+                headless=headless,
             )
-            t_det1 = time.time()
-            _log("[DETAIL] batch fetch: DONE details=", len(details),
-                 "elapsed=", f"{t_det1 - t_det0:.3f}s")
-
-            # URL → full_text 매핑
-            url2text = {d["url"].replace("?tab=all", ""): d.get("full_text", "") for d in details}
-
-            created = []
-            t_llm0 = time.time()
-            for idx, it in enumerate(pending):
-                name = it["title"]
-                url = it["url"]
-                raw_text = url2text.get(url, "") or url2text.get(_normalize_all_tab(url), "")
-                if not raw_text:
-                    raw_text = "\n".join(filter(None, [name, url]))
-
-                _log(f"[UPSERT {idx}] LLM clean/tag: START name={name} raw_len={len(raw_text)}")
-                cleaned, tags = _clean_and_tag_via_llm(
-                    name=name, raw_text=raw_text, hint="", emit=True
-                )
-                _log(f"[UPSERT {idx}] LLM clean/tag: DONE tags={tags}")
-
-                _log(f"[UPSERT {idx}] upsert_company_profile: START")
-                doc_id = upsert_company_profile(
-                    vectordb,
-                    company_name=name,
-                    structured=cleaned,
-                    url=url,
-                    overwrite=False,
-                    tags=tags,
-                )
-                _log(f"[UPSERT {idx}] upsert_company_profile: DONE doc_id={doc_id}")
-                created.append({"name": name, "id": doc_id, "tags": tags})
-
-            t_llm1 = time.time()
-            _log("[UPSERT] TOTAL LLM+UPSERT elapsed=", f"{t_llm1 - t_llm0:.3f}s")
+            # 업서트 실패분은 seen_urls 에 없으므로 3-1) 에서 retry 목록으로 저장
+            seen_urls.extend(upserted_urls)
+            _log("[PIPE] DONE details=", len(details), "created=", len(created),
+                 "elapsed=", f"{time.time() - t_pipe0:.3f}s", "session=", crawl_session_stats())
 
             created_names = [c["name"] for c in created if "name" in c]
 
@@ -349,11 +553,29 @@ def startup_search_agent(state: State) -> State:
                     print("[CHROMA] count error:", e)
                     traceback.print_exc()
 
+    except LLMCacheMiss:
+        raise
     except Exception as e:
         errors.append(f"[detail] {e}")
         _log("[DETAIL][ERROR]", e)
         traceback.print_exc()
 
+    # 3-1) watermark 갱신 (리스트 순서 = 최신순 유지)
+    #   처리 완료/기존 카드 → urls, 나머지(LLM·업서트 실패, 단계 오류로 못 본 카드) → retry
+    if incremental and (seen_urls or items or retry_cards):
+        try:
+            order = {it.get("url"): i for i, it in enumerate(items)}
+            done = {canonical_company_url(u) for u in seen_urls}
+            retry = [
+                it for it in items
+                if (it.get("title") or "").strip() and canonical_company_url(it.get("url") or "") not in done
+            ]
+            wm = save_watermark(sorted(seen_urls, key=lambda u: order.get(u, len(order))), retry=retry)
+            _log("[WATERMARK] saved urls=", len(wm), "new=", len(seen_urls), "retry=", len(retry))
+        except Exception as e:
+            errors.append(f"[watermark] {e}")
+            _log("[WATERMARK][ERROR]", e)
+
     # 4) selected_companies 채우기 (업서트 성공분 or 기존 랜덤)
     try:
         if created_names:
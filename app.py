@@ -1,5 +1,12 @@
 from state import State
 from graph import investment_app
+from config.chroma import close, warmup, registry_metrics
+from repositories.retrieval_memo import retrieval_memo_stats
+from tools.nextunicorn import crawl_session_stats
+from tools.llm_cache import llm_cache_stats
+from tools.token_budget import token_stats
+from tools.llm_provider import llm_provider_stats
+from tools.rate_limiter import rate_limiter_stats
 
 if __name__ == "__main__":
     initial_state: State = {
@@ -13,5 +20,17 @@ if __name__ == "__main__":
         "investment_decision": None,
     }
 
-    result = investment_app.invoke(initial_state, config={"recursion_limit": 200})
-    print("✅ 최종 실행 결과:", result)
+    warmup()
+    try:
+        result = investment_app.invoke(initial_state, config={"recursion_limit": 200})
+        print("✅ 최종 실행 결과:", result)
+        print("📊 임베딩/VDB 로드 metrics:", registry_metrics())
+        print("📊 검색 메모 metrics:", retrieval_memo_stats())
+        print("📊 크롤 세션 metrics:", crawl_session_stats())
+        print("📊 LLM 캐시 metrics:", llm_cache_stats())
+        print("📊 프롬프트 토큰 metrics:", token_stats())
+        print("📊 LLM 연결 metrics:", llm_provider_stats())
+        print("📊 LLM 속도 제한 metrics:", rate_limiter_stats())
+    finally:
+        # 임베딩 캐시 flush, 로컬 스토어 인덱스 저장/SQLite 닫기, 임베딩 워커 풀 종료
+        close()
@@ -0,0 +1,183 @@
+# config/bulk_embedder.py
+"""
+대량 적재용 임베딩 엔진
+- 토큰 길이로 정렬 → 토큰 예산(batch_tokens) 안에서 길이가 비슷한 텍스트끼리 버킷 구성
+  (짧은 텍스트가 긴 텍스트 길이만큼 padding 되는 낭비 제거)
+- max_seq_length 는 명시했을 때만 모델에 적용 (기본 None = 모델 기본값, bge-m3 8192)
+  모델은 질의/회사 프로필 임베딩과 공유되므로 바꾸면 모든 벡터가 잘리고 기존 적재 벡터와 달라짐
+- workers > 1 이면 sentence-transformers multi-process pool 로 CPU 코어 분산
+- industry 적재(_chroma_insert_texts)와 회사 upsert 모두 get_embeddings() 경유로 사용
+
+벤치마크:
+    python -m config.bulk_embedder [n_texts]
+"""
+from __future__ import annotations
+import threading
+from typing import Any, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+
+def _st_model(hf: Any) -> Any:
+    """HuggingFaceEmbeddings 내부 SentenceTransformer 핸들 (버전별 속성명 차이 대응)"""
+    model = getattr(hf, "_client", None) or getattr(hf, "client", None)
+    if model is None:
+        raise RuntimeError("SentenceTransformer 모델 핸들을 찾을 수 없습니다.")
+    return model
+
+
+class BulkEmbeddings(Embeddings):
+    """HuggingFaceEmbeddings 를 감싸 embed_documents 만 길이 버킷/멀티프로세스로 처리."""
+
+    def __init__(
+        self,
+        hf: Any,
+        *,
+        max_seq_length: Optional[int] = None,
+        batch_size: int = 32,
+        batch_tokens: int = 16384,
+        workers: int = 0,
+        min_pool_texts: int = 64,
+    ):
+        self._hf = hf
+        self._model = _st_model(hf)
+        if max_seq_length:
+            self._model.max_seq_length = max_seq_length
+        self._max_seq_length = int(self._model.max_seq_length)
+        self._batch_size = max(1, batch_size)
+        self._batch_tokens = max(self._max_seq_length, batch_tokens)
+        self._workers = workers
+        self._min_pool_texts = min_pool_texts
+        self._pool: Optional[dict] = None
+        self._pool_lock = threading.Lock()
+        encode_kwargs = getattr(hf, "encode_kwargs", None) or {}
+        self._normalize = bool(encode_kwargs.get("normalize_embeddings", False))
+
+    @property
+    def max_seq_length(self) -> int:
+        """실제 적용된 모델 max_seq_length (미지정 시 모델 기본값)"""
+        return self._max_seq_length
+
+    # ── 버킷 구성 ─────────────────────────────────────────────────────────────
+    def _token_lengths(self, texts: List[str]) -> List[int]:
+        tok = self._model.tokenizer
+        enc = tok(
+            texts,
+            truncation=True,
+            max_length=self._max_seq_length,
+            return_attention_mask=False,
+            return_token_type_ids=False,
+        )
+        return [len(ids) for ids in enc["input_ids"]]
+
+    def _buckets(self, order: List[int], lengths: List[int]) -> List[List[int]]:
+        """오름차순 정렬된 인덱스를 (개수 ≤ batch_size, 최대길이×개수 ≤ batch_tokens) 버킷으로 분할"""
+        buckets: List[List[int]] = []
+        cur: List[int] = []
+        for i in order:
+            L = max(1, lengths[i])
+            if cur and (len(cur) >= self._batch_size or L * (len(cur) + 1) > self._batch_tokens):
+                buckets.append(cur)
+                cur = []
+            cur.append(i)
+        if cur:
+            buckets.append(cur)
+        return buckets
+
+    # ── 멀티프로세스 풀 ───────────────────────────────────────────────────────
+    def _get_pool(self) -> dict:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = self._model.start_multi_process_pool(["cpu"] * self._workers)
+            return self._pool
+
+    def close(self) -> None:
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            try:
+                self._model.stop_multi_process_pool(pool)
+            except Exception:
+                pass
+
+    # ── Embeddings API ────────────────────────────────────────────────────────
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        texts = [t.replace("\n", " ") for t in texts]
+        lengths = self._token_lengths(texts)
+        order = sorted(range(len(texts)), key=lambda i: lengths[i])
+        out = np.zeros((len(texts), 0), dtype=np.float32)
+
+        if self._workers > 1 and len(texts) >= self._min_pool_texts:
+            # 정렬된 순서로 넘기면 워커별 chunk 가 비슷한 길이끼리 묶인다
+            sorted_texts = [texts[i] for i in order]
+            vecs = self._model.encode_multi_process(
+                sorted_texts,
+                self._get_pool(),
+                batch_size=self._batch_size,
+                normalize_embeddings=self._normalize,
+            )
+            out = np.empty_like(vecs)
+            out[order] = vecs
+            return out.tolist()
+
+        for bucket in self._buckets(order, lengths):
+            vecs = self._model.encode(
+                [texts[i] for i in bucket],
+                batch_size=len(bucket),
+                convert_to_numpy=True,
+                normalize_embeddings=self._normalize,
+                show_progress_bar=False,
+            )
+            if out.shape[1] == 0:
+                out = np.zeros((len(texts), vecs.shape[1]), dtype=np.float32)
+            out[bucket] = vecs
+        return out.tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._hf.embed_query(text)
+
+
+# ── 벤치마크: 기존 경로(HuggingFaceEmbeddings.embed_documents) 대비 chunks/s ──
+if __name__ == "__main__":
+    import os
+    import sys
+    import time
+    from pathlib import Path
+    from langchain_huggingface import HuggingFaceEmbeddings
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 512
+    model_name = os.getenv("EMBED_MODEL", "BAAI/bge-m3")
+
+    # docs/*.md (industry 적재 산출물)가 있으면 실제 청크, 없으면 길이가 섞인 합성 텍스트
+    md = "\n".join(p.read_text(encoding="utf-8") for p in sorted(Path("docs").glob("*.md")))
+    if md:
+        splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=150)
+        texts = [c.page_content for c in splitter.create_documents([md])]
+    else:
+        rng = np.random.default_rng(0)
+        base = "모빌리티 스타트업 전기차 자율주행 전동킥보드 시장 동향 정책 통계 보고서 "
+        texts = [base * int(rng.integers(1, 40)) for _ in range(n)]
+    texts = (texts * (n // max(1, len(texts)) + 1))[:n]
+
+    hf = HuggingFaceEmbeddings(model_name=model_name, model_kwargs={"device": "cpu"})
+    hf.embed_documents(texts[:8])  # warmup
+
+    def bench(label: str, fn) -> None:
+        t0 = time.time()
+        fn(texts)
+        dt = time.time() - t0
+        print(f"{label:<28} {len(texts)} chunks  {dt:7.2f}s  {len(texts) / dt:8.1f} chunks/s")
+
+    bench("baseline(embed_documents)", hf.embed_documents)
+    bulk = BulkEmbeddings(hf, workers=0)
+    bench("bucketed(single-process)", bulk.embed_documents)
+    workers = int(os.getenv("EMBED_WORKERS", "0")) or max(2, (os.cpu_count() or 2) // 2)
+    pooled = BulkEmbeddings(hf, workers=workers)
+    try:
+        bench(f"bucketed(pool x{workers})", pooled.embed_documents)
+    finally:
+        pooled.close()
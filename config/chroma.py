@@ -1,32 +1,220 @@
 import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
 from dotenv import load_dotenv
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
 from langchain_chroma import Chroma
 from langchain_huggingface import HuggingFaceEmbeddings
+from config.embedding_cache import CachedEmbeddings
+from config.bulk_embedder import BulkEmbeddings
 
 load_dotenv()
 
 VDB_PATH = os.getenv("VDB_PATH", "./data/vector_store")
 MODEL_NAME = os.getenv("EMBED_MODEL", "BAAI/bge-m3")
+# 임베딩 디스크 캐시 (EMBED_CACHE=0 으로 끔)
+EMBED_CACHE = os.getenv("EMBED_CACHE", "1") != "0"
+EMBED_CACHE_DIR = os.getenv("EMBED_CACHE_DIR", "./data/embed_cache")
+EMBED_CACHE_MAX = int(os.getenv("EMBED_CACHE_MAX", "50000"))
+# 대량 인코딩: 최대 시퀀스 길이 / 배치 / 버킷 토큰 예산 / 워커 프로세스 수 (0 = 단일 프로세스)
+#   EMBED_MAX_SEQ_LEN 미설정 → 모델 기본값 유지. 설정하면 질의/회사 임베딩까지 모두 잘리므로 재적재 필요
+EMBED_MAX_SEQ_LEN = int(os.getenv("EMBED_MAX_SEQ_LEN") or 0) or None
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "32"))
+EMBED_BATCH_TOKENS = int(os.getenv("EMBED_BATCH_TOKENS", "16384"))
+EMBED_WORKERS = int(os.getenv("EMBED_WORKERS", "0"))
+COLLECTION_NAME = "investment_ai"
+# 벡터 백엔드: chroma(기본) | numpy (exact brute-force, VDB_PATH/numpy) | faiss (ANN, VDB_PATH/faiss)
+VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "chroma").lower()
+VECTOR_DTYPE = os.getenv("VECTOR_DTYPE", "float16")  # numpy 백엔드 저장 dtype: float16 | int8
+FAISS_INDEX = os.getenv("FAISS_INDEX", "hnsw").lower()  # faiss 백엔드 인덱스: hnsw | ivfpq
 
-def get_embeddings():
+
+class _LockedEmbeddings(Embeddings):
+    """
+    HuggingFace 임베딩을 여러 스레드에서 공유하기 위한 얇은 래퍼.
+    fast tokenizer 는 동시 호출 시 'Already borrowed' 오류가 나므로 encode 구간만 직렬화한다.
+    """
+
+    def __init__(self, base: Embeddings):
+        self._base = base
+        self._lock = threading.RLock()
+
+    @property
+    def base(self) -> Embeddings:
+        return self._base
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        with self._lock:
+            return self._base.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        with self._lock:
+            return self._base.embed_query(text)
+
+
+def _build_store(embeddings: Embeddings) -> VectorStore:
+    """VECTOR_BACKEND 에 맞는 VectorStore 생성 (모두 Chroma 와 같은 호출 표면)"""
+    if VECTOR_BACKEND == "numpy":
+        from repositories.numpy_store import NumpyVectorStore
+        return NumpyVectorStore(
+            dtype=VECTOR_DTYPE,
+            embedding_function=embeddings,
+            persist_directory=os.path.join(VDB_PATH, "numpy"),
+            collection_name=COLLECTION_NAME,
+        )
+    if VECTOR_BACKEND == "faiss":
+        from repositories.faiss_store import FaissVectorStore
+        return FaissVectorStore(
+            index_type=FAISS_INDEX,
+            embedding_function=embeddings,
+            persist_directory=os.path.join(VDB_PATH, "faiss"),
+            collection_name=COLLECTION_NAME,
+        )
+    if VECTOR_BACKEND != "chroma":
+        raise ValueError(f"알 수 없는 VECTOR_BACKEND: {VECTOR_BACKEND} (chroma|numpy|faiss)")
+    return Chroma(
+        collection_name=COLLECTION_NAME,
+        embedding_function=embeddings,
+        persist_directory=VDB_PATH
+    )
+
+
+class _Registry:
+    """
+    프로세스 단위 임베딩 모델 / VectorStore 레지스트리.
+    - 모델/클라이언트는 최초 요청 시 한 번만 로드 (double-checked lock)
+    - 로드 횟수/소요 시간/재사용 횟수를 metrics 로 노출
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # 카운터 전용 락: 재사용(hit) 집계가 모델 로드 중인 _lock 을 기다리지 않도록 분리
+        self._metrics_lock = threading.Lock()
+        self._embeddings: Optional[Embeddings] = None
+        self._bulk: Optional[BulkEmbeddings] = None
+        self._store: Optional[VectorStore] = None
+        self._metrics: Dict[str, Any] = {
+            "embed_loads": 0,
+            "embed_load_s": 0.0,
+            "embed_hits": 0,
+            "store_loads": 0,
+            "store_load_s": 0.0,
+            "store_hits": 0,
+        }
+
+    def _count(self, **inc: float) -> None:
+        with self._metrics_lock:
+            for k, v in inc.items():
+                self._metrics[k] += v
+
+    def embeddings(self) -> Embeddings:
+        emb = self._embeddings
+        if emb is not None:
+            self._count(embed_hits=1)
+            return emb
+        with self._lock:
+            if self._embeddings is None:
+                t0 = time.time()
+                base = HuggingFaceEmbeddings(
+                    model_name=MODEL_NAME,
+                    model_kwargs={"device": "cpu"}
+                )
+                self._bulk = BulkEmbeddings(
+                    base,
+                    max_seq_length=EMBED_MAX_SEQ_LEN,
+                    batch_size=EMBED_BATCH_SIZE,
+                    batch_tokens=EMBED_BATCH_TOKENS,
+                    workers=EMBED_WORKERS,
+                )
+                emb = _LockedEmbeddings(self._bulk)
+                if EMBED_CACHE:
+                    emb = CachedEmbeddings(
+                        emb,
+                        model_name=MODEL_NAME,
+                        cache_dir=EMBED_CACHE_DIR,
+                        max_entries=EMBED_CACHE_MAX,
+                        max_seq_length=self._bulk.max_seq_length,
+                    )
+                self._embeddings = emb
+                self._count(embed_loads=1, embed_load_s=time.time() - t0)
+                print(f"🧠 [EMBED] {MODEL_NAME} 로드 완료 ({time.time() - t0:.2f}s)")
+            else:
+                self._count(embed_hits=1)
+            return self._embeddings
+
+    def vector_store(self) -> VectorStore:
+        store = self._store
+        if store is not None:
+            self._count(store_hits=1)
+            return store
+        embeddings = self.embeddings()
+        with self._lock:
+            if self._store is None:
+                t0 = time.time()
+                self._store = _build_store(embeddings)
+                self._count(store_loads=1, store_load_s=time.time() - t0)
+            else:
+                self._count(store_hits=1)
+            return self._store
+
+    def close(self) -> None:
+        with self._lock:
+            store, self._store = self._store, None
+            emb, self._embeddings = self._embeddings, None
+            bulk, self._bulk = self._bulk, None
+        if isinstance(emb, CachedEmbeddings):
+            emb.close()
+        if bulk is not None:
+            bulk.close()
+        if store is not None and hasattr(store, "close"):
+            store.close()
+        elif store is not None:
+            try:
+                # chromadb 는 persist 디렉토리별 System 을 프로세스 캐시에 보관
+                store._client.clear_system_cache()
+            except Exception:
+                pass
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._metrics_lock:
+            m = dict(self._metrics)
+        if isinstance(self._embeddings, CachedEmbeddings):
+            m["embed_cache"] = self._embeddings.stats()
+        return m
+
+
+_REGISTRY = _Registry()
+
+
+def get_embeddings() -> Embeddings:
     """
     HuggingFace 로컬 임베딩 모델 사용.
     최초 실행 시 HuggingFace Hub에서 모델 다운로드 후 캐시에 저장,
     이후 실행은 로컬 캐시에서 불러옵니다.
+    프로세스당 한 번만 로드되며, 반환 핸들은 여러 스레드에서 공유해도 안전합니다.
     """
-    return HuggingFaceEmbeddings(
-        model_name=MODEL_NAME,
-        model_kwargs={"device": "cpu"}
-    )
+    return _REGISTRY.embeddings()
 
-def get_vector_store():
+def get_vector_store() -> VectorStore:
     """
     Chroma VectorStore 생성/로드.
+    프로세스당 클라이언트 1개를 만들어 재사용합니다.
+    VECTOR_BACKEND=numpy 면 같은 API 의 exact brute-force 스토어를,
+    VECTOR_BACKEND=faiss 면 FAISS(HNSW/IVF-PQ) 스토어를 반환합니다.
     """
-    embeddings = get_embeddings()
-    vectordb = Chroma(
-        collection_name="investment_ai",
-        embedding_function=embeddings,
-        persist_directory=VDB_PATH
-    )
-    return vectordb
\ No newline at end of file
+    return _REGISTRY.vector_store()
+
+def warmup() -> Dict[str, Any]:
+    """임베딩 모델과 VectorStore 를 미리 로드 (첫 노드 지연 제거용). 로드 metrics 반환."""
+    _REGISTRY.vector_store()
+    return _REGISTRY.metrics()
+
+def close() -> None:
+    """캐시된 모델/클라이언트 해제. 이후 get_* 호출 시 다시 로드됩니다."""
+    _REGISTRY.close()
+
+def registry_metrics() -> Dict[str, Any]:
+    """로드 횟수/로드 시간(s)/재사용 횟수 (+ 임베딩 캐시 hit/miss)"""
+    return _REGISTRY.metrics()
@@ -0,0 +1,232 @@
+# config/embedding_cache.py
+"""
+디스크 영속 임베딩 캐시 (content-addressed)
+- 키: sha1(모델명 + max_seq_length + 정규화 텍스트) — 잘림 길이가 바뀌면 다른 벡터이므로 키도 분리
+- 저장: {cache_dir}/{model}/vectors.f32 (np.memmap, [max_entries, dim]) + index.json (키 → 슬롯)
+- 용량 초과 시 LRU(최근 사용 tick 기준)로 슬롯 회수
+- index.json 은 miss 마다가 아니라 flush_every 건 / flush_interval_s 초마다, 그리고 flush()/close() 때 기록
+- get_embeddings() 가 반환하는 embedding_function 으로 그대로 꽂아 쓰는 Embeddings 구현
+"""
+from __future__ import annotations
+import atexit
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+_WS = re.compile(r"\s+")
+_INDEX_FILE = "index.json"
+_VECTORS_FILE = "vectors.f32"
+
+
+def normalize_text(text: str) -> str:
+    """캐시 키용 정규화: NFKC + 공백 축약 + strip"""
+    return _WS.sub(" ", unicodedata.normalize("NFKC", text or "")).strip()
+
+
+def _safe_dirname(model_name: str) -> str:
+    return re.sub(r"[^\w\-.]", "_", model_name)
+
+
+class CachedEmbeddings(Embeddings):
+    """base 임베딩 앞단에서 hit 는 memmap 에서, miss 만 모아 base 로 한 번에 인코딩."""
+
+    def __init__(
+        self,
+        base: Embeddings,
+        *,
+        model_name: str,
+        cache_dir: str,
+        max_entries: int = 50000,
+        max_seq_length: Optional[int] = None,
+        flush_every: int = 256,
+        flush_interval_s: float = 30.0,
+    ):
+        self._base = base
+        self._model_name = model_name
+        self._seq_ns = str(max_seq_length) if max_seq_length else "default"
+        self._dir = Path(cache_dir) / _safe_dirname(model_name)
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._max_entries = max(1, int(max_entries))
+        self._lock = threading.Lock()
+
+        self._dim: Optional[int] = None
+        self._vectors: Optional[np.memmap] = None
+        self._entries: Dict[str, List[int]] = {}  # key -> [slot, last_used_tick]
+        self._free: List[int] = []
+        self._tick = 0
+        self._dirty = False
+        self._unflushed = 0
+        self._flush_every = max(1, int(flush_every))
+        self._flush_interval_s = flush_interval_s
+        self._last_flush = time.monotonic()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self._load()
+        # flush 임계치 전에 종료돼도 남은 miss 를 잃지 않도록
+        atexit.register(self.close)
+
+    # ── 저장소 ────────────────────────────────────────────────────────────────
+    def _load(self) -> None:
+        idx_path = self._dir / _INDEX_FILE
+        if not idx_path.exists():
+            return
+        try:
+            idx = json.loads(idx_path.read_text(encoding="utf-8"))
+            if idx.get("model") != self._model_name or int(idx.get("max_entries", 0)) != self._max_entries:
+                # 모델/용량이 바뀌면 슬롯 배치가 달라지므로 새로 시작
+                return
+            self._dim = int(idx["dim"])
+            self._tick = int(idx.get("tick", 0))
+            self._entries = {k: list(v) for k, v in (idx.get("entries") or {}).items()}
+            self._open_vectors(mode="r+")
+            used = {v[0] for v in self._entries.values()}
+            self._free = [s for s in range(self._max_entries - 1, -1, -1) if s not in used]
+        except Exception:
+            self._dim, self._vectors, self._entries, self._free, self._tick = None, None, {}, [], 0
+
+    def _open_vectors(self, mode: str) -> None:
+        self._vectors = np.memmap(
+            self._dir / _VECTORS_FILE,
+            dtype=np.float32,
+            mode=mode,
+            shape=(self._max_entries, self._dim),
+        )
+
+    def _init_storage(self, dim: int) -> None:
+        self._dim = dim
+        self._entries = {}
+        self._free = list(range(self._max_entries - 1, -1, -1))
+        # 옛 index.json 이 새로 만든 vectors 파일을 가리키지 않도록 먼저 제거
+        (self._dir / _INDEX_FILE).unlink(missing_ok=True)
+        self._open_vectors(mode="w+")
+
+    def flush(self) -> None:
+        """memmap/인덱스를 디스크에 기록 (임시 파일 → replace)"""
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        """남은 miss 를 기록. 이후에도 계속 사용할 수 있음"""
+        self.flush()
+
+    def _maybe_flush_locked(self) -> None:
+        if (
+            self._unflushed >= self._flush_every
+            or time.monotonic() - self._last_flush >= self._flush_interval_s
+        ):
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if not self._dirty or self._vectors is None:
+            return
+        self._vectors.flush()
+        idx = {
+            "model": self._model_name,
+            "dim": self._dim,
+            "max_entries": self._max_entries,
+            "tick": self._tick,
+            "entries": self._entries,
+        }
+        tmp = self._dir / (_INDEX_FILE + ".tmp")
+        tmp.write_text(json.dumps(idx), encoding="utf-8")
+        os.replace(tmp, self._dir / _INDEX_FILE)
+        self._dirty = False
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+
+    def _evict_locked(self, need: int) -> None:
+        """LRU 순으로 need 개 이상(최소 용량의 10%) 슬롯 회수"""
+        n = max(need, self._max_entries // 10)
+        victims = sorted(self._entries.items(), key=lambda kv: kv[1][1])[:n]
+        for key, (slot, _) in victims:
+            del self._entries[key]
+            self._free.append(slot)
+        self._stats["evictions"] += len(victims)
+        # 디스크의 index.json 이 아직 회수된 슬롯을 가리키므로, 슬롯을 덮어쓰기 전에 인덱스부터 기록
+        # (그렇지 않으면 비정상 종료 후 옛 키로 새 벡터가 조회됨)
+        self._dirty = True
+        self._flush_locked()
+
+    # ── 조회/저장 ──────────────────────────────────────────────────────────────
+    def _key(self, text: str, ns: str) -> str:
+        raw = f"{self._model_name}\0{self._seq_ns}\0{ns}\0{normalize_text(text)}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _embed_cached(self, texts: List[str], ns: str) -> List[List[float]]:
+        keys = [self._key(t, ns) for t in texts]
+        out: List[Optional[List[float]]] = [None] * len(texts)
+        miss_pos: Dict[str, List[int]] = {}
+
+        with self._lock:
+            for i, k in enumerate(keys):
+                ent = self._entries.get(k)
+                if ent is not None and self._vectors is not None:
+                    self._tick += 1
+                    ent[1] = self._tick
+                    out[i] = self._vectors[ent[0]].tolist()
+                    self._stats["hits"] += 1
+                else:
+                    miss_pos.setdefault(k, []).append(i)
+            self._stats["misses"] += sum(len(v) for v in miss_pos.values())
+
+        if not miss_pos:
+            return out  # type: ignore[return-value]
+
+        # 동일 텍스트는 한 번만 인코딩
+        miss_keys = list(miss_pos.keys())
+        miss_texts = [texts[miss_pos[k][0]] for k in miss_keys]
+        if ns == "q":
+            vecs = [self._base.embed_query(t) for t in miss_texts]
+        else:
+            vecs = self._base.embed_documents(miss_texts)
+
+        with self._lock:
+            arr = np.asarray(vecs, dtype=np.float32)
+            if self._vectors is None or self._dim != arr.shape[1]:
+                self._init_storage(int(arr.shape[1]))
+            if len(self._free) < len(miss_keys):
+                self._evict_locked(len(miss_keys) - len(self._free))
+            for k, v in zip(miss_keys, arr):
+                if k in self._entries:
+                    continue
+                if not self._free:
+                    break
+                slot = self._free.pop()
+                self._vectors[slot] = v
+                self._tick += 1
+                self._entries[k] = [slot, self._tick]
+                self._unflushed += 1
+            self._dirty = True
+            self._maybe_flush_locked()
+
+        for k, v in zip(miss_keys, vecs):
+            vv = list(map(float, v))
+            for i in miss_pos[k]:
+                out[i] = vv
+        return out  # type: ignore[return-value]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        return self._embed_cached(list(texts), ns="d")
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed_cached([text], ns="q")[0]
+
+    # ── metrics ───────────────────────────────────────────────────────────────
+    def stats(self) -> Dict[str, Any]:
+        s: Dict[str, Any] = dict(self._stats)
+        total = s["hits"] + s["misses"]
+        s["hit_rate"] = round(s["hits"] / total, 4) if total else 0.0
+        s["entries"] = len(self._entries)
+        s["max_entries"] = self._max_entries
+        s["unflushed"] = self._unflushed
+        return s
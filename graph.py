@@ -1,6 +1,8 @@
 from langgraph.graph import END, StateGraph
 from state import State
 from config.chroma import get_vector_store
+from repositories.company_index import get_company_index
+from repositories.retrieval_memo import get_run_memo
 
 # === Agent import ===
 from agents.startup_search_agent import startup_search_agent
@@ -75,27 +77,19 @@ def resume_analysis_node(state: State) -> State:
         state["current_company"] = current
         print(f"📋 [RESUME_ANALYSIS] 현재 분석 대상: {current}")
 
-        # 2) VDB에서 현재 기업명으로 검색 → 태그 파싱 (where 미사용, 로컬 필터링)
+        # 회사 단위 검색 메모 초기화 (이전 회사까지의 누적 hit율 출력)
+        memo = get_run_memo()
+        if memo.scope is not None:
+            print(f"📋 [RESUME_ANALYSIS] retrieval memo: {memo.stats()}")
+        memo.begin_scope(current)
+
+        # 2) 회사 인덱스(정규화 회사명 → 메타데이터)에서 태그 조회 (벡터 검색 없이 dict hit)
         tags = []
         if current:
             try:
-                vectordb = get_vector_store()
-                raw_docs = vectordb.similarity_search(query=current, k=32)
-
-                def _norm(s: str) -> str:
-                    # 공백 제거 후 비교: "제이 카" == "제이카"
-                    return "".join((s or "").split())
-
-                # kind=company && name == current(정규화 비교)
-                filtered = [
-                    d for d in raw_docs
-                    if d.metadata.get("kind") == "company"
-                    and _norm(d.metadata.get("name", "")) == _norm(current)
-                ]
-
-                if filtered:
-                    tags_str = filtered[0].metadata.get("tags", "") or ""
-                    tags = [t.strip() for t in tags_str.split("|") if t.strip()]
+                rec = get_company_index(get_vector_store()).get(current)
+                if rec:
+                    tags = list(rec.tags)
                     print(f"📋 [RESUME_ANALYSIS] {current} 태그: {tags}")
             except Exception as e:
                 # 검색 실패해도 파이프라인 계속
@@ -2,6 +2,9 @@
 from __future__ import annotations
 from typing import Tuple, List, Dict, Any, Optional
 
+from repositories.company_index import get_company_index
+from repositories.retrieval_memo import get_run_memo
+
 # ✅ 더 이상 config.chroma 에서 아무 것도 import 하지 않습니다.
 # from config.chroma import get_company_store, get_industry_store  # ← 삭제
 
@@ -23,6 +26,52 @@ def _join_sections(structured: Dict[str, str]) -> str:
     add("회사 정보", "info")
     return "\n".join(parts).strip()
 
+# ─────────────────────────────────────────────────────────────
+# 메타데이터 필터 pushdown 조회
+# ─────────────────────────────────────────────────────────────
+def build_where(
+    *,
+    kind: Optional[str] = None,
+    name: Optional[str] = None,
+    exclude_name: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Chroma where 절 생성.
+    - 조건이 2개 이상이면 $and
+    """
+    conds: List[Dict[str, Any]] = []
+    if kind:
+        conds.append({"kind": kind})
+    if name:
+        conds.append({"name": name})
+    if exclude_name:
+        conds.append({"name": {"$ne": exclude_name}})
+
+    if not conds:
+        return None
+    if len(conds) == 1:
+        return conds[0]
+    return {"$and": conds}
+
+def retrieve(
+    vectordb,
+    query: str,
+    *,
+    k: int = 5,
+    kind: Optional[str] = None,
+    name: Optional[str] = None,
+    exclude_name: Optional[str] = None,
+    with_scores: bool = False,
+) -> List[Any]:
+    """
+    where 필터를 Chroma 쿼리에 그대로 넘겨 조건에 맞는 문서 k개를 반환.
+    (over-fetch 후 파이썬 필터링 대신 벡터 검색 단계에서 후보를 제한)
+    with_scores=True 면 (Document, distance) 튜플 리스트.
+    질의 벡터/결과는 run 범위 메모를 거쳐 회사당 한 번만 임베딩·검색.
+    """
+    where = build_where(kind=kind, name=name, exclude_name=exclude_name)
+    return get_run_memo().search(vectordb, query, where=where, k=k, with_scores=with_scores)
+
 def find_company_exact_or_similar(
     vectordb,
     *,
@@ -95,6 +144,88 @@ def find_company_exact_or_similar(
         return None, 1.0
 
 
+def find_companies_exact_or_similar(
+    vectordb,
+    names: List[str],
+    *,
+    k: int = 3,
+    score_threshold: float = 0.18,
+) -> List[Tuple[Optional[str], float]]:
+    """
+    find_company_exact_or_similar 의 배치 버전 (입력 순서대로 (id|None, score) 반환).
+    1) name $in 메타데이터 get 1회로 exact match
+    2) 나머지는 한 번에 배치 임베딩 → multi-query 검색 1회
+    """
+    col = getattr(vectordb, "_collection", None)
+    if col is None:
+        return [
+            find_company_exact_or_similar(vectordb, company_name=n, k=k, score_threshold=score_threshold)
+            for n in names
+        ]
+
+    uniq = list(dict.fromkeys(n for n in names if n))
+    found: Dict[str, Tuple[Optional[str], float]] = {}
+
+    # 1) 메타데이터 exact match ($in)
+    if uniq:
+        try:
+            res = col.get(
+                where={"$and": [{"kind": "company"}, {"name": {"$in": uniq}}]},
+                include=["metadatas"],
+            )
+            ids = res.get("ids") or []
+            metas = res.get("metadatas") or []
+            for i, doc_id in enumerate(ids):
+                nm = ((metas[i] if i < len(metas) else None) or {}).get("name")
+                if nm and nm not in found:
+                    found[nm] = (doc_id, 0.0)
+        except Exception:
+            pass
+
+    # 2) 미스만 배치 임베딩 + multi-query 유사도 검색
+    misses = [n for n in uniq if n not in found]
+    if misses:
+        try:
+            vecs = vectordb.embeddings.embed_documents(misses)
+            res = col.query(
+                query_embeddings=vecs,
+                n_results=k,
+                where={"kind": "company"},
+                include=["metadatas", "distances"],
+            )
+            all_metas = res.get("metadatas") or []
+            all_dists = res.get("distances") or []
+            for qi, n in enumerate(misses):
+                metas = all_metas[qi] if qi < len(all_metas) else []
+                dists = all_dists[qi] if qi < len(all_dists) else []
+                best_id, best_score = None, 1e9
+                for md, dist in zip(metas or [], dists or []):
+                    cid = (md or {}).get("id") or (md or {}).get("name")
+                    if cid is not None and float(dist) < best_score:
+                        best_id, best_score = cid, float(dist)
+                if best_id is None:
+                    found[n] = (None, 1.0)
+                elif best_score <= score_threshold:
+                    found[n] = (best_id, best_score)
+                else:
+                    found[n] = (None, best_score)
+        except Exception:
+            for n in misses:
+                found.setdefault(n, (None, 1.0))
+
+    return [found.get(n, (None, 1.0)) for n in names]
+
+
+def _company_meta(company_name: str, url: str, tags: List[str] | None) -> Dict[str, Any]:
+    return {
+        "id": company_name,
+        "name": company_name,
+        "url": url,
+        "kind": "company",
+        "tags": " | ".join(tags or []),
+    }
+
+
 def upsert_company_profile(
     vectordb,
     *,
@@ -109,55 +240,103 @@ def upsert_company_profile(
     - id 는 company_name 그대로 사용 (한글 가능)
     - tags(list)는 " | " 로 합쳐 메타데이터에 저장
     """
-    doc_id = company_name
-    meta: Dict[str, Any] = {
-        "id": company_name,
-        "name": company_name,
-        "url": url,
-        "kind": "company",
-        "tags": " | ".join(tags or []),
-    }
-    text = _join_sections(structured)
+    res = upsert_company_profiles(
+        vectordb,
+        [{"company_name": company_name, "structured": structured, "url": url, "tags": tags}],
+        overwrite=overwrite,
+    )[0]
+    if res["status"] == "error":
+        raise RuntimeError(res.get("error") or f"upsert failed: {company_name}")
+    return res["id"]
 
-    # 덮어쓰기 옵션
-    if overwrite:
-        try:
-            vectordb.delete(ids=[doc_id])
-        except Exception:
-            pass
 
-    # 이미 존재하면 덮어쓰지 않고 종료 (overwrite=False)
-    if not overwrite:
-        try:
-            col = getattr(vectordb, "_collection", None)
-            if col is not None:
-                res = col.get(
-                    where={"$and": [{"kind": "company"}, {"id": doc_id}]},
-                    include=["ids"],
-                )
-                if res and res.get("ids"):
-                    return doc_id
-        except Exception:
-            pass
+def upsert_company_profiles(
+    vectordb,
+    items: List[Dict[str, Any]],
+    *,
+    overwrite: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    회사 문서 일괄 upsert.
+    - items: [{"company_name", "structured", "url", "tags"(선택), "overwrite"(선택)}]
+    - 존재 여부는 get(ids=[...]) 1회, 신규 텍스트는 한 번의 배치 인코딩, 쓰기는 upsert 1회
+    - 존재 여부 확인이 실패하면 아무것도 쓰지 않고 전 항목 error
+    - 반환: 입력 순서대로 {"name", "id", "status": created|overwritten|exists|error, "error"(선택)}
+    """
+    out: List[Dict[str, Any]] = []
+    docs: Dict[str, Dict[str, Any]] = {}  # doc_id → 쓰기 후보 (배치 내 중복은 마지막 항목 우선)
+    for it in items:
+        name = (it.get("company_name") or "").strip()
+        if not name:
+            out.append({"name": name, "id": None, "status": "error", "error": "empty company_name"})
+            continue
+        doc_id = name
+        tags = it.get("tags")
+        docs[doc_id] = {
+            "text": _join_sections(it.get("structured") or {}),
+            "meta": _company_meta(name, it.get("url") or "", tags),
+            "url": it.get("url") or "",
+            "tags": tags,
+            "overwrite": bool(it.get("overwrite", overwrite)),
+        }
+        out.append({"name": name, "id": doc_id, "status": None})
+
+    if not docs:
+        return out
 
-    # upsert (LangChain VectorStore API)
+    col = getattr(vectordb, "_collection", None)
+
+    # 1) 존재 여부 일괄 확인 (실패하면 덮어쓰기 여부를 알 수 없으므로 쓰지 않고 전부 error)
+    existing: set = set()
+    error: Optional[str] = None
     try:
-        vectordb.add_texts(
-            texts=[text],
-            metadatas=[meta],
-            ids=[doc_id],
-        )
-    except Exception:
-        # add_texts에서 중복으로 실패하면 delete 후 재시도
+        if col is not None:
+            res = col.get(ids=list(docs.keys()), include=[])
+            existing = set(res.get("ids") or [])
+    except Exception as e:
+        error = f"{e.__class__.__name__}: {e}"
+
+    status: Dict[str, str] = {}
+    write_ids: List[str] = []
+    for doc_id, d in docs.items():
+        if error is not None:
+            status[doc_id] = "error"
+            continue
+        if doc_id in existing and not d["overwrite"]:
+            status[doc_id] = "exists"
+            continue
+        status[doc_id] = "overwritten" if doc_id in existing else "created"
+        write_ids.append(doc_id)
+
+    # 2) 신규/덮어쓰기 대상만 배치 인코딩 + upsert 1회
+    if write_ids:
+        texts = [docs[i]["text"] for i in write_ids]
+        metas = [docs[i]["meta"] for i in write_ids]
         try:
-            vectordb.delete(ids=[doc_id])
-        except Exception:
-            pass
-        vectordb.add_texts(
-            texts=[text],
-            metadatas=[meta],
-            ids=[doc_id],
-        )
-
-    # 영속화는 Chroma가 자동 처리 (langchain_chroma는 persist_directory 지정 시 내부적으로 flush)
-    return doc_id
+            if col is not None:
+                embeddings = vectordb.embeddings.embed_documents(texts)
+                col.upsert(ids=write_ids, embeddings=embeddings, metadatas=metas, documents=texts)
+            else:
+                vectordb.add_texts(texts=texts, metadatas=metas, ids=write_ids)
+        except Exception as e:
+            error = f"{e.__class__.__name__}: {e}"
+            for i in write_ids:
+                status[i] = "error"
+
+    # 3) 인메모리 회사 인덱스 증분 반영
+    if error is None and write_ids:
+        index = get_company_index()
+        for i in write_ids:
+            d = docs[i]
+            index.put(
+                doc_id=i, name=d["meta"]["name"], tags=d["tags"], url=d["url"],
+                text=d["text"], metadata=d["meta"],
+            )
+
+    for r in out:
+        if r["status"] is None:
+            r["status"] = status[r["id"]]
+            if r["status"] == "error":
+                r["error"] = error
+    # 영속화는 Chroma가 자동 처리 (persist_directory 지정 시 내부적으로 flush)
+    return out
@@ -0,0 +1,172 @@
+# repositories/company_index.py
+"""
+프로세스 내 회사 메타데이터 인덱스
+- investment_ai 컬렉션(kind=company)을 한 번 읽어 정규화 회사명 → (id, tags, url, 본문) 딕셔너리 구성
+- upsert_company_profile 이 쓸 때마다 put() 으로 증분 반영
+- 회사별 태그/프로필 조회를 벡터 검색 대신 O(1) dict 조회로 처리
+- 쓰기 주체는 이 프로세스 하나라고 가정: 다른 프로세스가 컬렉션에 쓴 내용은 load() 를 다시 부르기 전까지 보이지 않음
+"""
+from __future__ import annotations
+import threading
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.documents import Document
+
+
+def normalize_name(s: str) -> str:
+    """공백/대소문자/전각-반각 차이 제거한 비교용 정규화"""
+    if not s:
+        return ""
+    s = unicodedata.normalize("NFKC", s)
+    return "".join(s.split()).lower()
+
+
+def split_tags(tags_str: str) -> List[str]:
+    """메타데이터 tags(" | " 결합 문자열) → list"""
+    return [t.strip() for t in (tags_str or "").split("|") if t.strip()]
+
+
+@dataclass
+class CompanyRecord:
+    id: str
+    name: str
+    tags: List[str] = field(default_factory=list)
+    url: str = ""
+    text: str = ""
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    def to_document(self) -> Document:
+        return Document(page_content=self.text, metadata=dict(self.metadata))
+
+
+class CompanyIndex:
+    """정규화 회사명 기준 인메모리 인덱스 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_norm: Dict[str, CompanyRecord] = {}
+        self._loaded = False
+        self._load_lock = threading.Lock()
+        # load() 진행 중의 put/remove 기록 → 새 dict 로 교체하기 전에 다시 적용 (None = 삭제)
+        self._pending: Optional[List[Tuple[str, Optional[CompanyRecord]]]] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def load(self, vectordb, *, page_size: int = 1000) -> "CompanyIndex":
+        """
+        컬렉션 전체(kind=company)를 페이지 단위로 읽어 인덱스 재구성.
+        읽는 동안 들어온 put/remove 는 교체 직전에 새 인덱스에 다시 적용 (페이지 스냅샷보다 최신이므로)
+        """
+        with self._load_lock:
+            with self._lock:
+                self._pending = []
+            try:
+                records = self._read_all(vectordb, page_size)
+            except BaseException:
+                with self._lock:
+                    self._pending = None
+                raise
+            with self._lock:
+                for norm, rec in self._pending or []:
+                    if rec is None:
+                        records.pop(norm, None)
+                    else:
+                        records[norm] = rec
+                self._pending = None
+                self._by_norm = records
+                self._loaded = True
+        return self
+
+    def _read_all(self, vectordb, page_size: int) -> Dict[str, CompanyRecord]:
+        col = getattr(vectordb, "_collection", None)
+        records: Dict[str, CompanyRecord] = {}
+        if col is not None:
+            offset = 0
+            while True:
+                res = col.get(
+                    where={"kind": "company"},
+                    include=["metadatas", "documents"],
+                    limit=page_size,
+                    offset=offset,
+                )
+                ids = res.get("ids") or []
+                metas = res.get("metadatas") or []
+                docs = res.get("documents") or []
+                for i, doc_id in enumerate(ids):
+                    md = (metas[i] if i < len(metas) else None) or {}
+                    rec = CompanyRecord(
+                        id=doc_id,
+                        name=md.get("name") or doc_id,
+                        tags=split_tags(md.get("tags", "")),
+                        url=md.get("url", "") or "",
+                        text=(docs[i] if i < len(docs) else "") or "",
+                        metadata=dict(md),
+                    )
+                    records[normalize_name(rec.name)] = rec
+                if len(ids) < page_size:
+                    break
+                offset += page_size
+        return records
+
+    def get(self, name: str) -> Optional[CompanyRecord]:
+        return self._by_norm.get(normalize_name(name))
+
+    def __contains__(self, name: str) -> bool:
+        return normalize_name(name) in self._by_norm
+
+    def __len__(self) -> int:
+        return len(self._by_norm)
+
+    def put(
+        self,
+        *,
+        doc_id: str,
+        name: str,
+        tags: List[str] | None,
+        url: str,
+        text: str,
+        metadata: Dict[str, Any] | None = None,
+    ) -> CompanyRecord:
+        rec = CompanyRecord(
+            id=doc_id,
+            name=name,
+            tags=list(tags or []),
+            url=url or "",
+            text=text or "",
+            metadata=dict(metadata or {}),
+        )
+        norm = normalize_name(name)
+        with self._lock:
+            self._by_norm[norm] = rec
+            if self._pending is not None:
+                self._pending.append((norm, rec))
+        return rec
+
+    def remove(self, name: str) -> None:
+        norm = normalize_name(name)
+        with self._lock:
+            self._by_norm.pop(norm, None)
+            if self._pending is not None:
+                self._pending.append((norm, None))
+
+    def names(self) -> List[str]:
+        return [r.name for r in list(self._by_norm.values())]
+
+
+_INDEX = CompanyIndex()
+_LOAD_LOCK = threading.Lock()
+
+
+def get_company_index(vectordb=None) -> CompanyIndex:
+    """
+    프로세스 공용 인덱스. vectordb 가 주어지고 아직 로드 전이면 최초 1회 로드.
+    """
+    if vectordb is not None and not _INDEX.loaded:
+        with _LOAD_LOCK:
+            if not _INDEX.loaded:
+                _INDEX.load(vectordb)
+    return _INDEX
@@ -0,0 +1,261 @@
+# repositories/faiss_store.py
+"""
+FAISS 벡터 스토어 (VECTOR_BACKEND=faiss, FAISS_INDEX=hnsw|ivfpq)
+- hnsw : IndexHNSWFlat (학습 불필요, 증분 추가)
+- ivfpq: IndexIVFPQ — 학습 데이터가 모일 때까지(nlist*39건) IndexFlatL2 로 운용 후 자동 전환
+- faiss 내부 id == sidecar row (append-only) → 메타데이터/삭제(tombstone)는 LocalVectorStore 가 관리
+- where 필터는 IDSelectorBitmap 으로 검색 단계에 전달, 후보가 적으면 해당 row 만 exact 계산
+- 인덱스는 {VDB_PATH}/faiss/{collection}/index.faiss 로 저장/재로드 (SQLite commit 후 저장)
+  재로드 시 인덱스 벡터 수와 sidecar row 수가 다르면 짧은 쪽에 맞춤
+
+섀도 비교 벤치마크 (Chroma / FAISS HNSW / FAISS IVF-PQ / exact, recall@k + p50/p99):
+    python -m repositories.faiss_store [dim]          # 합성 데이터
+    python -m repositories.faiss_store --from-chroma  # VDB_PATH 의 Chroma 컬렉션 임베딩 사용
+"""
+from __future__ import annotations
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from repositories.local_store import LocalVectorStore, l2_topk
+
+try:
+    import faiss  # type: ignore
+except Exception:  # pragma: no cover
+    faiss = None
+
+_EXACT_FALLBACK_ROWS = 2048  # 필터 통과 row 가 이 이하이면 재구성 벡터로 exact 계산
+
+
+def _pq_m(dim: int) -> int:
+    """dim 을 나누는 PQ 서브벡터 수 (≤ 64)"""
+    for m in (64, 48, 32, 16, 8, 4, 2, 1):
+        if dim % m == 0:
+            return m
+    return 1
+
+
+class FaissVectorStore(LocalVectorStore):
+    def __init__(
+        self,
+        *,
+        index_type: str = "hnsw",
+        hnsw_m: int = 32,
+        ef_search: int = 64,
+        nlist: int = 256,
+        nprobe: int = 16,
+        **kwargs,
+    ):
+        if faiss is None:
+            raise RuntimeError("faiss-cpu 가 설치되어 있지 않습니다. (pip install faiss-cpu)")
+        if index_type not in ("hnsw", "ivfpq"):
+            raise ValueError(f"지원하지 않는 FAISS_INDEX: {index_type} (hnsw|ivfpq)")
+        self._index_type = index_type
+        self._hnsw_m = hnsw_m
+        self._ef_search = ef_search
+        self._nlist = nlist
+        self._nprobe = nprobe
+        self._index = None
+        self._dim: Optional[int] = None
+        super().__init__(**kwargs)
+
+    # ── 인덱스 생성/학습 ──────────────────────────────────────────────────────
+    def _index_path(self):
+        return self._dir / "index.faiss"
+
+    def _new_index(self, dim: int):
+        if self._index_type == "hnsw":
+            idx = faiss.IndexHNSWFlat(dim, self._hnsw_m)
+            idx.hnsw.efSearch = self._ef_search
+            return idx
+        # ivfpq: 학습 전에는 flat 으로 시작
+        return faiss.IndexFlatL2(dim)
+
+    def _train_min(self) -> int:
+        return self._nlist * 39
+
+    def _maybe_train_ivfpq(self) -> None:
+        """flat 에 충분히 쌓이면 IVF-PQ 로 학습/전환 (row 순서 유지)"""
+        if self._index_type != "ivfpq" or not isinstance(self._index, faiss.IndexFlatL2):
+            return
+        if self._index.ntotal < self._train_min():
+            return
+        xb = self._index.reconstruct_n(0, self._index.ntotal)
+        quant = faiss.IndexFlatL2(self._dim)
+        ivf = faiss.IndexIVFPQ(quant, self._dim, self._nlist, _pq_m(self._dim), 8)
+        ivf.train(xb)
+        ivf.add(xb)
+        ivf.make_direct_map()
+        ivf.nprobe = self._nprobe
+        self._index = ivf
+
+    def _is_ivf(self) -> bool:
+        return self._index is not None and not isinstance(self._index, (faiss.IndexFlatL2, faiss.IndexHNSWFlat))
+
+    # ── LocalVectorStore 훅 ───────────────────────────────────────────────────
+    def _index_load(self) -> None:
+        if not self._index_path().exists():
+            return
+        self._index = faiss.read_index(str(self._index_path()))
+        self._dim = self._index.d
+        if isinstance(self._index, faiss.IndexHNSWFlat):
+            self._index.hnsw.efSearch = self._ef_search
+        elif self._is_ivf():
+            self._index.nprobe = self._nprobe
+            self._index.make_direct_map()
+        # 인덱스 파일에 대응하는 sidecar row 가 없는 벡터가 남아 있으면(SQLite 롤백 후 저장된 인덱스 등) 잘라냄
+        if self._index.ntotal > self.n_rows:
+            self._index_truncate(self.n_rows)
+        # 인덱스 저장 전에 종료된 경우: 벡터 없는 row 는 사용 불가 처리
+        for r in range(self._index.ntotal, self.n_rows):
+            self._alive[r] = False
+            self._row_of.pop(self._ids[r], None)
+
+    def _index_save(self) -> None:
+        if self._index is not None:
+            faiss.write_index(self._index, str(self._index_path()))
+
+    def _index_check(self, vectors: np.ndarray) -> None:
+        if self._dim is not None and vectors.shape[1] != self._dim:
+            raise ValueError(f"임베딩 차원 불일치: {vectors.shape[1]} != {self._dim}")
+        if self._index is not None and self._index.ntotal != self.n_rows:
+            raise RuntimeError(f"faiss ntotal({self._index.ntotal}) 과 row({self.n_rows}) 불일치")
+
+    def _index_truncate(self, n_rows: int) -> None:
+        """row n_rows 이후 벡터 제거: 앞부분을 복원해 같은 (학습된) 인덱스에 다시 추가"""
+        if self._index is None or self._index.ntotal <= n_rows:
+            return
+        if n_rows == 0:
+            self._index, self._dim = None, None
+            return
+        xb = self._index.reconstruct_n(0, n_rows)
+        self._index.reset()
+        self._index.add(xb)
+        if self._is_ivf():
+            self._index.make_direct_map()
+
+    def _index_add(self, rows: List[int], vectors: np.ndarray) -> None:
+        if self._index is None:
+            self._dim = int(vectors.shape[1])
+            self._index = self._new_index(self._dim)
+        if rows[0] != self._index.ntotal:
+            raise RuntimeError(f"faiss ntotal({self._index.ntotal}) 과 row({rows[0]}) 불일치")
+        self._index.add(np.ascontiguousarray(vectors, dtype=np.float32))
+        self._maybe_train_ivfpq()
+
+    def _exact_rows(self, q: np.ndarray, k: int, rows: np.ndarray) -> List[Tuple[int, float]]:
+        xb = np.vstack([self._index.reconstruct(int(r)) for r in rows])
+        d = ((xb - q) ** 2).sum(axis=1)
+        return [(int(rows[i]), dist) for i, dist in l2_topk(d, k)]
+
+    def _index_search(self, q: np.ndarray, k: int, allowed: Optional[np.ndarray]) -> List[Tuple[int, float]]:
+        n = self._index.ntotal
+        allowed = allowed[:n] if allowed is not None else np.ones(n, dtype=bool)
+        n_allowed = int(allowed.sum())
+        if n_allowed == 0:
+            return []
+        if n_allowed <= _EXACT_FALLBACK_ROWS and n_allowed < n:
+            return self._exact_rows(q, k, np.flatnonzero(allowed))
+
+        k_eff = min(k, n_allowed)
+        qq = np.ascontiguousarray(q.reshape(1, -1), dtype=np.float32)
+        params = None
+        bitmap = None
+        if n_allowed < n:
+            bitmap = np.packbits(allowed, bitorder="little")
+            sel = faiss.IDSelectorBitmap(n, faiss.swig_ptr(bitmap))
+            if isinstance(self._index, faiss.IndexHNSWFlat):
+                params = faiss.SearchParametersHNSW(sel=sel, efSearch=max(self._ef_search, k_eff))
+            elif self._is_ivf():
+                params = faiss.SearchParametersIVF(sel=sel, nprobe=self._nprobe)
+            else:
+                params = faiss.SearchParameters(sel=sel)
+        D, I = self._index.search(qq, k_eff, params=params)
+        del bitmap
+        return [(int(i), float(d)) for i, d in zip(I[0], D[0]) if i >= 0 and allowed[i]]
+
+
+# ── 섀도 비교 벤치마크 ───────────────────────────────────────────────────────
+if __name__ == "__main__":
+    import os
+    import sys
+    import tempfile
+    import time
+
+    k, n_queries = 10, 100
+    rng = np.random.default_rng(0)
+
+    class _Unused:
+        def embed_documents(self, texts):  # pragma: no cover
+            raise RuntimeError("unused")
+        def embed_query(self, text):  # pragma: no cover
+            raise RuntimeError("unused")
+
+    if "--from-chroma" in sys.argv:
+        import chromadb
+        vdb_path = os.getenv("VDB_PATH", "./data/vector_store")
+        col = chromadb.PersistentClient(path=vdb_path).get_collection("investment_ai")
+        got = col.get(include=["embeddings", "metadatas"])
+        X = np.asarray(got["embeddings"], dtype=np.float32)
+        metas = [m or {} for m in got["metadatas"]]
+        datasets = [("chroma:investment_ai", X, metas)]
+    else:
+        dim = int(sys.argv[1]) if len(sys.argv) > 1 else 1024
+        datasets = []
+        for n in (1_000, 10_000, 100_000):
+            X = rng.standard_normal((n, dim)).astype(np.float32)
+            X /= np.linalg.norm(X, axis=1, keepdims=True)
+            metas = [{"kind": "company" if i % 2 else "industry"} for i in range(n)]
+            datasets.append((f"synthetic N={n:,}", X, metas))
+
+    def _pct(xs, p):
+        return float(np.percentile(np.asarray(xs) * 1000, p))
+
+    for label, X, metas in datasets:
+        n, dim = X.shape
+        qi = rng.choice(n, min(n_queries, n), replace=False)
+        Q = X[qi] + 0.05 * rng.standard_normal((len(qi), dim)).astype(np.float32)
+        gt = [np.argsort(((X - q) ** 2).sum(1))[:k].tolist() for q in Q]
+        ids = [str(i) for i in range(n)]
+        print(f"\n=== {label} dim={dim} k={k} queries={len(Q)} ===")
+
+        def report(name, search):
+            search(Q[0])  # warmup
+            lat, rec = [], []
+            for j, q in enumerate(Q):
+                t0 = time.perf_counter()
+                got_ids = search(q)
+                lat.append(time.perf_counter() - t0)
+                rec.append(len(set(got_ids) & set(gt[j])) / k)
+            print(f"{name:<14} p50={_pct(lat, 50):8.2f}ms p99={_pct(lat, 99):8.2f}ms recall@{k}={np.mean(rec):.3f}")
+
+        # exact (NumPy float32 행렬곱)
+        norms = (X * X).sum(1)
+        report("exact", lambda q: [r for r, _ in l2_topk(norms - 2 * (X @ q), k)])
+
+        for index_type in ("hnsw", "ivfpq"):
+            with tempfile.TemporaryDirectory() as td:
+                st = FaissVectorStore(
+                    index_type=index_type,
+                    nlist=max(16, min(256, n // 64)),
+                    embedding_function=_Unused(),
+                    persist_directory=td,
+                )
+                for s in range(0, n, 5000):
+                    st._upsert(ids[s:s + 5000], X[s:s + 5000], metas[s:s + 5000], ["" for _ in ids[s:s + 5000]])
+                report(f"faiss-{index_type}", lambda q: [r for r, _ in st._search(q, k, None)])
+                st.close()
+
+        try:
+            import chromadb
+            client = chromadb.EphemeralClient()
+            col = client.create_collection("shadow_bench", metadata={"hnsw:space": "l2"})
+            for s in range(0, n, 5000):
+                col.add(ids=ids[s:s + 5000], embeddings=X[s:s + 5000].tolist())
+            report(
+                "chroma-hnsw",
+                lambda q: [int(i) for i in col.query(query_embeddings=[q.tolist()], n_results=k, include=[])["ids"][0]],
+            )
+            client.delete_collection("shadow_bench")
+        except Exception as e:
+            print("chroma 벤치마크 생략:", e)
@@ -0,0 +1,479 @@
+# repositories/local_store.py
+"""
+로컬 벡터 스토어 공통 기반 (NumPy brute-force / FAISS 백엔드 공용)
+- 에이전트/리포지토리가 쓰는 LangChain Chroma 표면을 그대로 제공
+    * similarity_search / similarity_search_with_score / similarity_search_by_vector(_with_relevance_scores)
+    * add_texts / delete / embeddings
+    * _collection (get / query / upsert / delete / count / peek) — chromadb Collection 호환 shim
+- 메타데이터는 sidecar SQLite 테이블(row ↔ id ↔ document/metadata)에 저장
+- 거리 척도는 Chroma 기본값(l2, 제곱 거리)과 동일하게 맞춰 기존 score_threshold 를 그대로 사용
+- 쓰기 순서: 배치 내 중복 id 정리(마지막 값 유지)·검증 → SQLite 트랜잭션 → 메모리/인덱스 반영 → commit
+  → 인덱스 파일 저장. 중간에 실패하면 SQLite 롤백 + 메모리/인덱스를 쓰기 전 상태로 되돌림
+- 벡터 인덱스 자체(추가/검색/저장)는 서브클래스가 구현
+"""
+from __future__ import annotations
+import json
+import sqlite3
+import threading
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+_MASK_CACHE_MAX = 64  # where 절별 row 마스크 캐시 상한 (LRU)
+
+
+# ─────────────────────────────────────────────────────────────
+# where 절 평가 (Chroma 문법 부분집합)
+# ─────────────────────────────────────────────────────────────
+def _match_op(value: Any, cond: Any) -> bool:
+    if not isinstance(cond, dict):
+        return value == cond
+    for op, arg in cond.items():
+        if op == "$eq" and not value == arg:
+            return False
+        if op == "$ne" and not value != arg:
+            return False
+        if op == "$in" and value not in arg:
+            return False
+        if op == "$nin" and value in arg:
+            return False
+        if op in ("$gt", "$gte", "$lt", "$lte"):
+            if value is None:
+                return False
+            if op == "$gt" and not value > arg:
+                return False
+            if op == "$gte" and not value >= arg:
+                return False
+            if op == "$lt" and not value < arg:
+                return False
+            if op == "$lte" and not value <= arg:
+                return False
+    return True
+
+
+def match_where(meta: Dict[str, Any], where: Optional[Dict[str, Any]]) -> bool:
+    """$and / $or / {field: value} / {field: {$eq,$ne,$in,$nin,$gt,$gte,$lt,$lte}}"""
+    if not where:
+        return True
+    for key, cond in where.items():
+        if key == "$and":
+            if not all(match_where(meta, c) for c in cond):
+                return False
+        elif key == "$or":
+            if not any(match_where(meta, c) for c in cond):
+                return False
+        elif not _match_op(meta.get(key), cond):
+            return False
+    return True
+
+
+# ─────────────────────────────────────────────────────────────
+# chromadb Collection 호환 shim
+# ─────────────────────────────────────────────────────────────
+class _CollectionShim:
+    def __init__(self, store: "LocalVectorStore"):
+        self._store = store
+
+    def count(self) -> int:
+        return self._store.count()
+
+    def get(
+        self,
+        ids: Optional[List[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        include: Iterable[str] = ("metadatas", "documents"),
+    ) -> Dict[str, Any]:
+        rows = self._store._select_rows(ids=ids, where=where)
+        rows = rows[(offset or 0):]
+        if limit is not None:
+            rows = rows[:limit]
+        return self._store._rows_payload(rows, include)
+
+    def peek(self, limit: int = 10) -> Dict[str, Any]:
+        return self.get(limit=limit)
+
+    def query(
+        self,
+        query_embeddings: List[List[float]],
+        n_results: int = 10,
+        where: Optional[Dict[str, Any]] = None,
+        include: Iterable[str] = ("metadatas", "documents", "distances"),
+    ) -> Dict[str, Any]:
+        include = list(include)
+        out: Dict[str, Any] = {"ids": [], "metadatas": [], "documents": [], "distances": []}
+        for q in query_embeddings:
+            hits = self._store._search(np.asarray(q, dtype=np.float32), n_results, where)
+            rows = [r for r, _ in hits]
+            payload = self._store._rows_payload(rows, include)
+            out["ids"].append(payload["ids"])
+            out["metadatas"].append(payload.get("metadatas"))
+            out["documents"].append(payload.get("documents"))
+            out["distances"].append([d for _, d in hits])
+        for k in ("metadatas", "documents", "distances"):
+            if k not in include:
+                out[k] = None
+        return out
+
+    def upsert(
+        self,
+        ids: List[str],
+        embeddings: List[List[float]],
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        documents: Optional[List[str]] = None,
+    ) -> None:
+        self._store._upsert(ids, np.asarray(embeddings, dtype=np.float32), metadatas, documents)
+
+    add = upsert
+
+    def delete(self, ids: Optional[List[str]] = None, where: Optional[Dict[str, Any]] = None) -> None:
+        if ids is None and where is not None:
+            ids = self.get(where=where, include=[])["ids"]
+        self._store.delete(ids=ids or [])
+
+
+# ─────────────────────────────────────────────────────────────
+# 공통 VectorStore
+# ─────────────────────────────────────────────────────────────
+class LocalVectorStore(VectorStore):
+    """
+    서브클래스 구현 대상:
+      _index_add(rows, vectors), _index_remove(rows), _index_search(q, k, allowed) → [(row, dist)],
+      _index_save(), _index_load(), _index_check(vectors), _index_truncate(n_rows)
+    """
+
+    def __init__(
+        self,
+        *,
+        embedding_function: Embeddings,
+        persist_directory: str,
+        collection_name: str = "investment_ai",
+    ):
+        self._embedding = embedding_function
+        self._dir = Path(persist_directory) / collection_name
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+
+        # sidecar 메타데이터 테이블
+        self._db = sqlite3.connect(str(self._dir / "meta.sqlite3"), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS docs ("
+            " row INTEGER PRIMARY KEY, id TEXT UNIQUE NOT NULL,"
+            " document TEXT, metadata TEXT, deleted INTEGER NOT NULL DEFAULT 0)"
+        )
+        self._db.execute("CREATE TABLE IF NOT EXISTS kv (k TEXT PRIMARY KEY, v TEXT)")
+        self._db.commit()
+
+        self._ids: List[str] = []
+        self._docs: List[str] = []
+        self._metas: List[Dict[str, Any]] = []
+        self._alive: List[bool] = []
+        self._row_of: Dict[str, int] = {}
+        self._version = 0
+        self._mask_cache: "OrderedDict[str, Tuple[int, np.ndarray]]" = OrderedDict()
+
+        for row, doc_id, doc, meta, deleted in self._db.execute(
+            "SELECT row, id, document, metadata, deleted FROM docs ORDER BY row"
+        ):
+            while len(self._ids) < row:  # 결번 방어
+                self._ids.append(""); self._docs.append(""); self._metas.append({}); self._alive.append(False)
+            self._ids.append(doc_id)
+            self._docs.append(doc or "")
+            self._metas.append(json.loads(meta or "{}"))
+            self._alive.append(not deleted)
+            if not deleted:
+                self._row_of[doc_id] = row
+        self._index_load()
+
+    # ── kv (서브클래스 설정 저장용) ───────────────────────────────────────────
+    def _kv_get(self, k: str) -> Optional[str]:
+        r = self._db.execute("SELECT v FROM kv WHERE k=?", (k,)).fetchone()
+        return r[0] if r else None
+
+    def _kv_set(self, k: str, v: str) -> None:
+        self._db.execute("INSERT OR REPLACE INTO kv(k, v) VALUES(?, ?)", (k, v))
+
+    # ── 서브클래스 훅 ─────────────────────────────────────────────────────────
+    def _index_add(self, rows: List[int], vectors: np.ndarray) -> None:
+        raise NotImplementedError
+
+    def _index_remove(self, rows: List[int]) -> None:
+        pass
+
+    def _index_search(self, q: np.ndarray, k: int, allowed: Optional[np.ndarray]) -> List[Tuple[int, float]]:
+        raise NotImplementedError
+
+    def _index_save(self) -> None:
+        pass
+
+    def _index_load(self) -> None:
+        pass
+
+    def _index_check(self, vectors: np.ndarray) -> None:
+        """쓰기 전에 벡터 검증 (차원 등). 실패하면 아무것도 바뀌지 않음"""
+        pass
+
+    def _index_truncate(self, n_rows: int) -> None:
+        """실패한 쓰기 롤백: row n_rows 이후로 추가된 벡터 제거"""
+        pass
+
+    # ── 내부 조회 ─────────────────────────────────────────────────────────────
+    @property
+    def n_rows(self) -> int:
+        return len(self._ids)
+
+    def _allowed_mask(self, where: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """삭제되지 않고 where 를 만족하는 row 마스크 (쓰기 버전별 캐시)"""
+        key = json.dumps(where, sort_keys=True, ensure_ascii=False) if where else ""
+        hit = self._mask_cache.get(key)
+        if hit is not None and hit[0] == self._version:
+            self._mask_cache.move_to_end(key)
+            return hit[1]
+        alive = np.asarray(self._alive, dtype=bool)
+        if where:
+            alive &= np.fromiter(
+                (match_where(m, where) for m in self._metas), dtype=bool, count=len(self._metas)
+            )
+        self._mask_cache[key] = (self._version, alive)
+        self._mask_cache.move_to_end(key)
+        while len(self._mask_cache) > _MASK_CACHE_MAX:
+            self._mask_cache.popitem(last=False)
+        return alive
+
+    def _select_rows(self, *, ids: Optional[List[str]], where: Optional[Dict[str, Any]]) -> List[int]:
+        with self._lock:
+            if ids is not None:
+                rows = [self._row_of[i] for i in ids if i in self._row_of]
+                return [r for r in rows if match_where(self._metas[r], where)]
+            mask = self._allowed_mask(where)
+            return np.flatnonzero(mask).tolist()
+
+    def _rows_payload(self, rows: List[int], include: Iterable[str]) -> Dict[str, Any]:
+        include = list(include)
+        return {
+            "ids": [self._ids[r] for r in rows],
+            "metadatas": [dict(self._metas[r]) for r in rows] if "metadatas" in include else None,
+            "documents": [self._docs[r] for r in rows] if "documents" in include else None,
+            "embeddings": None,
+        }
+
+    def _search(self, q: np.ndarray, k: int, where: Optional[Dict[str, Any]]) -> List[Tuple[int, float]]:
+        with self._lock:
+            if self.n_rows == 0 or k <= 0:
+                return []
+            allowed = self._allowed_mask(where)
+            if not allowed.any():
+                return []
+            return self._index_search(q, k, allowed)
+
+    def _doc(self, row: int) -> Document:
+        return Document(page_content=self._docs[row], metadata=dict(self._metas[row]))
+
+    # ── 쓰기 ──────────────────────────────────────────────────────────────────
+    def _upsert(
+        self,
+        ids: List[str],
+        vectors: np.ndarray,
+        metadatas: Optional[List[Dict[str, Any]]],
+        documents: Optional[List[str]],
+    ) -> None:
+        metadatas = metadatas or [{} for _ in ids]
+        documents = documents or ["" for _ in ids]
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2 or not (len(ids) == vectors.shape[0] == len(metadatas) == len(documents)):
+            raise ValueError(
+                f"ids/embeddings/metadatas/documents 길이 불일치: "
+                f"{len(ids)}/{vectors.shape[0] if vectors.ndim else 0}/{len(metadatas)}/{len(documents)}"
+            )
+        # 배치 안 중복 id 는 마지막 값만 (chromadb upsert 와 동일한 결과)
+        last = {doc_id: j for j, doc_id in enumerate(ids)}
+        if len(last) < len(ids):
+            keep = sorted(last.values())
+            ids = [ids[j] for j in keep]
+            metadatas = [metadatas[j] for j in keep]
+            documents = [documents[j] for j in keep]
+            vectors = vectors[keep]
+        if not ids:
+            return
+        self._index_check(vectors)
+        with self._lock:
+            start = self.n_rows
+            rows = list(range(start, start + len(ids)))
+            replaced = [(i, self._row_of[i]) for i in ids if i in self._row_of]
+            try:
+                # 기존 id 는 tombstone 처리 후 새 row 로 추가 (append-only)
+                self._db.execute("DELETE FROM docs WHERE id IN (%s)" % ",".join("?" * len(ids)), ids)
+                self._db.executemany(
+                    "INSERT INTO docs(row, id, document, metadata, deleted) VALUES(?, ?, ?, ?, 0)",
+                    [
+                        (r, i, d, json.dumps(m or {}, ensure_ascii=False))
+                        for r, i, d, m in zip(rows, ids, documents, metadatas)
+                    ],
+                )
+                self._delete_locked([i for i, _ in replaced])
+                for r, doc_id, meta, doc in zip(rows, ids, metadatas, documents):
+                    self._ids.append(doc_id)
+                    self._docs.append(doc or "")
+                    self._metas.append(dict(meta or {}))
+                    self._alive.append(True)
+                    self._row_of[doc_id] = r
+                self._index_add(rows, vectors)
+                self._db.commit()
+            except BaseException:
+                self._db.rollback()
+                self._rollback_rows(start, replaced)
+                raise
+            finally:
+                self._version += 1
+            self._index_save()
+
+    def _rollback_rows(self, start: int, replaced: List[Tuple[str, int]]) -> None:
+        """row start 이후 추가분 제거 + 이번 쓰기에서 tombstone 된 row 복구 (메모리/인덱스)"""
+        for doc_id in self._ids[start:]:
+            if self._row_of.get(doc_id, -1) >= start:
+                del self._row_of[doc_id]
+        del self._ids[start:], self._docs[start:], self._metas[start:], self._alive[start:]
+        for doc_id, r in replaced:
+            self._alive[r] = True
+            self._row_of[doc_id] = r
+        self._index_truncate(start)
+
+    def _delete_locked(self, ids: List[str]) -> None:
+        rows = [self._row_of[i] for i in ids if i in self._row_of]
+        if not rows:
+            return
+        self._db.executemany("UPDATE docs SET deleted=1 WHERE row=?", [(r,) for r in rows])
+        for i in ids:
+            self._row_of.pop(i, None)
+        for r in rows:
+            self._alive[r] = False
+        self._index_remove(rows)
+        self._version += 1
+
+    def count(self) -> int:
+        return len(self._row_of)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.commit()
+            self._index_save()
+            self._db.close()
+
+    # ── LangChain VectorStore API ─────────────────────────────────────────────
+    @property
+    def embeddings(self) -> Embeddings:
+        return self._embedding
+
+    @property
+    def _collection(self) -> _CollectionShim:
+        return _CollectionShim(self)
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        texts = list(texts)
+        if not texts:
+            return []
+        ids = list(ids) if ids else [str(uuid.uuid4()) for _ in texts]
+        vectors = np.asarray(self._embedding.embed_documents(texts), dtype=np.float32)
+        self._upsert(ids, vectors, metadatas, texts)
+        return ids
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+        with self._lock:
+            ids = list(ids or [])
+            removed = [(i, self._row_of[i]) for i in ids if i in self._row_of]
+            try:
+                self._delete_locked(ids)
+                self._db.commit()
+            except BaseException:
+                self._db.rollback()
+                for doc_id, r in removed:
+                    self._alive[r] = True
+                    self._row_of[doc_id] = r
+                self._version += 1
+                raise
+            self._index_save()
+        return True
+
+    def similarity_search_by_vector_with_relevance_scores(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> List[Tuple[Document, float]]:
+        """langchain_chroma 와 동일하게 (Document, 거리) 반환"""
+        hits = self._search(np.asarray(embedding, dtype=np.float32), k, filter)
+        return [(self._doc(r), d) for r, d in hits]
+
+    def similarity_search_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> List[Document]:
+        return [d for d, _ in self.similarity_search_by_vector_with_relevance_scores(embedding, k, filter)]
+
+    def similarity_search_with_score(
+        self,
+        query: str,
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> List[Tuple[Document, float]]:
+        return self.similarity_search_by_vector_with_relevance_scores(
+            self._embedding.embed_query(query), k, filter
+        )
+
+    def similarity_search(
+        self,
+        query: str,
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> List[Document]:
+        return [d for d, _ in self.similarity_search_with_score(query, k, filter)]
+
+    def _select_relevance_score_fn(self):
+        # l2 제곱 거리 → [0, 1] 유사도 (Chroma 기본과 동일)
+        return self._euclidean_relevance_score_fn
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        **kwargs: Any,
+    ) -> "LocalVectorStore":
+        ids = kwargs.pop("ids", None)
+        store = cls(embedding_function=embedding, **kwargs)
+        store.add_texts(texts, metadatas=metadatas, ids=ids)
+        return store
+
+
+def l2_topk(dist: np.ndarray, k: int) -> List[Tuple[int, float]]:
+    """거리 배열에서 inf 제외 top-k (argpartition → 부분 정렬)"""
+    finite = int(np.isfinite(dist).sum())
+    k = min(k, finite)
+    if k <= 0:
+        return []
+    if k < dist.shape[0]:
+        idx = np.argpartition(dist, k - 1)[:k]
+    else:
+        idx = np.arange(dist.shape[0])
+    idx = idx[np.argsort(dist[idx], kind="stable")]
+    return [(int(i), float(dist[i])) for i in idx if np.isfinite(dist[i])]
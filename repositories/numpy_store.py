@@ -0,0 +1,234 @@
+# repositories/numpy_store.py
+"""
+NumPy exact brute-force 벡터 스토어 (VECTOR_BACKEND=numpy)
+- 수천~수만 건 규모에서는 HNSW + SQLite 왕복보다 행렬곱 1회가 더 빠르고 예측 가능
+- 벡터는 memmap 파일에 float16 또는 int8(+벡터별 scale) 로 저장 → 메모리 1/2 ~ 1/4
+- 거리: l2 제곱 (Chroma 기본 척도와 동일) = |x|² + |q|² - 2·x·q
+- top-k: np.argpartition (전체 정렬 없이 O(N))
+- ram_cache_mb 이내면 복원(float32) 행렬을 메모리에 상주시켜 질의마다 변환 비용 제거
+
+벤치마크 (Chroma 대비 지연/recall, 합성 벡터):
+    python -m repositories.numpy_store [dim]
+"""
+from __future__ import annotations
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from repositories.local_store import LocalVectorStore, l2_topk
+
+_SCAN_ROWS = 16384  # float16/int8 → float32 변환을 나눠서 (피크 메모리 제한)
+
+
+class NumpyVectorStore(LocalVectorStore):
+    def __init__(self, *, dtype: str = "float16", ram_cache_mb: int = 512, **kwargs):
+        if dtype not in ("float16", "int8"):
+            raise ValueError(f"지원하지 않는 dtype: {dtype} (float16|int8)")
+        self._dtype = dtype
+        self._ram_cache_bytes = max(0, ram_cache_mb) * 1024 * 1024
+        self._f32: Optional[np.ndarray] = None       # 복원 행렬 상주 캐시 (선택)
+        self._dim: Optional[int] = None
+        self._cap = 0
+        self._mat: Optional[np.memmap] = None       # [cap, dim] float16|int8
+        self._scales: Optional[np.memmap] = None    # [cap] float32 (int8 전용)
+        self._norms = np.zeros(0, dtype=np.float32)  # [n_rows] |x|² (복원 벡터 기준)
+        super().__init__(**kwargs)
+
+    # ── 저장소 ────────────────────────────────────────────────────────────────
+    def _mat_path(self):
+        return self._dir / f"vectors.{self._dtype}.bin"
+
+    def _scale_path(self):
+        return self._dir / "scales.f32.bin"
+
+    def _open(self, cap: int, mode: str) -> None:
+        self._mat = np.memmap(self._mat_path(), dtype=np.dtype(self._dtype), mode=mode, shape=(cap, self._dim))
+        if self._dtype == "int8":
+            self._scales = np.memmap(self._scale_path(), dtype=np.float32, mode=mode, shape=(cap,))
+        self._cap = cap
+
+    def _grow(self, need: int) -> None:
+        """용량 부족 시 2배씩 늘려 새 memmap 으로 복사"""
+        if need <= self._cap:
+            return
+        cap = max(1024, self._cap)
+        while cap < need:
+            cap *= 2
+        old_mat, old_scales, n = self._mat, self._scales, self.n_rows
+        tmp_mat = np.array(old_mat[:n]) if old_mat is not None else None
+        tmp_scales = np.array(old_scales[:n]) if old_scales is not None else None
+        self._mat = self._scales = None
+        del old_mat, old_scales
+        self._open(cap, mode="w+")
+        if tmp_mat is not None:
+            self._mat[: tmp_mat.shape[0]] = tmp_mat
+            if tmp_scales is not None:
+                self._scales[: tmp_scales.shape[0]] = tmp_scales
+        self._kv_set("numpy.cap", str(cap))
+
+    def _index_load(self) -> None:
+        dim = self._kv_get("numpy.dim")
+        cap = self._kv_get("numpy.cap")
+        if self._kv_get("numpy.dtype") not in (None, self._dtype):
+            raise ValueError("저장된 dtype 과 VECTOR_DTYPE 이 다릅니다. 다른 persist 경로를 사용하세요.")
+        if dim is None or cap is None or not self._mat_path().exists():
+            return
+        self._dim = int(dim)
+        self._open(int(cap), mode="r+")
+        self._norms = self._row_norms(0, self.n_rows)
+
+    def _index_save(self) -> None:
+        if self._mat is not None:
+            self._mat.flush()
+        if self._scales is not None:
+            self._scales.flush()
+
+    # ── 양자화 ────────────────────────────────────────────────────────────────
+    def _encode(self, vectors: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        if self._dtype == "float16":
+            return vectors.astype(np.float16), None
+        scales = np.abs(vectors).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        q = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+        return q, scales.astype(np.float32)
+
+    def _decode(self, start: int, stop: int) -> np.ndarray:
+        block = np.asarray(self._mat[start:stop], dtype=np.float32)
+        if self._dtype == "int8":
+            block *= np.asarray(self._scales[start:stop])[:, None]
+        return block
+
+    def _row_norms(self, start: int, stop: int) -> np.ndarray:
+        out = np.empty(max(0, stop - start), dtype=np.float32)
+        for s in range(start, stop, _SCAN_ROWS):
+            e = min(stop, s + _SCAN_ROWS)
+            b = self._decode(s, e)
+            out[s - start:e - start] = np.einsum("ij,ij->i", b, b)
+        return out
+
+    # ── 인덱스 훅 ─────────────────────────────────────────────────────────────
+    def _index_check(self, vectors: np.ndarray) -> None:
+        if self._dim is not None and vectors.shape[1] != self._dim:
+            raise ValueError(f"임베딩 차원 불일치: {vectors.shape[1]} != {self._dim}")
+
+    def _index_truncate(self, n_rows: int) -> None:
+        self._norms = self._norms[:n_rows]
+        self._f32 = None
+        if self._mat is not None:
+            # 롤백으로 사라진 kv 를 이미 늘어난 memmap 크기에 다시 맞춤
+            self._kv_set("numpy.dim", str(self._dim))
+            self._kv_set("numpy.dtype", self._dtype)
+            self._kv_set("numpy.cap", str(self._cap))
+            self._db.commit()
+
+    def _index_add(self, rows: List[int], vectors: np.ndarray) -> None:
+        if self._dim is None:
+            self._dim = int(vectors.shape[1])
+            self._kv_set("numpy.dim", str(self._dim))
+            self._kv_set("numpy.dtype", self._dtype)
+        start, stop = rows[0], rows[-1] + 1
+        self._grow(stop)
+        enc, scales = self._encode(vectors)
+        self._mat[start:stop] = enc
+        if scales is not None:
+            self._scales[start:stop] = scales
+        norms = np.zeros(stop, dtype=np.float32)
+        norms[: self._norms.shape[0]] = self._norms[:stop]
+        norms[start:stop] = self._row_norms(start, stop)
+        self._norms = norms
+        self._f32 = None
+
+    def _resident(self, n: int) -> Optional[np.ndarray]:
+        """복원 float32 행렬 (예산 초과 시 None → 블록 단위 변환 경로)"""
+        if self._f32 is not None and self._f32.shape[0] == n:
+            return self._f32
+        if n * (self._dim or 0) * 4 > self._ram_cache_bytes:
+            return None
+        self._f32 = self._decode(0, n)
+        return self._f32
+
+    def _index_search(self, q: np.ndarray, k: int, allowed: Optional[np.ndarray]) -> List[Tuple[int, float]]:
+        n = self.n_rows
+        resident = self._resident(n)
+        if resident is not None:
+            dots = resident @ q
+        else:
+            dots = self._scan_dots(q, n)
+        dist = self._norms[:n] + float(q @ q) - 2.0 * dots
+        np.maximum(dist, 0.0, out=dist)
+        if allowed is not None:
+            dist[~allowed[:n]] = np.inf
+        return l2_topk(dist, k)
+
+    def _scan_dots(self, q: np.ndarray, n: int) -> np.ndarray:
+        dots = np.empty(n, dtype=np.float32)
+        for s in range(0, n, _SCAN_ROWS):
+            e = min(n, s + _SCAN_ROWS)
+            if self._dtype == "int8":
+                # (q8·q) * scale — 복원 행렬을 만들지 않고 scale 을 마지막에 곱함
+                dots[s:e] = (np.asarray(self._mat[s:e], dtype=np.float32) @ q) * self._scales[s:e]
+            else:
+                dots[s:e] = np.asarray(self._mat[s:e], dtype=np.float32) @ q
+        return dots
+
+
+# ── 벤치마크: NumPy(float16/int8) vs Chroma HNSW, 지연(ms) / recall@k ──────────
+if __name__ == "__main__":
+    import sys
+    import tempfile
+    import time
+
+    dim = int(sys.argv[1]) if len(sys.argv) > 1 else 1024
+    k, n_queries = 10, 50
+    rng = np.random.default_rng(0)
+
+    class _Fixed:
+        """벡터를 직접 넣으므로 임베딩 호출은 쓰지 않음"""
+        def embed_documents(self, texts):  # pragma: no cover
+            raise RuntimeError("unused")
+        def embed_query(self, text):  # pragma: no cover
+            raise RuntimeError("unused")
+
+    def _pct(xs, p):
+        return float(np.percentile(np.asarray(xs) * 1000, p))
+
+    for n in (1_000, 10_000, 100_000):
+        X = rng.standard_normal((n, dim)).astype(np.float32)
+        X /= np.linalg.norm(X, axis=1, keepdims=True)
+        Q = X[rng.choice(n, n_queries, replace=False)] + 0.05 * rng.standard_normal((n_queries, dim)).astype(np.float32)
+        gt = [set(np.argsort(((X - q) ** 2).sum(1))[:k].tolist()) for q in Q]
+        ids = [str(i) for i in range(n)]
+        metas = [{"kind": "company" if i % 2 else "industry"} for i in range(n)]
+
+        print(f"\n=== N={n:,} dim={dim} k={k} ===")
+        for dtype in ("float16", "int8"):
+            with tempfile.TemporaryDirectory() as td:
+                st = NumpyVectorStore(dtype=dtype, embedding_function=_Fixed(), persist_directory=td)
+                for s in range(0, n, 5000):
+                    st._upsert(ids[s:s + 5000], X[s:s + 5000], metas[s:s + 5000], ["" for _ in ids[s:s + 5000]])
+                st._search(Q[0], k, None)  # 상주 캐시 warmup
+                lat, rec = [], []
+                for qi, q in enumerate(Q):
+                    t0 = time.perf_counter()
+                    hits = st._search(q, k, None)
+                    lat.append(time.perf_counter() - t0)
+                    rec.append(len({r for r, _ in hits} & gt[qi]) / k)
+                print(f"numpy[{dtype:<7}] p50={_pct(lat, 50):7.2f}ms p99={_pct(lat, 99):7.2f}ms recall@{k}={np.mean(rec):.3f}")
+                st.close()
+
+        try:
+            import chromadb
+            client = chromadb.EphemeralClient()
+            col = client.create_collection(f"bench_{n}", metadata={"hnsw:space": "l2"})
+            for s in range(0, n, 5000):
+                col.add(ids=ids[s:s + 5000], embeddings=X[s:s + 5000].tolist(), metadatas=metas[s:s + 5000])
+            lat, rec = [], []
+            for qi, q in enumerate(Q):
+                t0 = time.perf_counter()
+                res = col.query(query_embeddings=[q.tolist()], n_results=k, include=["distances"])
+                lat.append(time.perf_counter() - t0)
+                rec.append(len({int(i) for i in res["ids"][0]} & gt[qi]) / k)
+            print(f"chroma[hnsw   ] p50={_pct(lat, 50):7.2f}ms p99={_pct(lat, 99):7.2f}ms recall@{k}={np.mean(rec):.3f}")
+            client.delete_collection(f"bench_{n}")
+        except Exception as e:
+            print("chroma 벤치마크 생략:", e)
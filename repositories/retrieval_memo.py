@@ -0,0 +1,99 @@
+# repositories/retrieval_memo.py
+"""
+실행(run) 범위 검색 메모
+- 질의 벡터 캐시: query text → embedding (같은 회사명 질의를 노드마다 다시 임베딩하지 않음)
+- 결과 캐시: (query, where, k, with_scores) → 검색 결과
+- resume_analysis_node 가 다음 회사로 넘어갈 때 begin_scope() 로 회사 단위 초기화
+- hit/miss 는 누적 집계되어 run metrics 로 출력
+"""
+from __future__ import annotations
+import json
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class RetrievalMemo:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._scope: Optional[str] = None
+        self._vectors: Dict[str, List[float]] = {}
+        self._results: Dict[Tuple[str, str, int, bool], List[Any]] = {}
+        self._stats = {
+            "vector_hits": 0,
+            "vector_misses": 0,
+            "result_hits": 0,
+            "result_misses": 0,
+            "scopes": 0,
+        }
+
+    # ── scope ─────────────────────────────────────────────────────────────────
+    def begin_scope(self, scope: Optional[str]) -> None:
+        """회사 단위로 캐시 초기화 (누적 통계는 유지)"""
+        with self._lock:
+            self._scope = scope
+            self._vectors.clear()
+            self._results.clear()
+            self._stats["scopes"] += 1
+
+    @property
+    def scope(self) -> Optional[str]:
+        return self._scope
+
+    # ── 조회 ──────────────────────────────────────────────────────────────────
+    def query_vector(self, vectordb, query: str) -> List[float]:
+        with self._lock:
+            vec = self._vectors.get(query)
+            if vec is not None:
+                self._stats["vector_hits"] += 1
+                return vec
+            self._stats["vector_misses"] += 1
+        vec = vectordb.embeddings.embed_query(query)
+        with self._lock:
+            self._vectors[query] = vec
+        return vec
+
+    def search(
+        self,
+        vectordb,
+        query: str,
+        *,
+        where: Optional[Dict[str, Any]],
+        k: int,
+        with_scores: bool = False,
+    ) -> List[Any]:
+        key = (query, json.dumps(where, sort_keys=True, ensure_ascii=False), k, with_scores)
+        with self._lock:
+            hit = self._results.get(key)
+            if hit is not None:
+                self._stats["result_hits"] += 1
+                return list(hit)
+            self._stats["result_misses"] += 1
+
+        vec = self.query_vector(vectordb, query)
+        if with_scores:
+            # langchain_chroma: (Document, distance) — similarity_search_with_score 와 동일 척도
+            res = vectordb.similarity_search_by_vector_with_relevance_scores(vec, k=k, filter=where)
+        else:
+            res = vectordb.similarity_search_by_vector(vec, k=k, filter=where)
+        with self._lock:
+            self._results[key] = list(res)
+        return list(res)
+
+    # ── metrics ───────────────────────────────────────────────────────────────
+    def stats(self) -> Dict[str, Any]:
+        s: Dict[str, Any] = dict(self._stats)
+        for kind in ("vector", "result"):
+            total = s[f"{kind}_hits"] + s[f"{kind}_misses"]
+            s[f"{kind}_hit_rate"] = round(s[f"{kind}_hits"] / total, 4) if total else 0.0
+        return s
+
+
+_MEMO = RetrievalMemo()
+
+
+def get_run_memo() -> RetrievalMemo:
+    return _MEMO
+
+
+def retrieval_memo_stats() -> Dict[str, Any]:
+    return _MEMO.stats()
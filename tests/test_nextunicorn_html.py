@@ -0,0 +1,129 @@
+# tests/test_nextunicorn_html.py
+"""tools/nextunicorn_html 파싱 경로 — 저장된 HTML 픽스처(tests/fixtures/nextunicorn) 기준"""
+from pathlib import Path
+
+import pytest
+
+from tools.crawl_cache import CrawlCache
+from tools.nextunicorn import (
+    _FOOTER_NEEDLE,
+    _SECTION_MARK,
+    EXTRACTION_VERSION,
+    _marked_text,
+    join_sections,
+    split_marked_sections,
+    structure_detail,
+)
+from tools.nextunicorn_html import has_more_button, parse_cards, parse_detail, parse_detail_sections
+
+FIXTURES = Path(__file__).parent / "fixtures" / "nextunicorn"
+DETAIL_URL = "https://www.nextunicorn.kr/company/2b40fd7f08522a76?tab=all"
+
+
+def _html(name: str) -> str:
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+
+# ====== 리스트 ======
+def test_parse_cards_finder_only_dedup_in_order():
+    cards = parse_cards(_html("list.html"))
+    assert [c["title"] for c in cards] == ["제이카", "GRIDY", "주 페르세우스", "주 블루디바이스"]
+    assert cards[0]["url"] == "https://www.nextunicorn.kr/company/2b40fd7f08522a76"
+    assert all(c["url"].startswith("https://www.nextunicorn.kr/company/") for c in cards)
+    assert cards[1]["summary"].startswith("도시를 더 사람 답게")
+    # 추천(featuredSTAD) 카드는 finder 선택자에 걸리지 않음
+    assert "대봉유통" not in {c["title"] for c in cards}
+
+
+def test_has_more_button():
+    html = _html("list.html")
+    assert has_more_button(html)
+    assert not has_more_button(html.replace('data-event="finder/:tabName/seeMore"', ""))
+
+
+def test_parse_cards_empty_page():
+    assert parse_cards(_html("detail.html")) == []
+
+
+# ====== 상세 ======
+def test_parse_detail_sections_in_document_order():
+    d, why = parse_detail(_html("detail.html"), DETAIL_URL)
+    assert why == "ok"
+    assert d["url"] == DETAIL_URL
+    assert list(d["sections"]) == ["summary", "funding", "services", "team", "news", "info"]
+    assert d["sections"]["summary"].startswith("제이카는 전기차 사용 후 배터리를")
+    assert "시리즈 A" in d["sections"]["funding"] and "50억 원" in d["sections"]["funding"]
+    assert d["sections"]["team"].splitlines()[0] == "대표 김제이 — 전 배터리 제조사 셀 설계 10년"
+    assert d["sections"]["info"].endswith("https://www.jcar.example")
+
+
+def test_parse_detail_strips_chrome_and_scripts():
+    d, _ = parse_detail(_html("detail.html"), DETAIL_URL)
+    text = d["full_text"]
+    assert text.startswith("제이카\n")
+    assert _FOOTER_NEEDLE not in text            # 회사 푸터 블록
+    assert "All rights reserved" not in text     # <footer>
+    assert "투자자 찾기" not in text              # <nav>
+    assert "window.__ssr" not in text            # <script>
+    assert _SECTION_MARK not in text
+
+
+def test_parse_detail_ignores_tab_and_link_labels():
+    # 탭 버튼/링크의 "소개"·"투자 정보" 는 섹션 제목이 아님 → 머리말에 남고 섹션 본문은 실제 제목 뒤부터
+    d, _ = parse_detail(_html("detail.html"), DETAIL_URL)
+    head = d["full_text"].split("\n소개\n제이카는", 1)[0]
+    assert head.splitlines()[-4:] == ["전체", "소개", "투자 정보", "팀 정보"]
+    assert "전체" not in d["sections"]["summary"]
+
+
+def test_marked_text_round_trip():
+    # 캐시 저장 형식(제목 라인 표식) ↔ 섹션 복원
+    d, _ = parse_detail(_html("detail.html"), DETAIL_URL)
+    head = d["full_text"].split("\n소개\n제이카는", 1)[0]
+    marked = join_sections(head, d["sections"], mark=_SECTION_MARK)
+    assert split_marked_sections(marked) == (head, d["sections"])
+    assert join_sections(head, d["sections"]) == d["full_text"]
+
+
+def test_crawl_cache_hit_matches_fetch(tmp_path):
+    # 캐시 히트(_produce_details 복원 경로)도 새로 수집한 것과 같은 full_text/sections
+    d, _ = parse_detail(_html("detail.html"), DETAIL_URL)
+    cache = CrawlCache(str(tmp_path / "crawl.sqlite3"))
+    cache.put_many([(DETAIL_URL, _marked_text(d))], version=EXTRACTION_VERSION)
+    head, sections = split_marked_sections(cache.get_fresh([DETAIL_URL], version=EXTRACTION_VERSION)[DETAIL_URL])
+    cache.close()
+    assert join_sections(head, sections) == d["full_text"]
+    assert sections == d["sections"]
+
+
+def test_parse_detail_sections_matches_structure_detail():
+    html = _html("detail.html")
+    d, _ = parse_detail(html)
+    st = parse_detail_sections(html)
+    assert st == structure_detail(d)
+    assert set(st) == {"company", "summary", "services", "team", "news", "funding", "info"}
+    assert st["services"].splitlines() == [
+        "J-Pack: 사용 후 배터리 기반 이동형 충전기 (완속 7kW)",
+        "J-Grid: 재사용 배터리 ESS, 태양광 연계 피크 저감",
+    ]
+
+
+@pytest.mark.parametrize(
+    "fixture, reason",
+    [
+        ("detail_expand.html", "expand"),   # 접힌 섹션('… 더 보기' 버튼) → 브라우저로 펼쳐야 함
+        ("detail_login.html", "login"),     # 로그인 페이지로 리다이렉트
+        ("detail_shell.html", "content"),   # 클라이언트 렌더링 전 셸 (섹션/본문 부족)
+    ],
+)
+def test_parse_detail_fallbacks(fixture, reason):
+    d, why = parse_detail(_html(fixture), DETAIL_URL)
+    assert d is None
+    assert why == reason
+    assert parse_detail_sections(_html(fixture)) is None
+
+
+def test_parse_detail_content_threshold():
+    # 섹션 제목이 2개 이상이어도 본문이 짧으면 content
+    html = "<html><body><main><h2>소개</h2><p>짧음</p><h2>팀 정보</h2><p>1명</p></main></body></html>"
+    assert parse_detail(html) == (None, "content")
@@ -0,0 +1,123 @@
+# tools/crawl_cache.py
+"""
+크롤 결과 디스크 캐시 (SQLite)
+- 키: 정규화 URL (_ensure_all_tab 형태)
+- 값: 본문(수집 원문), 본문 해시(sha256), 수집 시각, 추출 버전, 항목별 TTL
+- 추출 로직이 바뀌면 EXTRACTION_VERSION 을 올려 이전 항목을 자동 무효화
+- 설정: CRAWL_CACHE(1/0), CRAWL_CACHE_PATH, CRAWL_CACHE_TTL_H
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+CRAWL_CACHE = os.getenv("CRAWL_CACHE", "1") == "1"
+CRAWL_CACHE_PATH = os.getenv("CRAWL_CACHE_PATH", "./data/crawl_cache.sqlite3")
+CRAWL_CACHE_TTL_H = float(os.getenv("CRAWL_CACHE_TTL_H", "24"))
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+class CrawlCache:
+    def __init__(self, path: str = CRAWL_CACHE_PATH, *, ttl_s: float = CRAWL_CACHE_TTL_H * 3600):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            " url TEXT PRIMARY KEY, text TEXT NOT NULL, hash TEXT NOT NULL,"
+            " fetched_at REAL NOT NULL, version TEXT NOT NULL, ttl REAL NOT NULL)"
+        )
+        self._db.commit()
+        self.ttl_s = ttl_s
+        self._stats = {"hits": 0, "misses": 0, "stored": 0, "unchanged": 0}
+
+    def get_fresh(self, urls: Iterable[str], *, version: str) -> Dict[str, str]:
+        """TTL 이내 + 같은 추출 버전인 항목만 {url: text}"""
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return {}
+        now = time.time()
+        out: Dict[str, str] = {}
+        with self._lock:
+            for s in range(0, len(urls), 500):
+                chunk = urls[s:s + 500]
+                rows = self._db.execute(
+                    f"SELECT url, text, fetched_at, ttl, version FROM pages WHERE url IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                for url, text, fetched_at, ttl, ver in rows:
+                    if ver == version and now - fetched_at < ttl:
+                        out[url] = text
+            self._stats["hits"] += len(out)
+            self._stats["misses"] += len(urls) - len(out)
+        return out
+
+    def put_many(self, items: Iterable[Tuple[str, str]], *, version: str, ttl_s: Optional[float] = None) -> int:
+        """(url, 본문) 저장. 해시가 같으면 수집 시각만 갱신. 반환: 내용이 바뀐(새) 항목 수"""
+        ttl = self.ttl_s if ttl_s is None else ttl_s
+        now = time.time()
+        changed = 0
+        with self._lock:
+            for url, text in items:
+                h = content_hash(text)
+                row = self._db.execute("SELECT hash FROM pages WHERE url = ?", (url,)).fetchone()
+                if row is not None and row[0] == h:
+                    self._db.execute(
+                        "UPDATE pages SET fetched_at = ?, version = ?, ttl = ? WHERE url = ?",
+                        (now, version, ttl, url),
+                    )
+                    self._stats["unchanged"] += 1
+                    continue
+                self._db.execute(
+                    "INSERT OR REPLACE INTO pages (url, text, hash, fetched_at, version, ttl) VALUES (?, ?, ?, ?, ?, ?)",
+                    (url, text, h, now, version, ttl),
+                )
+                changed += 1
+            self._stats["stored"] += changed
+            self._db.commit()
+        return changed
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            cur = self._db.execute("DELETE FROM pages WHERE ? - fetched_at >= ttl", (time.time(),))
+            self._db.commit()
+            return cur.rowcount
+
+    def stats(self) -> Dict[str, float]:
+        s: Dict[str, float] = dict(self._stats)
+        total = s["hits"] + s["misses"]
+        s["hit_rate"] = round(s["hits"] / total, 4) if total else 0.0
+        return s
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+_CACHE: Optional[CrawlCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_crawl_cache() -> Optional[CrawlCache]:
+    """프로세스 공용 캐시 (CRAWL_CACHE=0 이면 None)"""
+    global _CACHE
+    if not CRAWL_CACHE:
+        return None
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                _CACHE = CrawlCache()
+    return _CACHE
+
+
+def crawl_cache_stats() -> Dict[str, float]:
+    return _CACHE.stats() if _CACHE is not None else {}
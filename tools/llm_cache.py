@@ -0,0 +1,226 @@
+# tools/llm_cache.py
+"""
+LLM 응답 디스크 캐시 (SQLite, LangChain BaseCache)
+- 키: sha256(llm_string + 렌더링된 메시지)
+  llm_string 에 모델명/temperature/바인딩된 tools(structured output 스키마)가 포함되므로
+  (model, temperature, messages, output schema) 가 같을 때만 히트
+- 값: 생성 결과(Generation 목록) langchain dumps 직렬화 + 저장 시각/최근 사용 시각/크기
+- TTL 지난 항목은 조회 시 무시, 전체 크기가 상한을 넘으면 최근 사용이 오래된 것부터 삭제
+- 모드(LLM_CACHE_MODE):
+    * readwrite : 히트는 캐시, 미스는 API 호출 후 저장 (기본)
+    * replay    : 캐시만 사용, 미스는 LLMCacheMiss → 네트워크 없이 그래프 전체 벤치마크/회귀 테스트
+                  (ChatOpenAI 생성에 OPENAI_API_KEY 가 필요하므로 더미 값을 넣어 둔다)
+    * off       : 캐시 사용 안 함
+- 설정: LLM_CACHE_MODE, LLM_CACHE_PATH, LLM_CACHE_TTL_H, LLM_CACHE_MAX_MB
+
+녹화 → 재생 확인 (가짜 모델):
+    python -m tools.llm_cache
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import warnings
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+from dotenv import load_dotenv
+from langchain_core._api import LangChainBetaWarning
+from langchain_core.caches import BaseCache
+from langchain_core.load import dumps, loads
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, Generation, GenerationChunk
+
+load_dotenv()
+
+LLM_CACHE_MODE = os.getenv("LLM_CACHE_MODE", "readwrite")  # readwrite | replay | off
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "./data/llm_cache.sqlite3")
+LLM_CACHE_TTL_H = float(os.getenv("LLM_CACHE_TTL_H", "168"))
+# 캐시 값(생성 결과) 역직렬화 허용 클래스: 생성 결과 + 응답 메시지만 (모델/프롬프트 등은 복원하지 않음)
+_ALLOWED_OBJECTS = [Generation, GenerationChunk, ChatGeneration, ChatGenerationChunk, AIMessage, AIMessageChunk]
+LLM_CACHE_MAX_MB = float(os.getenv("LLM_CACHE_MAX_MB", "200"))
+
+_MODES = ("readwrite", "replay", "off")
+
+
+class LLMCacheMiss(RuntimeError):
+    """replay 모드에서 캐시에 없는 프롬프트"""
+
+
+def cache_key(prompt: str, llm_string: str) -> str:
+    return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+
+class SQLiteLLMCache(BaseCache):
+    def __init__(
+        self,
+        path: str = LLM_CACHE_PATH,
+        *,
+        ttl_s: float = LLM_CACHE_TTL_H * 3600,
+        max_bytes: int = int(LLM_CACHE_MAX_MB * 1024 * 1024),
+        replay_only: bool = False,
+    ):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL,"
+            " created_at REAL NOT NULL, used_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_used_at ON responses (used_at)")
+        self._db.commit()
+        self.ttl_s = ttl_s
+        self.max_bytes = max_bytes
+        self.replay_only = replay_only
+        self._bytes = int(self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0])
+        self._stats = {"hits": 0, "misses": 0, "stored": 0, "expired": 0, "evicted": 0}
+
+    # ── BaseCache ─────────────────────────────────────────────────────────────
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence[Generation]]:
+        key = cache_key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT value, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and now - row[1] >= self.ttl_s and not self.replay_only:
+                self._stats["expired"] += 1
+                row = None
+            if row is None:
+                self._stats["misses"] += 1
+            else:
+                self._stats["hits"] += 1
+                self._db.execute("UPDATE responses SET used_at = ? WHERE key = ?", (now, key))
+                self._db.commit()
+        if row is None:
+            if self.replay_only:
+                raise LLMCacheMiss(f"LLM 캐시 미스 (replay 모드): key={key[:12]}")
+            return None
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", LangChainBetaWarning)
+            return loads(row[0], allowed_objects=_ALLOWED_OBJECTS)
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Generation]) -> None:
+        if self.replay_only:
+            return
+        key = cache_key(prompt, llm_string)
+        value = dumps(list(return_val))
+        size = len(value.encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            old = self._db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, created_at, used_at) VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now),
+            )
+            self._bytes += size - (old[0] if old else 0)
+            self._stats["stored"] += 1
+            if self._bytes > self.max_bytes:
+                self._evict_locked()
+            self._db.commit()
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+            self._bytes = 0
+
+    # ── 관리 ──────────────────────────────────────────────────────────────────
+    def _evict_locked(self) -> None:
+        """최근 사용이 오래된 것부터 상한의 90% 아래로 내려갈 때까지 삭제"""
+        target = int(self.max_bytes * 0.9)
+        victims = []
+        for key, size in self._db.execute("SELECT key, size FROM responses ORDER BY used_at"):
+            if self._bytes <= target:
+                break
+            victims.append((key,))
+            self._bytes -= size
+        self._db.executemany("DELETE FROM responses WHERE key = ?", victims)
+        self._stats["evicted"] += len(victims)
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            cur = self._db.execute("DELETE FROM responses WHERE ? - created_at >= ?", (time.time(), self.ttl_s))
+            self._db.commit()
+            self._bytes = int(self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0])
+            return cur.rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        s: Dict[str, Any] = dict(self._stats)
+        total = s["hits"] + s["misses"]
+        s["hit_rate"] = round(s["hits"] / total, 4) if total else 0.0
+        s["bytes"] = self._bytes
+        s["mode"] = "replay" if self.replay_only else "readwrite"
+        return s
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+_CACHE: Optional[SQLiteLLMCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_llm_cache() -> Optional[SQLiteLLMCache]:
+    """프로세스 공용 캐시 (LLM_CACHE_MODE=off 이면 None). ChatOpenAI(cache=get_llm_cache()) 로 사용"""
+    global _CACHE
+    if LLM_CACHE_MODE not in _MODES:
+        raise ValueError(f"지원하지 않는 LLM_CACHE_MODE: {LLM_CACHE_MODE} ({'|'.join(_MODES)})")
+    if LLM_CACHE_MODE == "off":
+        return None
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                _CACHE = SQLiteLLMCache(replay_only=LLM_CACHE_MODE == "replay")
+    return _CACHE
+
+
+def llm_cache_stats() -> Dict[str, Any]:
+    return _CACHE.stats() if _CACHE is not None else {}
+
+
+# ====== 녹화 → 재생 확인 ======
+if __name__ == "__main__":
+    import tempfile
+
+    from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+    with tempfile.TemporaryDirectory() as td:
+        path = str(Path(td) / "llm_cache.sqlite3")
+
+        class SlowFake(FakeListChatModel):
+            sleep: float = 0.2
+
+        rec = SQLiteLLMCache(path)
+        llm = SlowFake(responses=["A", "B", "C"], cache=rec)
+        prompts = ["회사 1 정리", "회사 2 정리", "회사 1 정리"]
+        t0 = time.perf_counter()
+        first = [llm.invoke(p).content for p in prompts]
+        t_rec = time.perf_counter() - t0
+        print("record :", first, f"{t_rec:.2f}s", rec.stats())
+        rec.close()
+
+        rep = SQLiteLLMCache(path, replay_only=True)
+        llm = SlowFake(responses=["A", "B", "C"], cache=rep)  # 모델 설정이 같아야 같은 키
+        t0 = time.perf_counter()
+        again = [llm.invoke(p).content for p in prompts]
+        t_rep = time.perf_counter() - t0
+        print("replay :", again, f"{t_rep:.3f}s", rep.stats())
+        assert again == first
+        try:
+            llm.invoke("처음 보는 프롬프트")
+            raise SystemExit("replay 미스가 통과됨")
+        except LLMCacheMiss as e:
+            print("miss   :", e)
+        rep.close()
+
+        small = SQLiteLLMCache(path, max_bytes=2000)
+        llm = SlowFake(responses=["응답" * 50], sleep=0.0, cache=small)
+        for i in range(20):
+            llm.invoke(f"프롬프트 {i}")
+        print("evict  :", small.stats())
+        assert small.stats()["bytes"] <= 2000
@@ -0,0 +1,269 @@
+# tools/llm_provider.py
+"""
+LLM 클라이언트 공용 풀
+- get_chat_model(model, temperature, **kw) : (model, temperature, 옵션) 별 ChatOpenAI 1개를 프로세스 내내 재사용
+- 모든 ChatOpenAI 가 같은 httpx Client/AsyncClient 를 공유 → 커넥션 풀·TLS 세션 재사용 (keep-alive)
+- 연결 상한/keep-alive/타임아웃은 환경변수로 설정, LLM 응답 캐시(tools/llm_cache.py)도 여기서 연결
+- OPENAI_BASE_URL 로 OpenAI 호환 로컬 서버(테스트용 stand-in)로 바로 전환
+- 공용 클라이언트 전송 계층에 전역 속도 제한(tools/rate_limiter.py: RPM/TPM 버킷 + AIMD 동시성 + 재시도)을
+  끼워 모든 LLM 호출이 통과. 재시도는 리미터가 맡으므로 ChatOpenAI(max_retries=0)
+- llm_provider_stats() : 요청 수 / 새 TCP 연결 수 / TLS 핸드셰이크 수 / 재사용률
+- 설정: OPENAI_BASE_URL, LLM_MAX_CONNECTIONS, LLM_MAX_KEEPALIVE, LLM_KEEPALIVE_S,
+        LLM_TIMEOUT_S, LLM_CONNECT_TIMEOUT_S
+
+로컬 stand-in 서버로 확인:
+    python -m tools.llm_provider
+"""
+from __future__ import annotations
+
+import asyncio
+import atexit
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+from dotenv import load_dotenv
+from langchain_openai import ChatOpenAI
+
+from tools.llm_cache import get_llm_cache
+from tools.rate_limiter import AsyncRateLimitedTransport, RateLimitedTransport, get_rate_limiter
+
+load_dotenv()
+
+log = logging.getLogger(__name__)
+
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+LLM_MAX_KEEPALIVE = int(os.getenv("LLM_MAX_KEEPALIVE", "20"))
+LLM_KEEPALIVE_S = float(os.getenv("LLM_KEEPALIVE_S", "60"))
+LLM_TIMEOUT_S = float(os.getenv("LLM_TIMEOUT_S", "60"))
+LLM_CONNECT_TIMEOUT_S = float(os.getenv("LLM_CONNECT_TIMEOUT_S", "10"))
+
+_LOCK = threading.Lock()
+_MODELS: Dict[Tuple, ChatOpenAI] = {}
+_SYNC: Optional[httpx.Client] = None
+_ASYNC: Optional[httpx.AsyncClient] = None
+# AsyncClient 커넥션은 처음 쓰인 이벤트 루프에 묶임 (보통 CrawlSession 루프 스레드) → 닫을 때도 그 루프에서
+_ASYNC_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_STATS = {"requests": 0, "connections": 0, "tls_handshakes": 0, "models": 0}
+
+
+# ── 연결 재사용 측정 (httpcore trace: 새 연결일 때만 connect_tcp 이벤트 발생) ──
+def _count(event: str) -> None:
+    if event == "connection.connect_tcp.complete":
+        _STATS["connections"] += 1
+    elif event == "connection.start_tls.complete":
+        _STATS["tls_handshakes"] += 1
+
+
+def _trace(event: str, info: Dict[str, Any]) -> None:
+    _count(event)
+
+
+async def _atrace(event: str, info: Dict[str, Any]) -> None:
+    _count(event)
+
+
+def _on_request(request: httpx.Request) -> None:
+    _STATS["requests"] += 1
+    request.extensions["trace"] = _trace
+
+
+async def _aon_request(request: httpx.Request) -> None:
+    global _ASYNC_LOOP
+    if _ASYNC_LOOP is None:
+        _ASYNC_LOOP = asyncio.get_running_loop()
+        # atexit 은 역순 실행: 다시 등록해 소유 루프(크롤 루프 등)를 멈추는 정리보다 먼저 닫히게 함
+        atexit.unregister(close_llm_clients)
+        atexit.register(close_llm_clients)
+    _STATS["requests"] += 1
+    request.extensions["trace"] = _atrace
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=LLM_MAX_CONNECTIONS,
+        max_keepalive_connections=LLM_MAX_KEEPALIVE,
+        keepalive_expiry=LLM_KEEPALIVE_S,
+    )
+
+
+def _timeout() -> httpx.Timeout:
+    return httpx.Timeout(LLM_TIMEOUT_S, connect=LLM_CONNECT_TIMEOUT_S)
+
+
+def shared_http_client() -> httpx.Client:
+    """동기 호출(invoke) 공용 httpx 클라이언트"""
+    global _SYNC
+    if _SYNC is None:
+        with _LOCK:
+            if _SYNC is None:
+                _SYNC = httpx.Client(
+                    transport=RateLimitedTransport(get_rate_limiter(), httpx.HTTPTransport(limits=_limits())),
+                    timeout=_timeout(), event_hooks={"request": [_on_request]},
+                )
+    return _SYNC
+
+
+def shared_async_http_client() -> httpx.AsyncClient:
+    """비동기 호출(ainvoke) 공용 httpx 클라이언트"""
+    global _ASYNC
+    if _ASYNC is None:
+        with _LOCK:
+            if _ASYNC is None:
+                _ASYNC = httpx.AsyncClient(
+                    transport=AsyncRateLimitedTransport(
+                        get_rate_limiter(), httpx.AsyncHTTPTransport(limits=_limits()),
+                    ),
+                    timeout=_timeout(), event_hooks={"request": [_aon_request]},
+                )
+    return _ASYNC
+
+
+def _freeze(value: Any) -> Any:
+    """kwargs 를 캐시 키로 쓸 수 있게 변환 (model_kwargs 같은 dict/list 값 포함)"""
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(v) for v in value)
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return repr(value)
+
+
+def get_chat_model(model: str = "gpt-4o-mini", temperature: float = 0.0, **kwargs: Any) -> ChatOpenAI:
+    """
+    (model, temperature, kwargs) 별 공용 ChatOpenAI. 처음 요청될 때 1회 생성
+    - kwargs: streaming / model_kwargs 등 ChatOpenAI 옵션 (키에 포함, dict·list 값도 가능)
+    - http_client / http_async_client / cache / base_url / timeout / max_retries 는 공용 설정으로 채움
+    """
+    key = (model, float(temperature), _freeze(kwargs))
+    llm = _MODELS.get(key)
+    if llm is not None:
+        return llm
+    http_client = shared_http_client()
+    http_async_client = shared_async_http_client()
+    with _LOCK:
+        llm = _MODELS.get(key)
+        if llm is None:
+            opts: Dict[str, Any] = dict(
+                model=model,
+                temperature=temperature,
+                http_client=http_client,
+                http_async_client=http_async_client,
+                timeout=_timeout(),
+                max_retries=0,  # 타임아웃/408/409/429/5xx 재시도는 rate_limiter 전송 계층에서 (이중 재시도 방지)
+                cache=get_llm_cache(),
+            )
+            if OPENAI_BASE_URL:
+                opts["base_url"] = OPENAI_BASE_URL
+            opts.update(kwargs)
+            llm = _MODELS[key] = ChatOpenAI(**opts)
+            _STATS["models"] = len(_MODELS)
+    return llm
+
+
+def llm_provider_stats() -> Dict[str, Any]:
+    s: Dict[str, Any] = dict(_STATS)
+    s["reused"] = max(0, s["requests"] - s["connections"])
+    s["reuse_rate"] = round(s["reused"] / s["requests"], 4) if s["requests"] else 0.0
+    return s
+
+
+def _close_async_client(aclient: httpx.AsyncClient, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+    """AsyncClient 를 커넥션이 열린 루프에서 닫음"""
+    if loop is None:
+        # 한 번도 쓰지 않음 → 열린 커넥션이 없으니 어느 루프에서 닫아도 됨
+        asyncio.run(aclient.aclose())
+        return
+    if loop.is_closed() or not loop.is_running():
+        # 소유 루프가 이미 멈춤(asyncio.run 종료, 크롤 루프 정지 등): 다른 루프에서 aclose 하면
+        # 그 루프에 묶인 transport 를 건드리게 되므로 닫지 않고 소켓 정리는 프로세스 종료에 맡김
+        log.debug("llm async client: owner loop stopped, skip aclose")
+        return
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        # 소유 루프 안에서 호출됨 → 막지 않고 예약만
+        loop.create_task(aclient.aclose())
+    else:
+        asyncio.run_coroutine_threadsafe(aclient.aclose(), loop).result(timeout=5)
+
+
+def close_llm_clients() -> None:
+    """공용 httpx 클라이언트 종료 (프로세스 종료 시 자동 호출)"""
+    global _SYNC, _ASYNC, _ASYNC_LOOP
+    with _LOCK:
+        if _SYNC is not None:
+            _SYNC.close()
+            _SYNC = None
+        if _ASYNC is not None:
+            aclient, loop, _ASYNC, _ASYNC_LOOP = _ASYNC, _ASYNC_LOOP, None, None
+            try:
+                _close_async_client(aclient, loop)
+            except Exception as e:
+                log.warning("llm async client close failed: %s", e)
+        _MODELS.clear()
+
+
+atexit.register(close_llm_clients)
+
+
+# ====== 로컬 stand-in 서버로 확인 ======
+if __name__ == "__main__":
+    import json
+    import time
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class _StandIn(BaseHTTPRequestHandler):
+        """OpenAI 호환 /chat/completions stand-in (keep-alive)"""
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            last = (body.get("messages") or [{}])[-1].get("content", "")
+            out = json.dumps({
+                "id": "cmpl-local", "object": "chat.completion", "created": int(time.time()),
+                "model": body.get("model", "stand-in"),
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": f"echo: {last}"}}],
+                "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+            }).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(out)))
+            self.end_headers()
+            self.wfile.write(out)
+
+        def log_message(self, *a):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    OPENAI_BASE_URL = f"http://127.0.0.1:{server.server_port}/v1"
+    os.environ.setdefault("OPENAI_API_KEY", "sk-local")
+
+    n = 20
+    a = get_chat_model("gpt-4o-mini", 0.2, cache=None)
+    b = get_chat_model("gpt-4o-mini", 0.2, cache=None)
+    assert a is b
+    t0 = time.perf_counter()
+    for i in range(n):
+        a.invoke(f"ping {i}")
+    pooled = time.perf_counter() - t0
+    print(f"pooled   : {n} calls {pooled * 1000:.0f}ms", llm_provider_stats())
+
+    t0 = time.perf_counter()
+    for i in range(n):
+        ChatOpenAI(model="gpt-4o-mini", temperature=0.2, base_url=OPENAI_BASE_URL).invoke(f"ping {i}")
+    fresh = time.perf_counter() - t0
+    print(f"per-call : {n} calls {fresh * 1000:.0f}ms (호출마다 새 클라이언트/새 연결)")
+    server.shutdown()
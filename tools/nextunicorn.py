@@ -4,22 +4,43 @@ NextUnicorn 전용 크롤링 툴
 - 공개 API:
     * nextunicorn_list(...)                       : 스타트업 카드 리스트 수집
     * nextunicorn_company_details_batch(urls, ...) : 상세 페이지 본문 수집 배치
-    * summarize_company_text(full_text)           : 상세 본문 섹션 요약
+    * summarize_company_text(full_text)           : 상세 본문 섹션 요약 (본문 문자열 기준 분할)
+    * structure_detail(detail)                    : Detail → 섹션 (페이지 안에서 나눈 detail["sections"] 우선)
     * nextunicorn_list_and_details(... )          : (신규) 한 세션으로 리스트→디테일까지 한번에 수집
     * nextunicorn_list_and_details_sync(... )     : (신규) 동기 래퍼
+    * CrawlSession                                 : 브라우저 1회 기동으로 list/details 를 반복 수행하는 세션
+    * run_crawl(fn, headless=...)                  : 프로세스 공용 세션으로 동기 실행 (파이프라인 반복 시 재사용)
 - 성능 최적화:
-    * 브라우저/컨텍스트 1회 재사용 (list_and_details)
+    * 브라우저/컨텍스트 1회 재사용 (CrawlSession, 공용 세션은 전용 이벤트 루프 스레드에서 유지)
     * 이미지/폰트/미디어/애널리틱스 요청 차단으로 대역폭/렌더링 시간 절감
     * storage_state 재활용으로 로그인 생략
+    * 고정 sleep 대신 이벤트 기반 준비 감지 (DOM 변경 정지 + 진행 중 요청 0, 기존 대기는 상한)
+      → readiness_stats() 로 페이지당 절감 시간 확인, NEXTUNICORN_FIXED_WAITS=1 로 기존 동작
+    * 증분 수집: watermark(최근 처리 카드 URL)에 닿으면 '더 보기' 중단 → 새 카드만 후속 처리
+      (처리에 실패한 카드는 watermark 의 retry 목록에 남겨 다음 실행에 다시 처리)
+    * 크롤 캐시(tools/crawl_cache.py): TTL 이내 상세 페이지는 페이지를 열지 않고 캐시 본문 반환
+    * 상세 페이지 동시 수집: 한 컨텍스트에서 N개 페이지 풀 + 호스트별 in-flight 제한/지터 지연
+      (NEXTUNICORN_CONCURRENCY / NEXTUNICORN_HOST_INFLIGHT / NEXTUNICORN_DELAY_MS)
+    * 리스트 카드는 '더 보기' 라운드당 evaluate 1회로 새 카드만 직렬화
+    * 상세 섹션은 페이지 안에서 텍스트 노드 1회 순회로 나눠 JSON 으로 반환 (Detail["sections"])
 """
 
+import asyncio
+import atexit
+import json
 import os
-import re
+import random
+import threading
+import time
+import weakref
 from pathlib import Path
-from typing import List, Dict, Any, Iterable, TypedDict, Optional
+from typing import List, Dict, Any, AsyncIterator, Iterable, TypedDict, Optional, Tuple
+from urllib.parse import urlparse
 from dotenv import load_dotenv
 from playwright.async_api import async_playwright, TimeoutError as PWTimeout
 from tools.utils import user_agent
+from tools.crawl_cache import get_crawl_cache, crawl_cache_stats
+from tools.text_normalize import LineCleaner, dedupe_lines, sanitize
 import logging
 
 load_dotenv()
@@ -32,6 +53,15 @@ __all__ = [
     "summarize_company_text",
     "nextunicorn_list_and_details",
     "nextunicorn_list_and_details_sync",
+    "CrawlSession",
+    "run_crawl",
+    "crawl_session_stats",
+    "close_crawl_session",
+    "readiness_stats",
+    "canonical_company_url",
+    "load_watermark",
+    "load_retry",
+    "save_watermark",
 ]
 
 # ====== 선택자/상수 ======
@@ -40,17 +70,15 @@ _TITLE_SEL = "span.UnicornCompanyCard_Title"
 _SUMMARY_SEL = "span.UnicornCompanyCard_Summary"
 _MORE_BTN = "button[data-event='finder/:tabName/seeMore'][data-tab-name='startup']"
 _STORAGE_FILE = "nextunicorn_state.json"
+# 증분 수집 watermark: 최근 처리한 카드 URL(최신순). 리스트 수집은 이 중 하나를 만나면 중단
+_WATERMARK_FILE = os.getenv("NEXTUNICORN_WATERMARK", "nextunicorn_watermark.json")
+_WATERMARK_KEEP = 200
 
 # 로그인 페이지 요소
 _EMAIL_INP_PL = "넥스트유니콘 이메일 계정을 입력해주세요."
 _PASS_INP_PL = "비밀번호를 입력해주세요."
 _LOGIN_BTN_TX = "로그인"
 
-# 텍스트 정제
-_TAG_TOKEN = re.compile(r"#\S+")
-_ALLOWED = re.compile(r"[^0-9A-Za-z가-힣\s]")
-_MSPACE = re.compile(r"\s+")
-
 # 노이즈 제거 키워드/라벨
 _NOISE_CONTAINS = [
     "무료상담신청", "IR자료 요청하기", "티켓", "티켓구매",
@@ -60,6 +88,35 @@ _NOISE_CONTAINS = [
 ]
 _NOISE_PREFIXES = ["홈>", "홈 >", "Home>", "home>", "HOME>", "파인더>", "파인더 >"]
 _TAB_LABELS = {"전체", "투자 정보", "서비스/제품", "팀 정보"}
+# 본문 추출/정제 로직이 바뀌면 올림 → 크롤 캐시의 이전 항목 무효화
+EXTRACTION_VERSION = "3"
+# 노이즈 규칙은 한 번만 컴파일 (tools/text_normalize.LineCleaner)
+_LINES = LineCleaner(
+    exact=_TAB_LABELS, prefixes=_NOISE_PREFIXES, contains=_NOISE_CONTAINS, hashtag_max_len=50,
+)
+_LINES_WITH_ACCOUNT = LineCleaner(
+    exact=_TAB_LABELS, prefixes=_NOISE_PREFIXES, contains=_NOISE_CONTAINS, hashtag_max_len=50,
+    erase=("신순호",),  # 로그인명 흔적 제거 가능성
+)
+_EXPAND_BUTTONS = ["펼쳐보기", "더 보기", "투자 정보 더 보기", "서비스/제품 정보 더 보기", "팀 정보 더 보기"]
+_FOOTER_NEEDLE = "주식회사 넥스트유니콘"
+# 상세 페이지 섹션 제목 → Structured 키 (문서 순서)
+_SECTIONS = (
+    ("소개", "summary"), ("투자 정보", "funding"), ("서비스/제품 정보", "services"),
+    ("팀 정보", "team"), ("기업 소식", "news"), ("회사 정보", "info"),
+)
+_SECTION_KEY = dict(_SECTIONS)
+_SECTION_TITLE = {k: t for t, k in _SECTIONS}
+# 섹션 제목 라인 표식 (본문에 나오지 않는 문자열). 캐시에는 표식 포함 본문을 저장해 섹션을 복원
+_SECTION_MARK = "\u2063§"
+
+# 상세 페이지 동시 수집 설정
+# 상세: HTML 파싱 우선, 부족할 때만 브라우저. 실제 수집 상세 페이지 픽스처로 검증되기 전까지 기본 끔
+# (테스트 픽스처는 파서 선택자 기준으로 만든 것이라 접힌/잘린 섹션을 놓쳐도 잡히지 않음)
+_HTML_FAST = os.getenv("NEXTUNICORN_HTML_FAST", "0") == "1"
+_CONCURRENCY = int(os.getenv("NEXTUNICORN_CONCURRENCY", "4"))      # 컨텍스트 내 페이지 풀 크기 (1 = 순차)
+_HOST_INFLIGHT = int(os.getenv("NEXTUNICORN_HOST_INFLIGHT", "4"))  # 호스트당 동시 요청 상한
+_DELAY_MS = tuple(int(x) for x in os.getenv("NEXTUNICORN_DELAY_MS", "150,600").split(","))  # 요청 전 지터(min,max)
 
 
 # ====== 타입 ======
@@ -71,7 +128,9 @@ class Card(TypedDict):
 class Detail(TypedDict, total=False):
     url: str
     full_text: str
+    sections: Dict[str, str]  # Structured 키 → 섹션 원문 (제목 라인을 찾은 섹션만)
     error: str
+    cached: bool
 
 class Structured(TypedDict):
     company: str
@@ -86,12 +145,7 @@ class Structured(TypedDict):
 # ====== 내부 유틸 ======
 def _sanitize_text(text: Optional[str]) -> str:
     """태그/특수문자/다중 공백 제거"""
-    if not text:
-        return ""
-    s = _TAG_TOKEN.sub(" ", text)
-    s = _ALLOWED.sub(" ", s)
-    s = _MSPACE.sub(" ", s).strip()
-    return s
+    return sanitize(text)
 
 async def _ensure_logged_in(context, page):
     """
@@ -141,25 +195,31 @@ async def _ensure_logged_in(context, page):
         log.debug("storage_state save failed: %s", e)
 
 
-async def _extract_card(card) -> Card:
-    """카드 엘리먼트에서 title/summary/url 추출"""
-    href = await card.get_attribute("href")
-    full = href if (href or "").startswith("http") else f"https://www.nextunicorn.kr{href}"
-    title = ""
-    summary = ""
-    try:
-        t = await card.locator(_TITLE_SEL).first.text_content()
-        if t:
-            title = _sanitize_text(t)
-    except Exception as e:
-        log.debug("title parse fail: %s", e)
-    try:
-        s = await card.locator(_SUMMARY_SEL).first.text_content()
-        if s:
-            summary = _sanitize_text(s)
-    except Exception as e:
-        log.debug("summary parse fail: %s", e)
-    return {"title": title, "summary": summary, "url": full}
+# start 번째 이후 카드만 {href,title,summary} 로 직렬화 + '더 보기' 버튼 노출 여부 (라운드당 evaluate 1회)
+_JS_CARDS_SINCE = """
+([cardSel, titleSel, sumSel, moreSel, start]) => {
+  const all = document.querySelectorAll(cardSel);
+  const from = start <= all.length ? start : 0;  // 리스트가 다시 그려져 줄었으면 처음부터
+  const cards = [];
+  for (let i = from; i < all.length; i++) {
+    const a = all[i], t = a.querySelector(titleSel), s = a.querySelector(sumSel);
+    cards.push({href: a.getAttribute('href'), title: t ? t.textContent : '', summary: s ? s.textContent : ''});
+  }
+  const b = document.querySelector(moreSel);
+  const more = !!b && getComputedStyle(b).visibility !== 'hidden' && b.getClientRects().length > 0;
+  return {total: all.length, cards, more};
+}
+"""
+
+
+def _card_from_raw(raw: Dict[str, Any]) -> Card:
+    """_JS_CARDS_SINCE 결과 1건 → Card"""
+    href = raw.get("href") or ""
+    return {
+        "title": _sanitize_text(raw.get("title")),
+        "summary": _sanitize_text(raw.get("summary")),
+        "url": href if href.startswith("http") else f"https://www.nextunicorn.kr{href}",
+    }
 
 
 def _ensure_all_tab(url: str) -> str:
@@ -172,34 +232,252 @@ def _ensure_all_tab(url: str) -> str:
     return urlunparse((pr.scheme, pr.netloc, pr.path, pr.params, new_q, pr.fragment))
 
 
-async def _grab_full_text(page) -> str:
-    """상세 페이지에서 본문 텍스트를 최대한 펼쳐 수집"""
+def canonical_company_url(href: str) -> str:
+    """카드 href/상세 URL → 쿼리 없는 절대 URL (watermark 키)"""
+    full = href if (href or "").startswith("http") else f"https://www.nextunicorn.kr{href}"
+    return full.split("?", 1)[0].split("#", 1)[0].rstrip("/")
+
+
+def _read_watermark(path: str) -> Dict[str, Any]:
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+
+
+def load_watermark(path: str = _WATERMARK_FILE) -> List[str]:
+    """이전 실행까지 처리한 카드 URL (최신순)"""
+    return list(_read_watermark(path).get("urls", []))
+
+
+def load_retry(path: str = _WATERMARK_FILE) -> List[Card]:
+    """
+    이전 실행에서 리스트에는 나왔지만 처리(업서트)하지 못한 카드.
+    리스트 수집은 frontier 에서 멈추므로, frontier 보다 뒤에 있는 실패 카드는 이 목록으로만 다시 처리됨
+    """
+    return [c for c in _read_watermark(path).get("retry", []) if c.get("url")]
+
+
+def save_watermark(
+    urls: Iterable[str],
+    path: str = _WATERMARK_FILE,
+    *,
+    retry: Optional[Iterable[Card]] = None,
+) -> List[str]:
+    """
+    이번에 처리한 카드 URL(최신순)을 앞에 붙여 최근 _WATERMARK_KEEP 개 유지.
+    retry 를 주면 재시도 목록을 교체 (None 이면 기존 목록 유지), 처리된 URL 은 재시도 목록에서 제외
+    """
+    prev = _read_watermark(path)
+    merged = list(dict.fromkeys([canonical_company_url(u) for u in urls if u] + list(prev.get("urls", []))))
+    merged = merged[:_WATERMARK_KEEP]
+    done = set(merged)
+    pending: Dict[str, Card] = {}
+    for c in (prev.get("retry", []) if retry is None else retry):
+        u = canonical_company_url(c.get("url") or "")
+        if c.get("url") and u not in done:
+            pending.setdefault(u, {"title": c.get("title") or "", "summary": c.get("summary") or "", "url": c["url"]})
+    tmp = Path(path + ".tmp")
+    tmp.write_text(
+        json.dumps(
+            {
+                "urls": merged,
+                "retry": list(pending.values())[:_WATERMARK_KEEP],
+                "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            },
+            ensure_ascii=False,
+        ),
+        encoding="utf-8",
+    )
+    os.replace(tmp, path)
+    return merged
+
+
+# ====== 페이지 준비 상태 감지 ======
+# 기존 고정 대기(ms)는 상한으로만 사용: DOM 변경이 멈추고(_QUIET_MS) 진행 중 요청이 없으면 즉시 진행
+_QUIET_MS = int(os.getenv("NEXTUNICORN_QUIET_MS", "150"))
+_POLL_MS = 30
+_FIXED_WAITS = os.getenv("NEXTUNICORN_FIXED_WAITS", "0") == "1"  # 1 = 기존 고정 sleep (비교용)
+
+# 마지막 DOM 변경 이후 경과 ms (MutationObserver 는 페이지당 1회 설치)
+_JS_SINCE_MUTATION = """
+() => {
+  if (!window.__nuObs) {
+    window.__nuLastMut = performance.now();
+    window.__nuObs = new MutationObserver(() => { window.__nuLastMut = performance.now(); });
+    window.__nuObs.observe(document.documentElement,
+      {childList: true, subtree: true, attributes: true, characterData: true});
+  }
+  return performance.now() - window.__nuLastMut;
+}
+"""
+
+_READINESS = {"pages": 0, "waits": 0, "budget_ms": 0.0, "waited_ms": 0.0}
+
+
+class _NetActivity:
+    """페이지의 진행 중 요청 추적 (request → requestfinished/requestfailed)"""
+
+    def __init__(self, page):
+        self._pending = set()
+        self._idle_since = time.perf_counter()
+        page.on("request", self._on_start)
+        page.on("requestfinished", self._on_end)
+        page.on("requestfailed", self._on_end)
+
+    def _on_start(self, req) -> None:
+        self._pending.add(req)
+
+    def _on_end(self, req) -> None:
+        if req in self._pending:
+            self._pending.discard(req)
+            if not self._pending:
+                self._idle_since = time.perf_counter()
+
+    def idle_ms(self) -> float:
+        return 0.0 if self._pending else (time.perf_counter() - self._idle_since) * 1000
+
+
+_NET: "weakref.WeakKeyDictionary[Any, _NetActivity]" = weakref.WeakKeyDictionary()
+
+
+def _track(page) -> None:
+    """goto 전에 호출해 요청 추적 시작 (페이지당 1회)"""
+    if page not in _NET:
+        _NET[page] = _NetActivity(page)
+
+
+async def _settle(page, max_ms: int, *, quiet_ms: int = _QUIET_MS) -> float:
+    """
+    DOM 변경 정지 + 네트워크 유휴가 quiet_ms 이상 지속되면 반환, 최대 max_ms 대기.
+    반환: 실제 대기 ms
+    """
+    t0 = time.perf_counter()
+    if _FIXED_WAITS:
+        await page.wait_for_timeout(max_ms)
+    else:
+        net = _NET.get(page)
+        while True:
+            waited = (time.perf_counter() - t0) * 1000
+            if waited >= max_ms:
+                break
+            try:
+                dom_quiet = await page.evaluate(_JS_SINCE_MUTATION)
+            except Exception:
+                dom_quiet = quiet_ms  # 네비게이션 중 등 → 네트워크 기준만 사용
+            net_quiet = net.idle_ms() if net is not None else quiet_ms
+            if dom_quiet >= quiet_ms and net_quiet >= quiet_ms:
+                break
+            await asyncio.sleep(min(_POLL_MS, max_ms - waited) / 1000)
+    waited = (time.perf_counter() - t0) * 1000
+    _READINESS["waits"] += 1
+    _READINESS["budget_ms"] += max_ms
+    _READINESS["waited_ms"] += min(waited, max_ms)
+    return waited
+
+
+def readiness_stats() -> Dict[str, Any]:
+    """고정 대기 상한 대비 실제 대기 (페이지당 절감 ms 포함)"""
+    s: Dict[str, Any] = dict(_READINESS)
+    s["saved_ms"] = round(s["budget_ms"] - s["waited_ms"], 1)
+    s["saved_ms_per_page"] = round(s["saved_ms"] / s["pages"], 1) if s["pages"] else 0.0
+    s["budget_ms"] = round(s["budget_ms"], 1)
+    s["waited_ms"] = round(s["waited_ms"], 1)
+    return s
+
+
+# 한 번의 선형 순회로 푸터 블록 제거 + 섹션 제목 표시 후 innerText 1회 → {head, sections:{제목: 본문}}
+#   - 텍스트 노드만 순회 (요소마다 innerText 를 읽던 방식은 DOM 크기에 대해 O(n²))
+#   - 링크/버튼/탭 안의 제목(상단 탭 바 등)은 섹션 경계로 보지 않음
+#   - 같은 제목이 다시 나오면 본문 라인으로 취급 (split_marked_sections 와 같은 규칙)
+_JS_EXTRACT_SECTIONS = """
+([needle, titles, mark]) => {
+  const body = document.body;
+  const want = new Set(titles);
+  const skip = 'a, button, [role=tab], [role=tablist]';
+  const w = document.createTreeWalker(body, NodeFilter.SHOW_TEXT);
+  let footer = null;
+  const heads = [];
+  for (let n = w.nextNode(); n; n = w.nextNode()) {
+    const v = n.data;
+    if (!footer && v.includes(needle)) footer = n.parentElement;
+    const p = n.parentElement;
+    if (p && want.has(v.trim()) && !p.closest(skip)) heads.push(n);
+  }
+  if (footer) (footer.closest('footer, section, div') || footer).remove();
+  for (const n of heads) if (n.isConnected) n.data = mark + n.data.trim();
+  const head = [], sections = {};
+  let cur = head;
+  for (const line of body.innerText.split('\\n')) {
+    const t = line.trim();
+    if (t.startsWith(mark)) {
+      const title = t.slice(mark.length).trim();
+      if (!(title in sections)) { sections[title] = []; cur = sections[title]; continue; }
+      cur.push(title);
+      continue;
+    }
+    cur.push(line);
+  }
+  for (const k in sections) sections[k] = sections[k].join('\\n').trim();
+  for (const n of heads) if (n.isConnected) n.data = n.data.slice(mark.length);
+  return {head: head.join('\\n').trim(), sections};
+}
+"""
+
+
+def split_marked_sections(text: str, mark: str = _SECTION_MARK) -> Tuple[str, Dict[str, str]]:
+    """표식 붙은 제목 라인 기준 1회 순회 분할 → (머리말, {Structured 키: 본문}) (_JS_EXTRACT_SECTIONS 와 같은 규칙)"""
+    head: List[str] = []
+    sections: Dict[str, List[str]] = {}
+    cur = head
+    for line in (text or "").split("\n"):
+        t = line.strip()
+        if t.startswith(mark):
+            title = t[len(mark):].strip()
+            key = _SECTION_KEY.get(title)
+            if key is not None and key not in sections:
+                cur = sections[key] = []
+                continue
+            cur.append(title)
+            continue
+        cur.append(line)
+    return "\n".join(head).strip(), {k: "\n".join(v).strip() for k, v in sections.items()}
+
+
+def join_sections(head: str, sections: Dict[str, str], *, mark: str = "") -> str:
+    """(머리말, 섹션) → 본문 텍스트. mark 를 주면 제목 라인에 표식 (캐시 저장용)"""
+    parts = [head] if head else []
+    for key, body in sections.items():
+        parts.append(f"{mark}{_SECTION_TITLE[key]}")
+        if body:
+            parts.append(body)
+    return "\n".join(parts)
+
+
+def _marked_text(d: Detail) -> str:
+    """캐시 저장용 본문: 섹션 제목 라인에 표식 (히트 시 split_marked_sections 로 섹션 복원)"""
+    text = d.get("full_text") or ""
+    sections = d.get("sections")
+    if not sections:
+        return text
+    tail = join_sections("", sections)
+    if not text.endswith(tail):
+        return text
+    return join_sections(text[:len(text) - len(tail)].rstrip("\n"), sections, mark=_SECTION_MARK)
+
+
+async def _extract_page(page) -> Detail:
+    """상세 페이지를 최대한 펼친 뒤 {full_text, sections} 추출 (섹션 분할까지 페이지 안에서 1회)"""
+    before = (_READINESS["budget_ms"], _READINESS["waited_ms"])
     await page.wait_for_load_state("domcontentloaded")
     await page.evaluate("window.scrollBy(0, document.body.scrollHeight)")
-    await page.wait_for_timeout(700)
-
-    # 헤더/푸터/사이드 제거 + 푸터 텍스트 패턴 제거
-    await page.evaluate("""
-    (() => {
-      document.querySelectorAll('header, footer, nav, aside').forEach(el => el.remove());
-      const killByText = (needle) => {
-        const walker = document.createTreeWalker(document.body, NodeFilter.SHOW_ELEMENT);
-        let nodes = [];
-        while (walker.nextNode()) nodes.push(walker.currentNode);
-        for (const el of nodes) {
-          const t = (el.innerText || '').trim();
-          if (t && t.includes(needle)) {
-            (el.closest('footer, section, div') || el).remove();
-            break;
-          }
-        }
-      };
-      killByText("주식회사 넥스트유니콘");
-    })();
-    """)
+    await _settle(page, 700)
+
+    # 헤더/푸터/내비/사이드 제거 (푸터 텍스트 블록은 추출 단계에서 함께 제거)
+    await page.evaluate("() => document.querySelectorAll('header, footer, nav, aside').forEach(el => el.remove())")
 
     # '펼쳐보기'류 버튼 펼치기
-    for btn_text in ["펼쳐보기", "더 보기", "투자 정보 더 보기", "서비스/제품 정보 더 보기", "팀 정보 더 보기"]:
+    for btn_text in _EXPAND_BUTTONS:
         loc = page.get_by_role("button", name=btn_text)
         try:
             if await loc.count() > 0:
@@ -208,60 +486,53 @@ async def _grab_full_text(page) -> str:
                     if await b.is_visible():
                         try:
                             await b.click(timeout=1500)
-                            await page.wait_for_timeout(300)
+                            # 펼친 버튼이 사라지거나(대부분) DOM 이 잠잠해지면 진행
+                            try:
+                                await b.wait_for(state="hidden", timeout=300)
+                            except Exception:
+                                pass
+                            await _settle(page, 300, quiet_ms=_QUIET_MS // 2)
                         except Exception:
                             pass
         except Exception:
             pass
 
     await page.evaluate("window.scrollBy(0, document.body.scrollHeight)")
-    await page.wait_for_timeout(500)
+    await _settle(page, 500)
 
+    _READINESS["pages"] += 1
+    log.debug(
+        "readiness %s: waited %.0fms of %.0fms budget",
+        page.url, _READINESS["waited_ms"] - before[1], _READINESS["budget_ms"] - before[0],
+    )
     try:
-        return await page.locator("body").inner_text()
-    except Exception:
-        return await page.inner_text("html")
+        got = await page.evaluate(
+            _JS_EXTRACT_SECTIONS, [_FOOTER_NEEDLE, [t for t, _ in _SECTIONS], _SECTION_MARK]
+        )
+    except Exception as e:
+        log.debug("section extract failed (%s), falling back to innerText", e)
+        try:
+            return {"full_text": await page.locator("body").inner_text()}
+        except Exception:
+            return {"full_text": await page.inner_text("html")}
+    sections = {_SECTION_KEY[t]: body for t, body in (got.get("sections") or {}).items() if t in _SECTION_KEY}
+    head = got.get("head") or ""
+    return {"full_text": join_sections(head, sections), "sections": sections}
 
 
-def _strip_noise_lines(text: str) -> str:
-    """불필요 라인/중복/빈줄 정리"""
-    t = text.replace("\u200b", "").replace("\xa0", " ")
-    lines = [l.rstrip() for l in t.splitlines()]
-    keep, prev = [], None
-    for l in lines:
-        ls = l.strip()
-        if not ls:
-            keep.append(ls); prev = ls; continue
-        if ls in _TAB_LABELS:                      # 탭 라벨 제거
-            continue
-        if any(ls.startswith(p) for p in _NOISE_PREFIXES):
-            continue
-        if any(k in ls for k in _NOISE_CONTAINS):
-            continue
-        if ls.startswith("#") and len(ls) < 50:
-            continue
-        if ls == prev:
-            continue
-        keep.append(ls); prev = ls
+async def _grab_full_text(page) -> str:
+    """상세 페이지에서 본문 텍스트를 최대한 펼쳐 수집"""
+    return (await _extract_page(page))["full_text"]
 
-    out, blank = [], False
-    for l in keep:
-        if not l:
-            if blank:
-                continue
-            blank = True
-        else:
-            blank = False
-        out.append(l)
-    return "\n".join(out).strip()
+
+def _strip_noise_lines(text: str) -> str:
+    """불필요 라인/중복/빈줄 정리 (컴파일된 규칙으로 1회 순회)"""
+    return _LINES.clean(text)
 
 
 def _clean_text(raw: str) -> str:
-    """사소한 계정명 흔적/노이즈 제거"""
-    if not raw:
-        return ""
-    raw = raw.replace("신순호", "")  # 로그인명 흔적 제거 가능성
-    return _strip_noise_lines(raw)
+    """사소한 계정명 흔적(로그인명)/노이즈 제거"""
+    return _LINES_WITH_ACCOUNT.clean(raw)
 
 
 def _section(text: str, start_kw: str, end_kws: list[str]) -> str:
@@ -276,100 +547,494 @@ def _section(text: str, start_kw: str, end_kws: list[str]) -> str:
     return seg.strip()
 
 
-def _compact(s: str) -> str:
-    """3줄 이상 연속 개행 → 2줄로 압축"""
-    return re.sub(r"\n{3,}", "\n\n", (s or "").strip())
+class _HostGate:
+    """호스트별 politeness: 동시 요청 상한(semaphore) + 요청 전 지터 지연"""
 
+    def __init__(self, max_inflight: int, delay_ms: tuple):
+        self._max = max(1, max_inflight)
+        self._delay = (min(delay_ms), max(delay_ms)) if delay_ms else (0, 0)
+        self._sems: Dict[str, asyncio.Semaphore] = {}
 
-def _dedupe_lines(s: str) -> str:
-    """중복 라인 제거"""
-    seen, out = set(), []
-    for l in (s.splitlines() if s else []):
-        if l not in seen:
-            out.append(l); seen.add(l)
-    return "\n".join(out).strip()
+    def slot(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc
+        sem = self._sems.get(host)
+        if sem is None:
+            sem = self._sems[host] = asyncio.Semaphore(self._max)
+        return sem
 
+    async def jitter(self) -> None:
+        lo, hi = self._delay
+        if hi > 0:
+            await asyncio.sleep(random.uniform(lo, hi) / 1000)
 
-# ====== 공개 API (기존) ======
-async def nextunicorn_list(
-    url: str = "https://www.nextunicorn.kr/finder?tab=startup&sb=70",
+
+async def _fetch_detail(page, url: str) -> Detail:
+    _track(page)
+    try:
+        await page.goto(url, wait_until="domcontentloaded", timeout=45000)
+        return {"url": url, **(await _extract_page(page))}
+    except Exception as e:
+        return {"url": url, "error": str(e)}
+
+
+async def _fetch_details(
+    context,
+    urls: List[str],
     *,
-    headless: bool = True,
-    limit: int = 50,
-) -> List[Card]:
-    """스타트업 카드 리스트 수집"""
+    concurrency: int,
+    first_page=None,
+    on_result=None,
+) -> List[Detail]:
+    """
+    로그인된 컨텍스트 하나에서 최대 concurrency 개 페이지로 상세 수집.
+    - 워커마다 페이지 1개를 소유하고 공용 큐에서 (index, url) 을 꺼내 처리
+    - 결과는 입력 순서 그대로, 실패는 해당 URL 의 {"url", "error"} 로 반환
+    - first_page 가 주어지면(로그인에 쓴 페이지) 첫 워커가 재사용
+    - on_result(index, detail) 코루틴이 주어지면 페이지마다 완료 즉시 호출 (스트리밍/배압)
+    """
+    out: List[Optional[Detail]] = [None] * len(urls)
+    if not urls:
+        return []
+    n = max(1, min(concurrency, len(urls)))
+    gate = _HostGate(_HOST_INFLIGHT, _DELAY_MS)
+    queue: asyncio.Queue = asyncio.Queue()
+    for i, u in enumerate(urls):
+        queue.put_nowait((i, u))
+
+    async def worker(page, own: bool):
+        try:
+            while True:
+                try:
+                    i, u = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                async with gate.slot(u):
+                    if n > 1:
+                        await gate.jitter()
+                    out[i] = await _fetch_detail(page, u)
+                if on_result is not None:
+                    await on_result(i, out[i])
+        finally:
+            if own:
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+
+    pages = [(first_page, False)] if first_page is not None else []
+    while len(pages) < n:
+        pages.append((await context.new_page(), True))
+    await asyncio.gather(*(worker(pg, own) for pg, own in pages))
+    return [d if d is not None else {"url": urls[i], "error": "not fetched"} for i, d in enumerate(out)]
+
+
+# ====== 리소스 차단 / 리스트 수집 ======
+_BLOCK_TYPES = {"image", "media", "font"}
+_BLOCK_HOSTS = [
+    "google-analytics", "gtag", "hotjar", "segment",
+    "facebook", "doubleclick", "googletagmanager",
+]
+_FINDER_URL = "https://www.nextunicorn.kr/finder?tab=startup&sb=70"
+
+
+async def _route(route):
+    """이미지/폰트/미디어/애널리틱스 요청 차단 (컨텍스트 단위로 걸어 모든 페이지에 적용)"""
+    req = route.request
+    if req.resource_type in _BLOCK_TYPES or any(k in req.url for k in _BLOCK_HOSTS):
+        return await route.abort()
+    return await route.continue_()
+
+
+async def _collect_cards(
+    page,
+    url: str,
+    *,
+    limit: int,
+    frontier: Optional[set] = None,
+) -> Tuple[List[Card], bool]:
+    """
+    finder 리스트 페이지에서 '더 보기'를 눌러가며 카드 limit 개 수집.
+    frontier(이전 실행에서 본 카드 URL 집합)가 주어지면 처음 만나는 기존 카드에서 멈춤.
+    카드 추출은 라운드마다 page.evaluate 1회 (직전 라운드 이후 추가된 카드만 직렬화)
+    반환: (카드 목록, frontier 도달 여부)
+    """
     results: List[Card] = []
     seen = set()
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=headless)
-        context = await browser.new_context(
+    reached = False
+
+    _track(page)
+    await page.goto(url, wait_until="domcontentloaded", timeout=45000)
+    await page.wait_for_selector(_CARD_SEL, timeout=45000)
+    await _settle(page, 500)
+
+    n_seen = 0      # 이미 직렬화한 카드 수 (다음 라운드는 이 index 이후만)
+    has_more = False
+
+    async def collect():
+        nonlocal reached, n_seen, has_more
+        snap = await page.evaluate(
+            _JS_CARDS_SINCE, [_CARD_SEL, _TITLE_SEL, _SUMMARY_SEL, _MORE_BTN, n_seen]
+        )
+        n_seen = snap["total"]
+        has_more = snap["more"]
+        for raw in snap["cards"]:
+            href = raw.get("href")
+            if not href or href in seen:
+                continue
+            seen.add(href)
+            if frontier and canonical_company_url(href) in frontier:
+                reached = True
+                break
+            results.append(_card_from_raw(raw))
+            if len(results) >= limit:
+                break
+
+    await collect()
+    while len(results) < limit and not reached and has_more:
+        t_more = time.perf_counter()
+        try:
+            await page.locator(_MORE_BTN).first.click(timeout=4000)
+        except Exception:
+            await page.evaluate("window.scrollBy(0, 1200)")
+        # 카드 수가 늘어나면 진행 (상한 1200ms), 이후 렌더링이 잠잠해질 때까지 짧게 대기
+        try:
+            await page.wait_for_function(
+                "([sel, n]) => document.querySelectorAll(sel).length > n",
+                arg=[_CARD_SEL, n_seen], timeout=1200,
+            )
+        except Exception:
+            pass
+        left = 1200 - (time.perf_counter() - t_more) * 1000
+        if left > 0:
+            await _settle(page, int(left))
+        await collect()
+    return results[:limit], reached
+
+
+# ====== 크롤 세션 ======
+class CrawlSession:
+    """
+    브라우저 1회 기동 + 로그인된 컨텍스트 1개를 재사용하는 크롤 세션
+
+        async with CrawlSession(headless=True) as s:
+            items = await s.list(limit=10)
+            details = await s.details([it["url"] for it in items])
+
+    - 모든 페이지에 리소스 차단(_route) 적용 (context.route)
+    - 로그인은 세션 시작 시 1회, 작업이 끝날 때마다 storage_state 갱신
+    - 같은 세션의 작업은 순서대로 실행 (작업 내부에서는 페이지 풀로 동시 수집)
+    """
+
+    def __init__(self, *, headless: bool = True):
+        self.headless = headless
+        self._pw = None
+        self._browser = None
+        self._context = None
+        self._page = None
+        self._lock = asyncio.Lock()
+        self.stats = {
+            "launches": 0, "lists": 0, "frontier_stops": 0, "detail_batches": 0,
+            "detail_pages": 0, "cached_pages": 0, "html_pages": 0, "browser_pages": 0,
+        }
+
+    @property
+    def alive(self) -> bool:
+        return self._browser is not None and self._browser.is_connected()
+
+    async def start(self) -> "CrawlSession":
+        if self.alive:
+            return self
+        await self.close()
+        self._pw = await async_playwright().start()
+        self._browser = await self._pw.chromium.launch(headless=self.headless)
+        self._context = await self._browser.new_context(
             user_agent=user_agent(),
             storage_state=_STORAGE_FILE if Path(_STORAGE_FILE).exists() else None,
         )
-        page = await context.new_page()
-        await _ensure_logged_in(context, page)
+        await self._context.route("**/*", _route)
+        self._page = await self._context.new_page()
+        await _ensure_logged_in(self._context, self._page)
+        self.stats["launches"] += 1
+        return self
+
+    async def close(self) -> None:
+        for obj in (self._context, self._browser):
+            if obj is not None:
+                try:
+                    await obj.close()
+                except Exception as e:
+                    log.debug("crawl session close failed: %s", e)
+        if self._pw is not None:
+            try:
+                await self._pw.stop()
+            except Exception as e:
+                log.debug("playwright stop failed: %s", e)
+        self._pw = self._browser = self._context = self._page = None
 
-        await page.goto(url, wait_until="domcontentloaded", timeout=45000)
-        await page.wait_for_selector(_CARD_SEL, timeout=45000)
-        await page.wait_for_timeout(500)
-
-        async def collect():
-            nonlocal results, seen
-            cards = await page.locator(_CARD_SEL).all()
-            for c in cards:
-                href = await c.get_attribute("href")
-                if not href or href in seen:
-                    continue
-                seen.add(href)
-                results.append(await _extract_card(c))
-                if len(results) >= limit:
+    async def __aenter__(self) -> "CrawlSession":
+        # 브라우저는 실제로 필요한 작업에서 start() 로 기동 (HTML 경로만 쓰면 기동 안 함)
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def _save_state(self) -> None:
+        try:
+            await self._context.storage_state(path=_STORAGE_FILE)
+        except Exception as e:
+            log.debug("storage_state save failed: %s", e)
+
+    async def list(
+        self,
+        url: str = _FINDER_URL,
+        *,
+        limit: int = 50,
+        frontier: Optional[set] = None,
+    ) -> List[Card]:
+        """스타트업 카드 리스트 수집 (frontier: 이 URL 들 중 하나를 만나면 '더 보기' 중단)"""
+        async with self._lock:
+            await self.start()
+            items, reached = await _collect_cards(self._page, url, limit=limit, frontier=frontier)
+            self.stats["lists"] += 1
+            self.stats["frontier_stops"] += int(reached)
+            await self._save_state()
+            return items
+
+    async def iter_details(
+        self,
+        urls: Iterable[str],
+        *,
+        concurrency: Optional[int] = None,
+        buffer: Optional[int] = None,
+    ) -> AsyncIterator[Tuple[int, Detail]]:
+        """
+        상세 페이지를 완료되는 순서대로 (입력 index, Detail) 로 yield
+        - 캐시 적중 → HTML 파싱 → 브라우저 순으로 처리 (details() 와 동일 경로)
+        - 내부 큐 크기(buffer, 기본 2×concurrency)가 차면 수집 워커가 대기 → 소비 속도에 맞춰 배압
+        """
+        urls = [_ensure_all_tab(u) for u in urls]
+        n = _CONCURRENCY if concurrency is None else concurrency
+        q: asyncio.Queue = asyncio.Queue(maxsize=buffer or max(1, n) * 2)
+        done = object()
+
+        async def emit(i: int, d: Detail) -> None:
+            await q.put((i, d))
+
+        async def produce() -> None:
+            try:
+                await self._produce_details(urls, n, emit)
+            except Exception as e:
+                await q.put(e)
+            finally:
+                await q.put(done)
+
+        task = asyncio.ensure_future(produce())
+        try:
+            while True:
+                item = await q.get()
+                if item is done:
                     break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            if not task.done():
+                task.cancel()
+                try:
+                    await task
+                except BaseException:
+                    pass
+
+    async def _produce_details(self, urls: List[str], n: int, emit) -> None:
+        cache = get_crawl_cache()
+        todo = list(range(len(urls)))
+        if cache is not None and urls:
+            hit = cache.get_fresh(urls, version=EXTRACTION_VERSION)
+            todo = []
+            for i, u in enumerate(urls):
+                if u in hit:
+                    head, sections = split_marked_sections(hit[u])
+                    d: Detail = {"url": u, "full_text": join_sections(head, sections), "cached": True}
+                    if sections:
+                        d["sections"] = sections
+                    await emit(i, d)
+                else:
+                    todo.append(i)
+        self.stats["cached_pages"] += len(urls) - len(todo)
+
+        async def fetched(i: int, d: Detail) -> None:
+            if cache is not None and d.get("full_text") and not d.get("error"):
+                # 원문(제목 표식만 추가)을 저장 → 히트/미스가 같은 full_text 를 돌려줌 (정제는 structure_detail 에서)
+                cache.put_many([(d["url"], _marked_text(d))], version=EXTRACTION_VERSION)
+            await emit(i, d)
+
+        got_html: set = set()
+        if _HTML_FAST and todo:
+            from tools.nextunicorn_html import fetch_details_html
+
+            async def html_done(j: int, d: Detail) -> None:
+                got_html.add(todo[j])
+                await fetched(todo[j], d)
+
+            await fetch_details_html([urls[i] for i in todo], concurrency=n, on_result=html_done)
+        rest = [i for i in todo if i not in got_html]
+        self.stats["html_pages"] += len(got_html)
+
+        async with self._lock:
+            if rest:
+                await self.start()
+
+                async def browser_done(j: int, d: Detail) -> None:
+                    await fetched(rest[j], d)
+
+                await _fetch_details(
+                    self._context, [urls[i] for i in rest],
+                    concurrency=n,
+                    first_page=self._page,
+                    on_result=browser_done,
+                )
+                await self._save_state()
+            self.stats["detail_batches"] += 1
+            self.stats["detail_pages"] += len(urls)
+            self.stats["browser_pages"] += len(rest)
+        log.info("nextunicorn details: cached=%d fetched=%d (html=%d, browser=%d)",
+                 len(urls) - len(todo), len(todo), len(got_html), len(rest))
+
+    async def details(self, urls: Iterable[str], *, concurrency: Optional[int] = None) -> List[Detail]:
+        """
+        상세 페이지 본문 수집 (입력 순서 유지, 실패는 {"url", "error"})
+        - 크롤 캐시(CRAWL_CACHE=1): TTL 이내 항목은 페이지를 열지 않고 캐시 본문 반환 ({"cached": True},
+          full_text/sections 는 새로 수집했을 때와 동일)
+        - NEXTUNICORN_HTML_FAST=1(기본 0): HTTP 로 받은 HTML 을 파싱해 충분하면 그대로 사용,
+          본문이 없거나 '펼쳐보기' 버튼이 남은 페이지만 브라우저로 수집
+        """
+        urls = list(urls)
+        out: List[Optional[Detail]] = [None] * len(urls)
+        async for i, d in self.iter_details(urls, concurrency=concurrency, buffer=max(1, len(urls))):
+            out[i] = d
+        return [d if d is not None else {"url": _ensure_all_tab(urls[i]), "error": "not fetched"}
+                for i, d in enumerate(out)]
+
+    async def list_and_details(
+        self,
+        *,
+        limit: int = 2,
+        concurrency: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        items = await self.list(limit=limit)
+        details = await self.details([it["url"] for it in items if it.get("url")], concurrency=concurrency)
+        return {"items": items, "details": details}
+
+
+# ====== 프로세스 공용 세션 (동기 호출용) ======
+class _LoopThread:
+    """
+    공용 CrawlSession 전용 이벤트 루프 스레드.
+    asyncio.run 은 호출마다 루프를 새로 만들어 Playwright 객체를 재사용할 수 없으므로,
+    루프 하나를 데몬 스레드에 띄워두고 동기 코드에서 코루틴을 제출한다.
+    """
 
-        await collect()
-        while len(results) < limit:
-            btn = page.locator(_MORE_BTN)
-            if await btn.count() == 0 or not await btn.first.is_visible():
-                break
+    def __init__(self):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="crawl-loop", daemon=True)
+        self._thread.start()
+
+    def run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def stop(self) -> None:
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+
+_RUNNER: Optional[_LoopThread] = None
+_SESSION: Optional[CrawlSession] = None
+_RUNNER_LOCK = threading.Lock()
+
+
+def _runner() -> _LoopThread:
+    global _RUNNER
+    if _RUNNER is None:
+        with _RUNNER_LOCK:
+            if _RUNNER is None:
+                _RUNNER = _LoopThread()
+    return _RUNNER
+
+
+async def _shared_session(headless: bool) -> CrawlSession:
+    """공용 세션 (headless 변경 시 교체, 브라우저는 작업 시 start() 에서 필요하면 재기동)"""
+    global _SESSION
+    if _SESSION is not None and _SESSION.headless != headless:
+        await _SESSION.close()
+        _SESSION = None
+    if _SESSION is None:
+        _SESSION = CrawlSession(headless=headless)
+    return _SESSION
+
+
+def run_crawl(fn, *, headless: bool = True):
+    """
+    동기 코드에서 공용 세션으로 작업 실행: run_crawl(lambda s: s.list(limit=10))
+    - 파이프라인을 여러 번 돌려도 브라우저는 프로세스당 1회만 기동
+    """
+    async def _go():
+        return await fn(await _shared_session(headless))
+    return _runner().run(_go())
+
+
+def crawl_session_stats() -> Dict[str, Any]:
+    s: Dict[str, Any] = dict(_SESSION.stats) if _SESSION is not None else {}
+    s["readiness"] = readiness_stats()
+    s["crawl_cache"] = crawl_cache_stats()
+    return s
+
+
+def close_crawl_session() -> None:
+    """공용 세션/루프 종료 (프로세스 종료 시 자동 호출)"""
+    global _RUNNER, _SESSION
+    with _RUNNER_LOCK:
+        if _RUNNER is None:
+            return
+        if _SESSION is not None:
             try:
-                await btn.first.click(timeout=4000)
-            except Exception:
-                await page.evaluate("window.scrollBy(0, 1200)")
-            await page.wait_for_timeout(1200)
-            await collect()
+                _RUNNER.run(_SESSION.close())
+            except Exception as e:
+                log.debug("crawl session close failed: %s", e)
+            _SESSION = None
+        _RUNNER.stop()
+        _RUNNER = None
+
 
-        await context.close()
-        await browser.close()
-    return results[:limit]
+atexit.register(close_crawl_session)
+
+
+# ====== 공개 API (기존) ======
+async def nextunicorn_list(
+    url: str = _FINDER_URL,
+    *,
+    headless: bool = True,
+    limit: int = 50,
+    frontier: Optional[set] = None,
+) -> List[Card]:
+    """스타트업 카드 리스트 수집 (1회용 세션, frontier 는 load_watermark() 결과)"""
+    async with CrawlSession(headless=headless) as s:
+        return await s.list(url, limit=limit, frontier=frontier)
 
 
 async def nextunicorn_company_details_batch(
     urls: Iterable[str],
     *,
     headless: bool = True,
+    concurrency: Optional[int] = None,
 ) -> List[Detail]:
-    """상세 페이지 본문 수집 배치"""
-    out: List[Detail] = []
-    urls = [_ensure_all_tab(u) for u in urls]
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=headless)
-        context = await browser.new_context(
-            user_agent=user_agent(),
-            storage_state=_STORAGE_FILE if Path(_STORAGE_FILE).exists() else None,
-        )
-        page = await context.new_page()
-        await _ensure_logged_in(context, page)
-
-        for u in urls:
-            try:
-                await page.goto(u, wait_until="domcontentloaded", timeout=45000)
-                text = await _grab_full_text(page)
-                out.append({"url": u, "full_text": text})
-            except Exception as e:
-                out.append({"url": u, "error": str(e)})
-
-        await context.close()
-        await browser.close()
-    return out
+    """
+    상세 페이지 본문 수집 배치 (1회용 세션)
+    - concurrency: 한 컨텍스트 안에서 동시에 여는 페이지 수 (기본 NEXTUNICORN_CONCURRENCY, 1 = 순차)
+    - 로그인은 첫 페이지에서 1회만 수행하고 나머지 페이지는 같은 세션 쿠키를 공유
+    - 반환 순서 = 입력 순서, 실패 URL 은 {"url", "error"}
+    """
+    async with CrawlSession(headless=headless) as s:
+        return await s.details(urls, concurrency=concurrency)
 
 
 def summarize_company_text(full_text: str) -> Structured:
@@ -385,7 +1050,7 @@ def summarize_company_text(full_text: str) -> Structured:
     info      = _section(t, "회사 정보", [])
 
     def polish(s: str) -> str:
-        return _dedupe_lines(_compact(s))
+        return dedupe_lines(s)
 
     return {
         "company": polish(head),
@@ -398,11 +1063,27 @@ def summarize_company_text(full_text: str) -> Structured:
     }
 
 
+def structure_detail(detail: Detail) -> Structured:
+    """
+    Detail → Structured. 페이지 안에서 나눈 섹션(detail["sections"])이 있으면 그대로 정리만 하고,
+    없으면(섹션 제목을 못 찾은 페이지 등) summarize_company_text 로 본문에서 다시 분할
+    """
+    sections = detail.get("sections")
+    if not sections:
+        return summarize_company_text(detail.get("full_text") or "")
+    t = _clean_text(detail.get("full_text") or "")
+    out: Dict[str, str] = {"company": dedupe_lines("\n".join([l for l in t.splitlines()[:10] if l.strip()]))}
+    for _, key in _SECTIONS:
+        out[key] = dedupe_lines(_clean_text(sections.get(key, "")))
+    return out  # type: ignore[return-value]
+
+
 # ====== 공개 API (신규): 한 세션으로 리스트+디테일 ======
 async def nextunicorn_list_and_details(
     *,
     limit: int = 2,
     headless: bool = True,
+    concurrency: Optional[int] = None,
 ) -> Dict[str, Any]:
     """
     한 번의 브라우저/컨텍스트로
@@ -410,86 +1091,71 @@ async def nextunicorn_list_and_details(
     - 리소스 차단(이미지/폰트/미디어/애널리틱스)로 속도 개선.
     - 반환: {"items":[Card...], "details":[Detail...]}
     """
-    items: List[Card] = []
-    details: List[Detail] = []
-
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=headless)
-        context = await browser.new_context(
-            user_agent=user_agent(),
-            storage_state=_STORAGE_FILE if Path(_STORAGE_FILE).exists() else None,
-        )
-
-        # 리소스 차단으로 네트워크/렌더링 비용 절감
-        async def _route(route):
-            req = route.request
-            url = req.url
-            rtype = req.resource_type
-            if rtype in {"image", "media", "font"} or any(
-                k in url for k in [
-                    "google-analytics", "gtag", "hotjar", "segment",
-                    "facebook", "doubleclick", "googletagmanager"
-                ]
-            ):
-                return await route.abort()
-            return await route.continue_()
-
-        await context.route("**/*", _route)
-
-        page = await context.new_page()
-        await _ensure_logged_in(context, page)
-
-        # 1) 리스트
-        await page.goto("https://www.nextunicorn.kr/finder?tab=startup&sb=70", wait_until="domcontentloaded", timeout=45000)
-        await page.wait_for_selector(_CARD_SEL, timeout=45000)
-        await page.wait_for_timeout(400)
-
-        seen = set()
-        async def collect():
-            nonlocal items, seen
-            cards = await page.locator(_CARD_SEL).all()
-            for c in cards:
-                href = await c.get_attribute("href")
-                if not href or href in seen:
-                    continue
-                seen.add(href)
-                items.append(await _extract_card(c))
-                if len(items) >= limit:
-                    break
-
-        await collect()
-        while len(items) < limit:
-            btn = page.locator(_MORE_BTN)
-            if await btn.count() == 0 or not await btn.first.is_visible():
-                break
-            try:
-                await btn.first.click(timeout=3500)
-            except Exception:
-                await page.evaluate("window.scrollBy(0, 1200)")
-            await page.wait_for_timeout(900)
-            await collect()
-
-        # 2) 디테일 (같은 페이지/세션 재사용)
-        urls = [_ensure_all_tab(it["url"]) for it in items if it.get("url")]
-        for u in urls:
-            try:
-                await page.goto(u, wait_until="domcontentloaded", timeout=45000)
-                txt = await _grab_full_text(page)
-                details.append({"url": u, "full_text": txt})
-            except Exception as e:
-                details.append({"url": u, "error": str(e)})
-
-        await context.close()
-        await browser.close()
-
-    return {"items": items, "details": details}
+    async with CrawlSession(headless=headless) as s:
+        return await s.list_and_details(limit=limit, concurrency=concurrency)
 
 
 def nextunicorn_list_and_details_sync(
     *,
     limit: int = 2,
     headless: bool = True,
+    concurrency: Optional[int] = None,
 ) -> Dict[str, Any]:
-    """동기 환경에서 바로 호출 가능한 래퍼"""
-    import asyncio
-    return asyncio.run(nextunicorn_list_and_details(limit=limit, headless=headless))
+    """동기 환경에서 바로 호출 가능한 래퍼 (프로세스 공용 세션 재사용)"""
+    return run_crawl(lambda s: s.list_and_details(limit=limit, concurrency=concurrency), headless=headless)
+
+
+# ====== 벤치마크: 고정 대기 vs 이벤트 기반 준비 감지 (녹화 페이지) ======
+# python -m tools.nextunicorn record <url> ...        # 상세 페이지 HTML 을 outputs/pages/ 에 저장
+# python -m tools.nextunicorn bench [html ...]        # 기본: outputs/*.html, outputs/pages/*.html
+if __name__ == "__main__":
+    import glob
+    import hashlib
+    import sys
+
+    _PAGES_DIR = Path("outputs/pages")
+
+    async def _record(urls: List[str]) -> None:
+        _PAGES_DIR.mkdir(parents=True, exist_ok=True)
+        async with CrawlSession(headless=True) as s:
+            await s.start()
+            for u in urls:
+                page = s._page
+                _track(page)
+                await page.goto(_ensure_all_tab(u), wait_until="domcontentloaded", timeout=45000)
+                await _settle(page, 3000)
+                name = hashlib.sha1(u.encode()).hexdigest()[:12] + ".html"
+                (_PAGES_DIR / name).write_text(await page.content(), encoding="utf-8")
+                print("recorded", u, "→", _PAGES_DIR / name)
+
+    async def _bench(files: List[str]) -> None:
+        global _FIXED_WAITS
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            page = await browser.new_page()
+            _track(page)
+            print(f"{'page':<40} {'fixed(ms)':>10} {'event(ms)':>10} {'saved(ms)':>10} {'sections':>8} same_text")
+            tot = [0.0, 0.0]
+            for f in files:
+                row = []
+                for fixed in (True, False):
+                    _FIXED_WAITS = fixed
+                    await page.goto(Path(f).resolve().as_uri(), wait_until="domcontentloaded")
+                    t0 = time.perf_counter()
+                    d = await _extract_page(page)
+                    row.append(((time.perf_counter() - t0) * 1000, d["full_text"], len(d.get("sections") or {})))
+                tot[0] += row[0][0]
+                tot[1] += row[1][0]
+                print(f"{Path(f).name[:40]:<40} {row[0][0]:10.0f} {row[1][0]:10.0f} "
+                      f"{row[0][0] - row[1][0]:10.0f} {row[1][2]:8d} {row[0][1] == row[1][1]}")
+            if files:
+                n = len(files)
+                print(f"{'mean':<40} {tot[0] / n:10.0f} {tot[1] / n:10.0f} {(tot[0] - tot[1]) / n:10.0f}")
+            await browser.close()
+
+    cmd, args = (sys.argv[1], sys.argv[2:]) if len(sys.argv) > 1 else ("bench", [])
+    if cmd == "record":
+        asyncio.run(_record(args))
+    else:
+        files = args or sorted(glob.glob("outputs/*.html") + glob.glob(str(_PAGES_DIR / "*.html")))
+        asyncio.run(_bench(files))
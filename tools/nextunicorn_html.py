@@ -0,0 +1,281 @@
+# tools/nextunicorn_html.py
+"""
+NextUnicorn HTML 파싱 경로 (브라우저 없이)
+- 서버 렌더링(window.__ssr) HTML 을 httpx 로 받아 BeautifulSoup 으로 본문/카드 추출
+- 로그인 쿠키는 Playwright storage_state(nextunicorn_state.json) 를 그대로 재사용
+- 본문이 부족하거나 '펼쳐보기' 버튼이 남아 있으면(접힌 섹션) None → 호출측이 Playwright 로 재수집
+- 공개 함수:
+    * parse_cards(html)              : finder 리스트 HTML → Card 목록
+    * parse_detail(html, url)        : 상세 HTML → (Detail | None, 사유)
+    * parse_detail_sections(html)    : 상세 HTML → Structured 섹션 (structure_detail)
+    * fetch_details_html(urls, ...)  : 상세 URL 배치 → {index: Detail} (성공한 것만)
+
+픽스처 확인:
+    python -m tools.nextunicorn_html [html ...]   # 기본: outputs/nextunicorn_debug.html, outputs/pages/*.html
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from bs4 import BeautifulSoup, NavigableString, Tag
+
+from tools.nextunicorn import (
+    Card,
+    Detail,
+    Structured,
+    _CARD_SEL,
+    _EXPAND_BUTTONS,
+    _FOOTER_NEEDLE,
+    _MORE_BTN,
+    _SECTION_MARK,
+    _SECTIONS,
+    _STORAGE_FILE,
+    _SUMMARY_SEL,
+    _TITLE_SEL,
+    _HostGate,
+    _HOST_INFLIGHT,
+    _DELAY_MS,
+    _sanitize_text,
+    join_sections,
+    split_marked_sections,
+    structure_detail,
+)
+from tools.utils import user_agent
+
+log = logging.getLogger(__name__)
+
+_BASE = "https://www.nextunicorn.kr"
+try:
+    import lxml  # noqa: F401
+    _PARSER = "lxml"
+except Exception:  # pragma: no cover
+    _PARSER = "html.parser"
+
+# 파싱 전 제거 (리스트 페이지 기준 HTML 의 2/3 이상이 스크립트)
+_STRIP_RE = re.compile(r"<(script|style|noscript|svg|template)\b[^>]*>.*?</\1\s*>", re.S | re.I)
+_WS = re.compile(r"[ \t\r\f\v\xa0]+")
+_BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "dd", "div", "dl", "dt", "fieldset",
+    "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6",
+    "header", "hr", "li", "main", "nav", "ol", "p", "pre", "section", "table",
+    "tr", "ul", "button",
+}
+_SECTION_HEADS = tuple(t for t, _ in _SECTIONS)
+_MIN_SECTIONS = 2     # 섹션 제목이 이 개수 이상 보여야 본문이 렌더링된 것으로 판단
+_MIN_TEXT_LEN = 200
+
+
+def _soup(html: str) -> BeautifulSoup:
+    return BeautifulSoup(_STRIP_RE.sub("", html or ""), _PARSER)
+
+
+def _inner_text(node: Tag) -> str:
+    """innerText 근사: 블록 요소 경계에서 줄바꿈, 인라인은 이어 붙임"""
+    parts: List[str] = []
+
+    def walk(n) -> None:
+        for c in n.children:
+            if isinstance(c, NavigableString):
+                if type(c) is NavigableString:  # Comment/Doctype 등 제외
+                    parts.append(_WS.sub(" ", str(c)))
+            elif isinstance(c, Tag):
+                if c.name == "br":
+                    parts.append("\n")
+                    continue
+                block = c.name in _BLOCK_TAGS
+                if block:
+                    parts.append("\n")
+                walk(c)
+                if block:
+                    parts.append("\n")
+
+    walk(node)
+    lines = (l.strip() for l in "".join(parts).split("\n"))
+    return "\n".join(l for l in lines if l)
+
+
+# ====== 리스트 ======
+def parse_cards(html: str) -> List[Card]:
+    """finder 리스트 HTML 에서 카드(title/summary/url) 추출 (중복 href 제거, 문서 순서)"""
+    soup = _soup(html)
+    out: List[Card] = []
+    seen = set()
+    for a in soup.select(_CARD_SEL):
+        href = a.get("href")
+        if not href or href in seen:
+            continue
+        seen.add(href)
+        t = a.select_one(_TITLE_SEL)
+        s = a.select_one(_SUMMARY_SEL)
+        out.append({
+            "title": _sanitize_text(t.get_text()) if t else "",
+            "summary": _sanitize_text(s.get_text()) if s else "",
+            "url": href if href.startswith("http") else f"{_BASE}{href}",
+        })
+    return out
+
+
+def has_more_button(html: str) -> bool:
+    return _soup(html).select_one(_MORE_BTN) is not None
+
+
+# ====== 상세 ======
+def _expand_buttons(soup: BeautifulSoup) -> List[str]:
+    found = []
+    for b in soup.find_all("button"):
+        t = " ".join(b.get_text(" ").split())
+        if t in _EXPAND_BUTTONS:
+            found.append(t)
+    return found
+
+
+def _strip_chrome(soup: BeautifulSoup) -> None:
+    """_grab_full_text 와 동일하게 헤더/푸터/내비/사이드 + 회사 푸터 블록 제거"""
+    for el in soup.select("header, footer, nav, aside"):
+        el.decompose()
+    hit = soup.find(string=lambda s: bool(s) and _FOOTER_NEEDLE in s)
+    if hit is not None:
+        box = hit.find_parent(["footer", "section", "div"])
+        if box is not None:
+            box.decompose()
+
+
+def _mark_section_titles(body: Tag) -> None:
+    """섹션 제목 텍스트 노드에 표식 (링크/버튼/탭 안은 제외, _JS_EXTRACT_SECTIONS 와 같은 규칙)"""
+    for s in body.find_all(string=True):
+        if type(s) is not NavigableString or s.strip() not in _SECTION_HEADS:
+            continue
+        if s.find_parent(["a", "button"]) is not None or s.find_parent(attrs={"role": ["tab", "tablist"]}) is not None:
+            continue
+        s.replace_with(_SECTION_MARK + s.strip())
+
+
+def parse_detail(html: str, url: str = "") -> Tuple[Optional[Detail], str]:
+    """
+    상세 HTML → Detail. 브라우저 없이 쓸 수 없으면 (None, 사유):
+    - "login"   : 로그인 페이지로 리다이렉트됨
+    - "expand"  : 펼쳐야 보이는 섹션이 남아 있음
+    - "content" : 섹션 제목/본문이 부족 (클라이언트 렌더링 전)
+    """
+    soup = _soup(html)
+    if soup.select_one("form input[name='password']") is not None:
+        return None, "login"
+    body = soup.body or soup
+    _strip_chrome(soup)
+    buttons = _expand_buttons(soup)
+    if buttons:
+        return None, "expand"
+    _mark_section_titles(body)
+    head, sections = split_marked_sections(_inner_text(body))
+    text = join_sections(head, sections)
+    heads = sum(1 for h in _SECTION_HEADS if h in text)
+    if heads < _MIN_SECTIONS or len(text) < _MIN_TEXT_LEN:
+        return None, "content"
+    d: Detail = {"url": url, "full_text": text}
+    if sections:
+        d["sections"] = sections
+    return d, "ok"
+
+
+def parse_detail_sections(html: str) -> Optional[Structured]:
+    d, _ = parse_detail(html)
+    return structure_detail(d) if d else None
+
+
+# ====== HTTP 수집 ======
+def _load_cookies(path: str = _STORAGE_FILE) -> Dict[str, str]:
+    """Playwright storage_state 의 nextunicorn 쿠키 → {name: value}"""
+    try:
+        state = json.loads(Path(path).read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    return {
+        c["name"]: c["value"]
+        for c in state.get("cookies", [])
+        if "nextunicorn" in (c.get("domain") or "")
+    }
+
+
+async def fetch_details_html(
+    urls: List[str],
+    *,
+    concurrency: int = 4,
+    timeout: float = 15.0,
+    on_result=None,
+) -> Dict[int, Detail]:
+    """
+    상세 URL 들을 HTTP 로 받아 파싱. 파싱으로 충분한 것만 {입력 index: Detail} 로 반환
+    (나머지는 호출측이 브라우저로 수집). 네트워크 오류도 브라우저 경로로 넘긴다.
+    on_result(index, detail) 코루틴이 주어지면 파싱 성공 즉시 호출.
+    """
+    import httpx
+
+    if not urls:
+        return {}
+    gate = _HostGate(_HOST_INFLIGHT, _DELAY_MS)
+    sem = asyncio.Semaphore(max(1, concurrency))
+    out: Dict[int, Detail] = {}
+    reasons: Dict[str, int] = {}
+
+    async with httpx.AsyncClient(
+        headers={"User-Agent": user_agent(), "Accept-Language": "ko-KR,ko;q=0.9"},
+        cookies=_load_cookies(),
+        follow_redirects=True,
+        timeout=timeout,
+    ) as client:
+        async def one(i: int, u: str) -> None:
+            async with sem, gate.slot(u):
+                await gate.jitter()
+                try:
+                    r = await client.get(u)
+                except Exception as e:
+                    reasons["http"] = reasons.get("http", 0) + 1
+                    log.debug("html fetch failed %s: %s", u, e)
+                    return
+            if r.status_code != 200 or "/login" in r.url.path:
+                reasons["status"] = reasons.get("status", 0) + 1
+                return
+            d, why = parse_detail(r.text, u)
+            reasons[why] = reasons.get(why, 0) + 1
+            if d is not None:
+                out[i] = d
+                if on_result is not None:
+                    await on_result(i, d)
+
+        await asyncio.gather(*(one(i, u) for i, u in enumerate(urls)))
+
+    log.info("nextunicorn html fast path: %d/%d parsed %s", len(out), len(urls), reasons)
+    return out
+
+
+# ====== 픽스처 확인 ======
+if __name__ == "__main__":
+    import glob
+    import sys
+    import time
+
+    files = sys.argv[1:] or ["outputs/nextunicorn_debug.html"] + sorted(glob.glob("outputs/pages/*.html"))
+    print(f"parser={_PARSER}")
+    for f in files:
+        html = Path(f).read_text(encoding="utf-8")
+        t0 = time.perf_counter()
+        cards = parse_cards(html)
+        if cards:
+            ms = (time.perf_counter() - t0) * 1000
+            print(f"[list  ] {f}: cards={len(cards)} more_button={has_more_button(html)} parse={ms:.1f}ms")
+            for c in cards[:3]:
+                assert c["title"] and c["url"].startswith(_BASE + "/company/"), c
+                print("         ", c["title"], "|", c["summary"][:40], "|", c["url"])
+            continue
+        t0 = time.perf_counter()
+        d, why = parse_detail(html, f)
+        ms = (time.perf_counter() - t0) * 1000
+        print(f"[detail] {f}: {why} parse={ms:.1f}ms")
+        if d:
+            sec = structure_detail(d)
+            print("          sections:", {k: len(v) for k, v in sec.items()}, "in-page split:", sorted(d.get("sections") or {}))
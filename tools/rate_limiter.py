@@ -0,0 +1,441 @@
+# tools/rate_limiter.py
+"""
+OpenAI 호출 전역 속도 제한 (프로세스 공용)
+- 분당 요청(RPM) / 분당 토큰(TPM) 토큰 버킷: 요청 본문으로 입력 토큰 + 예상 출력 토큰을 추정해 차감
+- AIMD 동시성: 성공하면 상한 +1/상한 (가산), 429 또는 지연 급증(EWMA 대비 LLM_LATENCY_SPIKE 배)이면 ×0.5 / ×0.7 (승산)
+- 408/409/429/5xx·연결 오류·타임아웃은 tools/utils.retry_policy(tenacity) 로 재시도 (SDK 기본 재시도 대상과 동일),
+  Retry-After 는 버킷 전체를 그만큼 멈춤
+- httpx 전송 계층(RateLimitedTransport / AsyncRateLimitedTransport)으로 끼워 넣어
+  tools/llm_provider 의 공용 클라이언트를 쓰는 모든 LLM 호출이 자동으로 통과 (OpenAI SDK 자체 재시도는 끔)
+- 설정: LLM_RPM, LLM_TPM, LLM_MAX_INFLIGHT, LLM_MIN_INFLIGHT, LLM_LATENCY_SPIKE, LLM_EST_COMPLETION
+
+429 를 돌려주는 가짜 서버로 확인:
+    python -m tools.rate_limiter
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+from tenacity import AsyncRetrying, Retrying, retry_if_exception_type
+
+from tools.token_budget import count_tokens
+from tools.utils import retry_policy
+
+log = logging.getLogger(__name__)
+
+LLM_RPM = float(os.getenv("LLM_RPM", "500"))
+LLM_TPM = float(os.getenv("LLM_TPM", "200000"))
+LLM_MAX_INFLIGHT = int(os.getenv("LLM_MAX_INFLIGHT", "16"))
+LLM_MIN_INFLIGHT = int(os.getenv("LLM_MIN_INFLIGHT", "1"))
+LLM_LATENCY_SPIKE = float(os.getenv("LLM_LATENCY_SPIKE", "3.0"))
+LLM_EST_COMPLETION = int(os.getenv("LLM_EST_COMPLETION", "512"))
+
+_RETRY_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+class _RetryableStatus(Exception):
+    def __init__(self, response: httpx.Response):
+        super().__init__(f"HTTP {response.status_code}")
+        self.response = response
+
+
+class TokenBucket:
+    """분당 rate 만큼 채워지는 버킷. 부족하면 예약 후 대기 시간만큼 기다림 (잔량이 음수가 될 수 있음)"""
+
+    def __init__(self, per_minute: float, *, capacity: Optional[float] = None):
+        self.rate = max(per_minute, 1e-6) / 60.0
+        self.capacity = capacity if capacity is not None else max(per_minute, 1.0)
+        self._tokens = self.capacity
+        self._ts = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """amount 만큼 차감하고 기다려야 할 초를 반환"""
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._ts) * self.rate)
+            self._ts = now
+            self._tokens -= amount
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    def pause(self, seconds: float) -> None:
+        """Retry-After: 이후 예약이 모두 seconds 동안 대기"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+class AIMDLimiter:
+    """가산 증가 / 승산 감소 동시성 상한 (동기 스레드 + asyncio 공용)"""
+
+    def __init__(self, *, initial: int, lo: int, hi: int, spike: float = LLM_LATENCY_SPIKE):
+        self.limit = float(max(lo, min(hi, initial)))
+        self.lo, self.hi = lo, hi
+        self.spike = spike
+        self.inflight = 0
+        self._ewma: Optional[float] = None
+        self._cond = threading.Condition()
+        self.stats = {"increase": 0, "decrease": 0}
+
+    def _try_enter(self) -> bool:
+        if self.inflight < int(self.limit):
+            self.inflight += 1
+            return True
+        return False
+
+    def acquire(self) -> None:
+        with self._cond:
+            while not self._try_enter():
+                self._cond.wait()
+
+    async def aacquire(self) -> None:
+        while True:
+            with self._cond:
+                if self._try_enter():
+                    return
+            await asyncio.sleep(0.01)
+
+    def release(self, *, latency: Optional[float] = None, throttled: bool = False) -> None:
+        with self._cond:
+            self.inflight -= 1
+            if throttled:
+                self._decrease(0.5)
+            elif latency is not None:
+                if self._ewma is not None and latency > self.spike * self._ewma:
+                    self._decrease(0.7)
+                else:
+                    self.limit = min(self.hi, self.limit + 1.0 / self.limit)
+                    self.stats["increase"] += 1
+                self._ewma = latency if self._ewma is None else 0.8 * self._ewma + 0.2 * latency
+            self._cond.notify_all()
+
+    def _decrease(self, factor: float) -> None:
+        self.limit = max(float(self.lo), self.limit * factor)
+        self.stats["decrease"] += 1
+
+
+def estimate_request_tokens(request: httpx.Request) -> int:
+    """chat/completions 본문 → 입력 토큰 + 예상 출력 토큰"""
+    try:
+        body = json.loads(request.content or b"{}")
+    except Exception:
+        return LLM_EST_COMPLETION
+    texts = []
+    for m in body.get("messages") or []:
+        c = m.get("content")
+        if isinstance(c, str):
+            texts.append(c)
+        elif isinstance(c, list):
+            texts.extend(p.get("text", "") for p in c if isinstance(p, dict))
+    if body.get("tools") or body.get("functions"):
+        texts.append(json.dumps(body.get("tools") or body.get("functions"), ensure_ascii=False))
+    out = body.get("max_completion_tokens") or body.get("max_tokens") or LLM_EST_COMPLETION
+    return count_tokens("\n".join(texts)) + 4 * len(body.get("messages") or []) + int(out)
+
+
+class RateLimiter:
+    """RPM/TPM 버킷 + AIMD 동시성 + 재시도 통계"""
+
+    def __init__(
+        self,
+        *,
+        rpm: float = LLM_RPM,
+        tpm: float = LLM_TPM,
+        max_inflight: int = LLM_MAX_INFLIGHT,
+        min_inflight: int = LLM_MIN_INFLIGHT,
+    ):
+        self.rpm = TokenBucket(rpm)
+        self.tpm = TokenBucket(tpm)
+        self.aimd = AIMDLimiter(initial=max_inflight, lo=min_inflight, hi=max_inflight)
+        # throttled_wall_s: 1건 이상 대기 중이던 실제 경과 시간 / throttled_sum_s: 요청별 대기 시간 합(동시 대기 중복 포함)
+        self.stats: Dict[str, float] = {
+            "requests": 0, "throttled_wall_s": 0.0, "throttled_sum_s": 0.0,
+            "status_429": 0, "retries": 0, "errors": 0,
+        }
+        self._waiting = 0
+        self._wait_since = 0.0
+        self._wait_lock = threading.Lock()
+
+    def _wait_s(self, request: httpx.Request) -> float:
+        self.stats["requests"] += 1
+        return max(self.rpm.reserve(1), self.tpm.reserve(estimate_request_tokens(request)))
+
+    def _throttle_begin(self, wait: float) -> None:
+        with self._wait_lock:
+            self.stats["throttled_sum_s"] += wait
+            if self._waiting == 0:
+                self._wait_since = time.monotonic()
+            self._waiting += 1
+
+    def _throttle_end(self) -> None:
+        with self._wait_lock:
+            self._waiting -= 1
+            if self._waiting == 0:
+                self.stats["throttled_wall_s"] += time.monotonic() - self._wait_since
+
+    def _on_status(self, response: httpx.Response) -> None:
+        if response.status_code == 429:
+            self.stats["status_429"] += 1
+            after = response.headers.get("retry-after")
+            try:
+                if after:
+                    self.rpm.pause(float(after))
+            except ValueError:
+                pass
+
+    def snapshot(self) -> Dict[str, Any]:
+        s: Dict[str, Any] = dict(self.stats)
+        s["throttled_wall_s"] = round(s["throttled_wall_s"], 3)
+        s["throttled_sum_s"] = round(s["throttled_sum_s"], 3)
+        s["concurrency_limit"] = round(self.aimd.limit, 2)
+        s["inflight"] = self.aimd.inflight
+        s.update(self.aimd.stats)
+        return s
+
+
+def _retrying_kwargs() -> Dict[str, Any]:
+    return dict(
+        retry_policy,
+        retry=retry_if_exception_type(
+            (_RetryableStatus, httpx.ConnectError, httpx.RemoteProtocolError, httpx.TimeoutException)
+        ),
+    )
+
+
+class _ReleasingStream(httpx.SyncByteStream):
+    """응답 본문(스트리밍 포함)을 다 읽고 닫을 때 동시성 슬롯 반환 + 지연 기록"""
+
+    def __init__(self, stream, done):
+        self._stream, self._done = stream, done
+
+    def __iter__(self):
+        yield from self._stream
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            self._done()
+
+
+class _AsyncReleasingStream(httpx.AsyncByteStream):
+    def __init__(self, stream, done):
+        self._stream, self._done = stream, done
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._done()
+
+
+class RateLimitedTransport(httpx.BaseTransport):
+    def __init__(self, limiter: "RateLimiter", inner: httpx.BaseTransport):
+        self._limiter, self._inner = limiter, inner
+
+    def _send_once(self, request: httpx.Request) -> httpx.Response:
+        lim = self._limiter
+        wait = lim._wait_s(request)
+        if wait > 0:
+            lim._throttle_begin(wait)
+            try:
+                time.sleep(wait)
+            finally:
+                lim._throttle_end()
+        lim.aimd.acquire()
+        t0 = time.monotonic()
+        try:
+            resp = self._inner.handle_request(request)
+        except Exception:
+            lim.aimd.release()
+            lim.stats["errors"] += 1
+            raise
+        if resp.status_code in _RETRY_STATUS:
+            resp.read()
+            resp.close()
+            lim.aimd.release(throttled=resp.status_code == 429)
+            lim._on_status(resp)
+            raise _RetryableStatus(resp)
+        done = lambda: lim.aimd.release(latency=time.monotonic() - t0)
+        return httpx.Response(
+            resp.status_code, headers=resp.headers, stream=_ReleasingStream(resp.stream, done),
+            extensions=resp.extensions, request=request,
+        )
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        try:
+            for att in Retrying(**_retrying_kwargs()):
+                with att:
+                    attempt += 1
+                    if attempt > 1:
+                        self._limiter.stats["retries"] += 1
+                    return self._send_once(request)
+        except _RetryableStatus as e:
+            # 재시도 소진: 마지막 응답을 그대로 돌려줘 SDK 가 RateLimitError 등으로 변환
+            return httpx.Response(e.response.status_code, headers=e.response.headers,
+                                  content=e.response.content, request=request)
+        raise RuntimeError("unreachable")
+
+    def close(self) -> None:
+        self._inner.close()
+
+
+class AsyncRateLimitedTransport(httpx.AsyncBaseTransport):
+    def __init__(self, limiter: "RateLimiter", inner: httpx.AsyncBaseTransport):
+        self._limiter, self._inner = limiter, inner
+
+    async def _send_once(self, request: httpx.Request) -> httpx.Response:
+        lim = self._limiter
+        wait = lim._wait_s(request)
+        if wait > 0:
+            lim._throttle_begin(wait)
+            try:
+                await asyncio.sleep(wait)
+            finally:
+                lim._throttle_end()
+        await lim.aimd.aacquire()
+        t0 = time.monotonic()
+        try:
+            resp = await self._inner.handle_async_request(request)
+        except BaseException:
+            lim.aimd.release()
+            lim.stats["errors"] += 1
+            raise
+        if resp.status_code in _RETRY_STATUS:
+            await resp.aread()
+            await resp.aclose()
+            lim.aimd.release(throttled=resp.status_code == 429)
+            lim._on_status(resp)
+            raise _RetryableStatus(resp)
+        done = lambda: lim.aimd.release(latency=time.monotonic() - t0)
+        return httpx.Response(
+            resp.status_code, headers=resp.headers, stream=_AsyncReleasingStream(resp.stream, done),
+            extensions=resp.extensions, request=request,
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        try:
+            async for att in AsyncRetrying(**_retrying_kwargs()):
+                with att:
+                    attempt += 1
+                    if attempt > 1:
+                        self._limiter.stats["retries"] += 1
+                    return await self._send_once(request)
+        except _RetryableStatus as e:
+            return httpx.Response(e.response.status_code, headers=e.response.headers,
+                                  content=e.response.content, request=request)
+        raise RuntimeError("unreachable")
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+_LIMITER: Optional[RateLimiter] = None
+_LIMITER_LOCK = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """프로세스 공용 리미터 (동기/비동기 클라이언트가 같은 버킷·동시성 상한을 공유)"""
+    global _LIMITER
+    if _LIMITER is None:
+        with _LIMITER_LOCK:
+            if _LIMITER is None:
+                _LIMITER = RateLimiter()
+    return _LIMITER
+
+
+def rate_limiter_stats() -> Dict[str, Any]:
+    return _LIMITER.snapshot() if _LIMITER is not None else {}
+
+
+# ====== 429 를 돌려주는 가짜 서버로 확인 ======
+if __name__ == "__main__":
+    import collections
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    QUOTA_RPM = 240  # 가짜 서버 할당량 (초당 4건)
+    WINDOW_S = 2.0  # 60초 창 대신 2초 창으로 축소해 빠르게 재현
+    N = 60
+
+    class _Server(ThreadingHTTPServer):
+        daemon_threads = True
+        request_queue_size = 128
+
+    hits: collections.deque = collections.deque()
+    hits_lock = threading.Lock()
+    served = {"ok": 0, "429": 0}
+
+    class _Fake(BaseHTTPRequestHandler):
+        """최근 WINDOW_S 초 요청 수가 할당량을 넘으면 429 + Retry-After"""
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            now = time.monotonic()
+            with hits_lock:
+                while hits and now - hits[0] > WINDOW_S:
+                    hits.popleft()
+                over = len(hits) >= QUOTA_RPM / 60 * WINDOW_S
+                if not over:
+                    hits.append(now)
+            if over:
+                served["429"] += 1
+                out = b'{"error": {"message": "rate limited"}}'
+                self.send_response(429)
+                self.send_header("Retry-After", "0.5")
+            else:
+                served["ok"] += 1
+                time.sleep(0.05)
+                out = b'{"choices": []}'
+                self.send_response(200)
+            self.send_header("Content-Length", str(len(out)))
+            self.end_headers()
+            self.wfile.write(out)
+
+        def log_message(self, *a):
+            pass
+
+    srv = _Server(("127.0.0.1", 0), _Fake)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{srv.server_port}/v1/chat/completions"
+    body = {"model": "gpt-4o-mini", "messages": [{"role": "user", "content": "안녕하세요 " * 20}], "max_tokens": 50}
+
+    # 시간 창이 비도록 실험 사이에 WINDOW_S 만큼 쉼
+    async def burst(client: httpx.AsyncClient) -> Dict[str, Any]:
+        hits.clear()
+        served.update(ok=0, **{"429": 0})
+        t0 = time.perf_counter()
+        rs = await asyncio.gather(*(client.post(url, json=body) for _ in range(N)), return_exceptions=True)
+        dt = time.perf_counter() - t0
+        ok = sum(1 for r in rs if isinstance(r, httpx.Response) and r.status_code == 200)
+        return {"ok": ok, "failed": N - ok, "server_429": served["429"], "wall_s": round(dt, 2),
+                "rps": round(ok / dt, 2)}
+
+    async def main() -> None:
+        async with httpx.AsyncClient() as raw:
+            print("no limiter  :", await burst(raw))
+        await asyncio.sleep(WINDOW_S + 0.1)
+        lim = RateLimiter(rpm=QUOTA_RPM, tpm=1_000_000, max_inflight=16)
+        lim.rpm.capacity = lim.rpm._tokens = 4  # 버스트 허용량 = 1초 분량
+        transport = AsyncRateLimitedTransport(lim, httpx.AsyncHTTPTransport())
+        async with httpx.AsyncClient(transport=transport) as limited:
+            print("with limiter:", await burst(limited), lim.snapshot())
+        print(f"quota        : {QUOTA_RPM / 60:.1f} rps")
+
+    asyncio.run(main())
+    srv.shutdown()
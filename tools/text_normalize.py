@@ -0,0 +1,261 @@
+# tools/text_normalize.py
+"""
+크롤 본문 / LLM 폴백 정리용 텍스트 정규화
+- 노이즈 규칙을 한 번 컴파일: '포함' 문구 전체 → 정규식 1개(리터럴 alternation),
+  정확 일치 → set, 접두 → str.startswith(tuple), 짧은 해시태그 → 길이 비교
+  (앵커(^/$)가 섞인 단일 정규식은 re 의 첫 글자 최적화가 꺼져 라인당 더 느려서 분리)
+- 라인 정리(노이즈 제거 + 연속 중복 제거 + 빈 줄 압축)를 한 번의 라인 순회로 처리
+- sanitize / tidy 도 각각 정규식 1회 치환
+- tools/nextunicorn.py, agents/startup_search_agent.py 공용
+
+마이크로벤치마크 (기존 구현과 결과 동일성 확인 포함):
+    python -m tools.text_normalize [html_or_txt ...]   # 기본: outputs/*.html 본문 + 합성 노이즈
+"""
+from __future__ import annotations
+
+import re
+from typing import Iterable, List, Sequence
+
+
+# sanitize: 해시태그 / 허용 외 문자 / 공백이 이어진 구간 전체 → 공백 1개
+_SANITIZE_RE = re.compile(r"(?:#\S+|[^0-9A-Za-z가-힣\s]|\s)+")
+
+# tidy: URL·해시태그로 시작하는 (공백/URL/해시태그) 구간, 또는 공백 뒤에 토큰이 더 이어진 구간 → 공백 1개
+#   단독 공백 1개는 유지 → 기존 URL→태그→\s{2,} 순차 치환과 같은 결과
+#   '#' 바로 뒤가 URL 이면 기존처럼 URL 만 지우고 '#' 은 남김
+_URL = r"https?://\S+"
+_HASHTAG = r"#(?!https?://\S)\S+"
+_TIDY_RE = re.compile(rf"\s(?:\s|{_URL}|{_HASHTAG})+|(?:{_URL}|{_HASHTAG})(?:\s|{_URL}|{_HASHTAG})*")
+# 공백 뒤 + 토큰 시작('h', '#')이 아닌 글자 앞: 여기서 자르면 앞부분 치환 결과가 전체 치환 결과의 접두사
+_SAFE_CUT = re.compile(r"\s(?=[^\sh#])")
+
+
+def _alt(words: Iterable[str]) -> str:
+    # 긴 것부터: 공통 접두어가 있는 리터럴끼리 먼저 매칭
+    return "|".join(re.escape(w) for w in sorted(set(words), key=len, reverse=True))
+
+
+class LineCleaner:
+    """
+    라인 단위 노이즈 필터 (한 번 컴파일해 재사용)
+    - exact    : 라인 전체가 일치하면 제거 (탭 라벨 등)
+    - prefixes : 해당 문자열로 시작하면 제거 (breadcrumb 등)
+    - contains : 포함하면 제거 (배너/버튼 문구 등)
+    - hashtag_max_len : '#' 으로 시작하고 이 길이 미만이면 제거 (0 = 비활성)
+    - erase    : 라인 판정 전에 지울 문자열 (계정명 흔적 등)
+    """
+
+    def __init__(
+        self,
+        *,
+        exact: Iterable[str] = (),
+        prefixes: Iterable[str] = (),
+        contains: Iterable[str] = (),
+        hashtag_max_len: int = 0,
+        erase: Sequence[str] = (),
+    ):
+        contains = list(contains)
+        self._exact = frozenset(exact)
+        self._prefixes = tuple(prefixes)
+        self._contains = re.compile(_alt(contains)).search if contains else None
+        self._hashtag_max = hashtag_max_len
+        self._erase = list(erase)
+
+    def is_noise(self, ls: str) -> bool:
+        """strip 된 라인 1개 판정"""
+        return (
+            ls in self._exact
+            or (bool(self._prefixes) and ls.startswith(self._prefixes))
+            or (self._hashtag_max > 0 and ls[:1] == "#" and len(ls) < self._hashtag_max)
+            or (self._contains is not None and self._contains(ls) is not None)
+        )
+
+    def clean(self, text: str) -> str:
+        """노이즈 라인 제거 + 직전 유지 라인과 같은 라인 제거 + 연속 빈 줄 1개로 (1회 순회)"""
+        if not text:
+            return ""
+        t = text.replace("\u200b", "").replace("\xa0", " ")  # 제로폭 공백 제거, NBSP → 공백
+        for w in self._erase:
+            t = t.replace(w, "")
+        exact, prefixes, contains, hmax = self._exact, self._prefixes, self._contains, self._hashtag_max
+        out: List[str] = []
+        append = out.append
+        prev = None
+        blank = False
+        for raw in t.splitlines():
+            ls = raw.strip()
+            if not ls:
+                prev = ""
+                if not blank:
+                    append("")
+                    blank = True
+                continue
+            if (
+                ls == prev
+                or ls in exact
+                or (prefixes and ls.startswith(prefixes))
+                or (hmax and ls[0] == "#" and len(ls) < hmax)
+                or (contains is not None and contains(ls))
+            ):
+                continue
+            append(ls)
+            prev = ls
+            blank = False
+        return "\n".join(out).strip()
+
+
+def sanitize(text: str | None) -> str:
+    """해시태그/특수문자/다중 공백 제거 (카드 제목·요약용)"""
+    if not text:
+        return ""
+    return _SANITIZE_RE.sub(" ", text).strip()
+
+
+def dedupe_lines(text: str) -> str:
+    """중복 라인 제거 (빈 줄 포함 최초 1회만 유지, 순서 보존)"""
+    if not text:
+        return ""
+    return "\n".join(dict.fromkeys(text.strip().splitlines())).strip()
+
+
+def tidy(text: str, limit: int = 1000) -> str:
+    """LLM 실패 대비 로컬 정리: URL/해시태그 제거 + 공백 압축 후 limit 자로 자름"""
+    if not text:
+        return ""
+    if len(text) > 4 * limit:
+        # 긴 입력은 앞부분만 치환해 limit 자가 채워지면 나머지는 건너뜀
+        m = _SAFE_CUT.search(text, 2 * limit)
+        if m is not None:
+            head = _TIDY_RE.sub(" ", text[:m.end()]).strip()
+            if len(head) >= limit:
+                return head[:limit]
+    return _TIDY_RE.sub(" ", text).strip()[:limit]
+
+
+# ====== 마이크로벤치마크 ======
+if __name__ == "__main__":
+    import glob
+    import random
+    import sys
+    import time
+    from pathlib import Path
+
+    # --- 기존 구현 (비교 기준) ---
+    _NOISE_CONTAINS = [
+        "무료상담신청", "IR자료 요청하기", "티켓", "티켓구매",
+        "제휴 및 광고 문의", "비즈니스", "템플릿", "지원프로그램",
+        "인사이트", "MyCFO", "펼쳐보기", "더 보기",
+        "2025년 내 시리즈A 이상 투자유치가 목표라면",
+    ]
+    _NOISE_PREFIXES = ["홈>", "홈 >", "Home>", "home>", "HOME>", "파인더>", "파인더 >"]
+    _TAB_LABELS = {"전체", "투자 정보", "서비스/제품", "팀 정보"}
+
+    def old_strip_noise_lines(text: str) -> str:
+        t = text.replace("\u200b", "").replace("\xa0", " ")
+        lines = [l.rstrip() for l in t.splitlines()]
+        keep, prev = [], None
+        for l in lines:
+            ls = l.strip()
+            if not ls:
+                keep.append(ls); prev = ls; continue
+            if ls in _TAB_LABELS:
+                continue
+            if any(ls.startswith(p) for p in _NOISE_PREFIXES):
+                continue
+            if any(k in ls for k in _NOISE_CONTAINS):
+                continue
+            if ls.startswith("#") and len(ls) < 50:
+                continue
+            if ls == prev:
+                continue
+            keep.append(ls); prev = ls
+        out, blank = [], False
+        for l in keep:
+            if not l:
+                if blank:
+                    continue
+                blank = True
+            else:
+                blank = False
+            out.append(l)
+        return "\n".join(out).strip()
+
+    def old_clean_text(raw: str) -> str:
+        return old_strip_noise_lines(raw.replace("신순호", "")) if raw else ""
+
+    def old_sanitize(text: str) -> str:
+        s = re.sub(r"#\S+", " ", text)
+        s = re.sub(r"[^0-9A-Za-z가-힣\s]", " ", s)
+        return re.sub(r"\s+", " ", s).strip()
+
+    def old_polish(s: str) -> str:
+        c = re.sub(r"\n{3,}", "\n\n", (s or "").strip())
+        seen, out = set(), []
+        for l in (c.splitlines() if c else []):
+            if l not in seen:
+                out.append(l); seen.add(l)
+        return "\n".join(out).strip()
+
+    def old_tidy(s: str, limit: int = 1000) -> str:
+        s = re.sub(r"https?://\S+", " ", s)
+        s = re.sub(r"#\S+", " ", s)
+        s = re.sub(r"\s{2,}", " ", s)
+        s = re.sub(r"\n{3,}", "\n", s)
+        return s.strip()[:limit]
+
+    cleaner = LineCleaner(
+        exact=_TAB_LABELS, prefixes=_NOISE_PREFIXES, contains=_NOISE_CONTAINS,
+        hashtag_max_len=50, erase=("신순호",),
+    )
+
+    # --- 입력: 녹화 페이지 본문 + 합성 노이즈 ---
+    files = sys.argv[1:] or sorted(glob.glob("outputs/*.html") + glob.glob("outputs/pages/*.html"))
+    page_texts = []
+    for f in files:
+        raw = Path(f).read_text(encoding="utf-8")
+        raw = re.sub(r"<(script|style)\b[^>]*>.*?</\1\s*>", " ", raw, flags=re.S | re.I)
+        page_texts.append(re.sub(r"<[^>]+>", "\n", raw))
+    rng = random.Random(0)
+    vocab = (["회사 소개", "투자 정보", "팀 정보", "전체", "홈 > 파인더", "#모빌리티", "펼쳐보기",
+              "MyCFO 무료상담신청", "  ", "", "\u200b", "서비스/제품", "시리즈A 50억 원 투자 유치",
+              "https://example.com/a?b=c", "전기차 배터리 재사용 플랫폼 #ESG", "신순호 님", "특수!@문자$%"]
+             + [f"본문 라인 {i} 전기차 충전 인프라 구축 사업" for i in range(200)])
+    synth = "\n".join(rng.choice(vocab) for _ in range(20000))
+    corpus = {"pages": "\n".join(page_texts) * 20 if page_texts else "", "synthetic": synth}
+
+    def bench(fn, arg, reps=5):
+        best = float("inf")
+        for _ in range(reps):
+            t0 = time.perf_counter()
+            fn(arg)
+            best = min(best, time.perf_counter() - t0)
+        return best * 1000
+
+    # --- 무작위 입력 차분 검사 (경계 케이스: '#' 뒤 URL, 단독 개행 등) ---
+    alpha = [" ", "\n", "\t", "#", "h", "ttp://", "https://", "a", "가", "!", "\u200b", "\xa0",
+             "\n\n\n", "전체", "홈>", "펼쳐보기", "신순호"]
+    for _ in range(20000):
+        s = "".join(rng.choice(alpha) for _ in range(rng.randint(0, 20)))
+        assert tidy(s) == old_tidy(s), repr(s)
+        assert tidy(s, 3) == old_tidy(s, 3), repr(s)  # 앞부분만 치환하는 경로
+        assert sanitize(s) == old_sanitize(s), repr(s)
+        assert dedupe_lines(s) == old_polish(s), repr(s)
+        assert cleaner.clean(s) == old_clean_text(s), repr(s)
+    print("differential check: 20,000 random inputs OK")
+
+    print(f"{'case':<28} {'size':>9} {'old(ms)':>9} {'new(ms)':>9} {'speedup':>8} same")
+    for label, text in corpus.items():
+        if not text:
+            continue
+        lines = text.splitlines()[:5000]
+        cases = [
+            ("clean_text", old_clean_text, cleaner.clean, text),
+            ("polish(dedupe+compact)", old_polish, dedupe_lines, text),
+            ("tidy", old_tidy, tidy, text),
+            ("sanitize x lines", lambda ls: [old_sanitize(l) for l in ls], lambda ls: [sanitize(l) for l in ls], lines),
+        ]
+        for name, old, new, arg in cases:
+            same = old(arg) == new(arg)
+            to, tn = bench(old, arg), bench(new, arg)
+            size = len(arg) if isinstance(arg, str) else sum(map(len, arg))
+            print(f"{label + ':' + name:<28} {size:>9,} {to:9.2f} {tn:9.2f} {to / tn:7.1f}x {same}")
@@ -0,0 +1,222 @@
+# tools/token_budget.py
+"""
+토큰 예산 기반 프롬프트 압축 (tiktoken)
+- count_tokens / truncate_tokens : 모델 토크나이저 기준 길이 측정·자르기 (줄 경계 우선)
+- compact_text                   : 보일러플레이트 정리(cleaner) + 중복 라인 제거 + 빈 줄 압축
+- budget_sections                : 섹션별 우선순위(가중치)로 전체 예산 분배 → 넘치는 섹션만 잘라냄
+  (예산보다 작은 섹션은 그대로 두고 남는 몫을 나머지에 재분배)
+- record_prompt / record_compaction / token_stats : 호출별 입력 토큰·예산 적용 로그 + 누적 통계
+- 토크나이저 파일을 받을 수 없는 환경(오프라인)에서는 문자 기반 추정치로 동작
+  (한글/CJK 1자 ≈ 1토큰, 그 외 4자 ≈ 1토큰)
+
+예산 적용 전/후 비교:
+    python -m tools.token_budget [html_or_txt ...]   # 기본: outputs/*.html 본문
+"""
+from __future__ import annotations
+
+import logging
+import re
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+log = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "gpt-4o-mini"
+_MSG_OVERHEAD = 4  # 메시지당 role/구분 토큰 (OpenAI chat 포맷 근사)
+_WIDE = re.compile("[\u1100-\u11ff\u3040-\u30ff\u3130-\u318f\u3400-\u9fff\uac00-\ud7af\uf900-\ufaff]")
+
+_ENCODERS: Dict[str, Any] = {}
+_ENC_LOCK = threading.Lock()
+_STATS = {"prompts": 0, "prompt_tokens": 0, "compacted": 0, "saved_tokens": 0}
+
+
+def _encoder(model: str):
+    """모델 토크나이저 (실패 시 None → 추정치). 모델별 1회만 로드"""
+    if model in _ENCODERS:
+        return _ENCODERS[model]
+    with _ENC_LOCK:
+        if model not in _ENCODERS:
+            try:
+                import tiktoken
+                try:
+                    enc = tiktoken.encoding_for_model(model)
+                except KeyError:
+                    enc = tiktoken.get_encoding("o200k_base")
+            except Exception as e:
+                log.warning("tiktoken encoding unavailable (%s); using character estimate", e)
+                enc = None
+            _ENCODERS[model] = enc
+    return _ENCODERS[model]
+
+
+def _estimate(text: str) -> int:
+    wide = len(text) - len(_WIDE.sub("", text))
+    return wide + (len(text) - wide + 3) // 4
+
+
+def count_tokens(text: str, model: str = DEFAULT_MODEL) -> int:
+    if not text:
+        return 0
+    enc = _encoder(model)
+    return len(enc.encode(text, disallowed_special=())) if enc is not None else _estimate(text)
+
+
+def count_message_tokens(messages: Iterable[Any], model: str = DEFAULT_MODEL) -> int:
+    """chat 메시지 목록(BaseMessage 또는 문자열)의 입력 토큰 수"""
+    n = 2
+    for m in messages:
+        content = getattr(m, "content", m)
+        n += _MSG_OVERHEAD + count_tokens(content if isinstance(content, str) else str(content), model)
+    return n
+
+
+def truncate_tokens(text: str, max_tokens: int, model: str = DEFAULT_MODEL) -> str:
+    """max_tokens 이하로 자름. 잘린 지점 근처(뒤 20% 이내)에 줄바꿈이 있으면 줄 경계에서 자름"""
+    if not text or max_tokens <= 0:
+        return ""
+    enc = _encoder(model)
+    if enc is not None:
+        ids = enc.encode(text, disallowed_special=())
+        if len(ids) <= max_tokens:
+            return text
+        cut = enc.decode(ids[:max_tokens]).rstrip("\ufffd")
+    else:
+        if _estimate(text) <= max_tokens:
+            return text
+        budget = max_tokens * 4
+        end = 0
+        for end, ch in enumerate(text):
+            budget -= 4 if _WIDE.match(ch) else 1
+            if budget < 0:
+                break
+        cut = text[:end]
+    nl = cut.rfind("\n")
+    if nl >= len(cut) * 0.8:
+        cut = cut[:nl]
+    return cut.rstrip()
+
+
+def compact_text(
+    text: str,
+    *,
+    cleaner: Optional[Callable[[str], str]] = None,
+    seen: Optional[set] = None,
+) -> str:
+    """
+    cleaner(보일러플레이트 제거) 적용 후 중복 라인(문서 전체 기준) 제거 + 연속 빈 줄 1개로
+    seen 을 넘기면 여러 문서에 걸쳐 이미 나온 라인도 제거 (RAG 문서 묶음용)
+    """
+    if not text:
+        return ""
+    if cleaner is not None:
+        text = cleaner(text)
+    out: List[str] = []
+    seen = set() if seen is None else seen
+    blank = True
+    for raw in text.splitlines():
+        ls = raw.strip()
+        if not ls:
+            if not blank:
+                out.append("")
+                blank = True
+            continue
+        if ls in seen:
+            continue
+        seen.add(ls)
+        out.append(ls)
+        blank = False
+    return "\n".join(out).strip()
+
+
+def budget_sections(
+    sections: Sequence[Tuple[str, str, float]],
+    max_tokens: int,
+    *,
+    model: str = DEFAULT_MODEL,
+    min_tokens: int = 16,
+) -> Dict[str, str]:
+    """
+    [(키, 텍스트, 가중치)] → {키: 예산 안으로 자른 텍스트} (입력 순서 유지, 빈 섹션 제외)
+    - 전체가 예산 안이면 그대로
+    - 아니면 가중치 비율로 나누되, 몫보다 짧은 섹션은 전부 싣고 남는 몫을 나머지에 재분배
+    - 잘라야 하는데 배정이 min_tokens 미만인 섹션은 생략
+    """
+    need = {k: count_tokens(t, model) for k, t, _ in sections if t}
+    if sum(need.values()) <= max_tokens:
+        return {k: t for k, t, _ in sections if t}
+    weight = {k: max(float(w), 1e-6) for k, _, w in sections}
+    alloc: Dict[str, int] = {}
+    remaining = float(max_tokens)
+    active = [k for k in need]
+    while active:
+        wsum = sum(weight[k] for k in active)
+        share = {k: remaining * weight[k] / wsum for k in active}
+        fit = [k for k in active if need[k] <= share[k]]
+        if not fit:
+            for k in active:
+                alloc[k] = int(share[k])
+            break
+        for k in fit:
+            alloc[k] = need[k]
+            remaining -= need[k]
+            active.remove(k)
+    out: Dict[str, str] = {}
+    for k, t, _ in sections:
+        if not t:
+            continue
+        a = alloc.get(k, 0)
+        if a >= need[k]:
+            out[k] = t
+        elif a >= min_tokens:
+            out[k] = truncate_tokens(t, a, model)
+    return out
+
+
+def record_compaction(tag: str, before: int, after: int) -> None:
+    """예산 적용 1건 기록 (before/after: 적용 전/후 토큰 수)"""
+    if before > after:
+        _STATS["compacted"] += 1
+        _STATS["saved_tokens"] += before - after
+    log.info("token budget [%s]: %d -> %d", tag, before, after)
+
+
+def record_prompt(tag: str, tokens: int) -> None:
+    """LLM 호출 1건의 입력 토큰 기록"""
+    _STATS["prompts"] += 1
+    _STATS["prompt_tokens"] += tokens
+    log.info("prompt tokens [%s]: %d", tag, tokens)
+
+
+def token_stats() -> Dict[str, Any]:
+    s: Dict[str, Any] = dict(_STATS)
+    s["mean_prompt_tokens"] = round(s["prompt_tokens"] / s["prompts"], 1) if s["prompts"] else 0.0
+    return s
+
+
+# ====== 예산 적용 전/후 비교 ======
+if __name__ == "__main__":
+    import glob
+    import sys
+    import time
+    from pathlib import Path
+
+    files = sys.argv[1:] or sorted(glob.glob("outputs/*.html") + glob.glob("outputs/pages/*.html"))
+    texts = []
+    for f in files:
+        raw = Path(f).read_text(encoding="utf-8")
+        raw = re.sub(r"<(script|style)\b[^>]*>.*?</\1\s*>", " ", raw, flags=re.S | re.I)
+        texts.append((Path(f).name, re.sub(r"<[^>]+>", "\n", raw)))
+    body = "회사 소개 본문 라인입니다. 전기차 배터리 재사용 플랫폼.\n" * 400
+    texts.append(("synthetic", "\n".join(["제이카", body, "투자 정보\n시리즈A 50억 원", body])))
+
+    enc = _encoder(DEFAULT_MODEL)
+    print(f"tokenizer={'tiktoken' if enc is not None else 'estimate'}")
+    print(f"{'input':<28} {'raw_tok':>8} {'compact':>8} {'budget':>8} {'ms':>7}")
+    for name, t in texts:
+        t0 = time.perf_counter()
+        compact = compact_text(t)
+        parts = budget_sections([("head", compact[:200], 1), ("body", compact[200:], 3)], 3000)
+        out = "\n".join(parts.values())
+        ms = (time.perf_counter() - t0) * 1000
+        print(f"{name[:28]:<28} {count_tokens(t):8d} {count_tokens(compact):8d} {count_tokens(out):8d} {ms:7.1f}")
+        assert count_tokens(out) <= 3000 + 2